@@ -6,6 +6,7 @@ from pathlib import Path
 from datetime import timedelta
 import os
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Load environment variables
 load_dotenv()
@@ -87,6 +88,17 @@ DATABASES = {
     }
 }
 
+# Cache
+# Database-backed by default so it is shared by all gunicorn workers (used to
+# coalesce identical in-flight Gemini calls). Run `python manage.py createcachetable`
+# once per database. Point CACHE_BACKEND/CACHE_LOCATION at redis if available.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'coverfolio_cache'),
+    }
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'authentication.User'
 
@@ -184,6 +196,85 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Gemini API keys (see resume_parser/key_pool.py)
+# GEMINI_API_KEYS is a comma-separated pool; calls go to the least-loaded key.
+# A single GEMINI_API_KEY still works.
+GEMINI_API_KEYS = [
+    key.strip()
+    for key in os.getenv('GEMINI_API_KEYS', os.getenv('GEMINI_API_KEY', '')).split(',')
+    if key.strip()
+]
+# Requests per minute each key may take before it is skipped (0 = no limit)
+GEMINI_KEY_RPM = int(os.getenv('GEMINI_KEY_RPM', 0))
+# How long a key is benched after a 429 (when Gemini gives no retry delay)...
+GEMINI_KEY_RATE_LIMIT_COOLDOWN_SECONDS = int(os.getenv('GEMINI_KEY_RATE_LIMIT_COOLDOWN_SECONDS', 60))
+# ...and after a 403 (key revoked or API not enabled for its project)
+GEMINI_KEY_FORBIDDEN_COOLDOWN_SECONDS = int(os.getenv('GEMINI_KEY_FORBIDDEN_COOLDOWN_SECONDS', 600))
+
+# Model fallback cascade per LLM task (see resume_parser/cascade.py)
+# Comma-separated tiers tried in order; 'local' is the heuristic resume parser.
+LLM_CASCADE = {
+    'parse': os.getenv('LLM_CASCADE_PARSE', 'gemini-2.5-flash-lite,gemini-2.5-flash,local').split(','),
+    'cover_letter': os.getenv('LLM_CASCADE_COVER_LETTER', 'gemini-2.5-flash-lite,gemini-2.5-flash').split(','),
+    'chat': os.getenv('LLM_CASCADE_CHAT', 'gemini-2.5-flash-lite,gemini-2.5-flash').split(','),
+}
+# Tries per tier on transient errors (503, 429, timeouts) before falling back
+LLM_TIER_ATTEMPTS = int(os.getenv('LLM_TIER_ATTEMPTS', 2))
+# First retry delay on a tier; doubles on each further retry
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv('LLM_RETRY_BACKOFF_SECONDS', 1))
+
+# Section-chunked resume parsing (see resume_parser/resume_parser_gemini.py)
+# Off by default ('never'): one call per resume. 'auto' splits resumes of at least
+# RESUME_CHUNK_MIN_CHARS by section and parses the sections concurrently (one call
+# per section); 'always' splits every resume with more than one section.
+RESUME_CHUNKED_PARSE = os.getenv('RESUME_CHUNKED_PARSE', 'never')
+RESUME_CHUNK_MIN_CHARS = int(os.getenv('RESUME_CHUNK_MIN_CHARS', 3000))
+
+# Record/replay of Gemini calls (see resume_parser/cassette.py)
+# 'record' saves every response to LLM_CASSETTE_DIR, 'replay' serves them offline
+LLM_CASSETTE_MODE = os.getenv('LLM_CASSETTE_MODE', '')
+LLM_CASSETTE_DIR = os.getenv('LLM_CASSETTE_DIR', str(BASE_DIR / 'cassettes'))
+# Replay 'instant'ly or with the 'recorded' upstream latency
+LLM_CASSETTE_LATENCY = os.getenv('LLM_CASSETTE_LATENCY', 'instant')
+
+# Cover letter generation
+# Job descriptions are cleaned and trimmed to this many (estimated) tokens
+# before they are put into the prompt (see resume_parser/jd_preprocessor.py)
+JD_TOKEN_BUDGET = int(os.getenv('JD_TOKEN_BUDGET', 900))
+
+# Idempotency-Key support (upload, generate, save endpoints)
+# How long a stored response is replayed for retries using the same key
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+# LLM scheduling and load shedding (see resume_parser/llm_scheduler.py)
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+LLM_PER_USER_CONCURRENCY = int(os.getenv('LLM_PER_USER_CONCURRENCY', 2))
+# Shed (503) when this many calls are already waiting...
+LLM_QUEUE_MAX_DEPTH = int(os.getenv('LLM_QUEUE_MAX_DEPTH', 16))
+# ...or a call would wait longer than this
+LLM_QUEUE_MAX_WAIT_SECONDS = float(os.getenv('LLM_QUEUE_MAX_WAIT_SECONDS', 10))
+# Base Retry-After for shed requests; grows with the backlog
+LLM_RETRY_AFTER_SECONDS = int(os.getenv('LLM_RETRY_AFTER_SECONDS', 5))
+
+# Treat portfolio items whose dedupe keys have at least this trigram
+# similarity as duplicates; 0 = exact key matches only (see portfolio/dedupe.py)
+PORTFOLIO_FUZZY_DEDUPE_THRESHOLD = float(os.getenv('PORTFOLIO_FUZZY_DEDUPE_THRESHOLD', 0))
+
+# How long a populate-from-resume preview can be applied (see portfolio/preview.py)
+POPULATE_PREVIEW_TTL_SECONDS = int(os.getenv('POPULATE_PREVIEW_TTL_SECONDS', 900))
+
+# Public portfolio cache (see portfolio/public_cache.py): browser/CDN max-age,
+# and how long an entry is kept (entries are also replaced on every change)
+PUBLIC_PORTFOLIO_MAX_AGE = int(os.getenv('PUBLIC_PORTFOLIO_MAX_AGE', 60))
+PUBLIC_PORTFOLIO_CACHE_TTL = int(os.getenv('PUBLIC_PORTFOLIO_CACHE_TTL', 86400))
+# Rebuild portfolio snapshots on a background thread after changes
+# (see portfolio/snapshots.py); False rebuilds inline on commit
+PORTFOLIO_SNAPSHOT_ASYNC = os.getenv('PORTFOLIO_SNAPSHOT_ASYNC', 'True') == 'True'
+
+# Opt-in cursor pagination of portfolio section lists (see portfolio/pagination.py)
+PORTFOLIO_PAGE_SIZE = int(os.getenv('PORTFOLIO_PAGE_SIZE', 50))
+PORTFOLIO_MAX_PAGE_SIZE = int(os.getenv('PORTFOLIO_MAX_PAGE_SIZE', 200))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = os.getenv(
     'CORS_ALLOWED_ORIGINS',
@@ -191,6 +282,9 @@ CORS_ALLOWED_ORIGINS = os.getenv(
 ).split(',')
 
 
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed', 'Retry-After']
+
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -0,0 +1,154 @@
+# portfolio/batch.py
+"""
+Batch re-normalization of stored resumes.
+
+When the rules in normalize.clean_structured change, every stored
+Resume.structured_data has to be run through them again. normalize_resumes()
+streams the rows in chunks, cleans each chunk across a process pool
+(clean_structured is pure Python and CPU-bound, so threads would not help)
+and writes the changed rows back with one bulk_update per chunk. With
+dry_run=True nothing is written; the returned stats say what would change.
+
+rekey_portfolio_items() does the same for the dedupe keys of portfolio
+items, which go stale when the key rules or the skill taxonomy change.
+"""
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from django.apps import apps
+from django.db import transaction
+
+from resume_parser.models import Resume
+
+from .dedupe import KEY_BUILDERS
+from .normalize import clean_structured
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _clean(data):
+    """Worker entry point: never raise, so one bad row does not sink its chunk."""
+    try:
+        return clean_structured(data), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _changed_fields(old: Any, new: Dict[str, Any]):
+    old = old if isinstance(old, dict) else {}
+    return [field for field in new.keys() | old.keys() if old.get(field) != new.get(field)]
+
+
+def _chunks(queryset, chunk_size):
+    """Keyset pagination on id: no cursor stays open while the chunk is written back."""
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id).order_by('id')[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+        # values_list() rows start with the id
+        last_id = last[0] if isinstance(last, tuple) else last.pk
+
+
+def normalize_resumes(queryset=None, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: Optional[int] = None,
+                      dry_run: bool = False, progress: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """
+    Run clean_structured over ``queryset`` (default: every parsed resume).
+
+    Args:
+        chunk_size: Rows read, cleaned and written per batch
+        workers: Worker processes; 1 cleans in this process (default: CPU count)
+        dry_run: Only count what would change
+        progress: Called with the running stats after each chunk
+
+    Returns:
+        Stats: rows, changed, unchanged, failed, field_changes per top-level
+        field, errors (first few), elapsed_seconds and rows_per_second
+    """
+    if queryset is None:
+        queryset = Resume.objects.all()
+    queryset = queryset.exclude(structured_data__isnull=True).order_by('id')
+    workers = workers or os.cpu_count() or 1
+
+    stats = {
+        'rows': 0,
+        'changed': 0,
+        'unchanged': 0,
+        'failed': 0,
+        'field_changes': Counter(),
+        'errors': [],
+        'dry_run': dry_run,
+    }
+    started = time.perf_counter()
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for chunk in _chunks(queryset.values_list('id', 'structured_data'), chunk_size):
+            datas = [data for _, data in chunk]
+            if pool:
+                results = list(pool.map(_clean, datas, chunksize=max(1, len(datas) // (workers * 4))))
+            else:
+                results = [_clean(data) for data in datas]
+
+            updates = []
+            for (pk, old), (new, error) in zip(chunk, results):
+                stats['rows'] += 1
+                if error:
+                    stats['failed'] += 1
+                    if len(stats['errors']) < 20:
+                        stats['errors'].append({'resume_id': pk, 'error': error})
+                    continue
+                changed = _changed_fields(old, new)
+                if not changed:
+                    stats['unchanged'] += 1
+                    continue
+                stats['changed'] += 1
+                stats['field_changes'].update(changed)
+                updates.append(Resume(id=pk, structured_data=new))
+
+            if updates and not dry_run:
+                with transaction.atomic():
+                    Resume.objects.bulk_update(updates, ['structured_data'])
+
+            if progress:
+                progress(stats)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed_seconds'] = round(elapsed, 3)
+    stats['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed else None
+    stats['field_changes'] = dict(stats['field_changes'])
+    return stats
+
+
+def rekey_portfolio_items(portfolios=None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          dry_run: bool = False) -> Dict[str, int]:
+    """
+    Recompute dedupe_key for every item in ``portfolios`` (default: all)
+    with the current rules and write back the ones that changed, one
+    bulk_update per chunk. Returns the number of changed rows per model.
+    """
+    changed = {}
+    for model_name in KEY_BUILDERS:
+        model = apps.get_model('portfolio', model_name)
+        queryset = model.objects.all()
+        if portfolios is not None:
+            queryset = queryset.filter(portfolio__in=portfolios)
+        changed[model_name] = 0
+        for chunk in _chunks(queryset, chunk_size):
+            stale = []
+            for row in chunk:
+                old_key = row.dedupe_key
+                if row.refresh_dedupe_key() != old_key:
+                    stale.append(row)
+            changed[model_name] += len(stale)
+            if stale and not dry_run:
+                model.objects.bulk_update(stale, ['dedupe_key'])
+    return changed
@@ -0,0 +1,55 @@
+# portfolio/conditional.py
+"""
+Conditional GET for the owner's portfolio endpoints.
+
+ETags are weak and derived from the portfolio version kept by
+public_cache.py (replaced after every committed change to the portfolio or
+any of its items) plus the owner's name and email, so checking one costs a
+portfolio id lookup and a cache read instead of serializing the response.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from .models import Portfolio
+from .public_cache import current_version
+
+
+def portfolio_etag(user, portfolio_id, section: str) -> str:
+    parts = [str(portfolio_id), current_version(portfolio_id), section, user.email, user.get_full_name()]
+    digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_from_portfolio_version(section: str):
+    """
+    Answer GETs of the decorated view with 304 Not Modified when the
+    client's If-None-Match matches the current ETag of the user's
+    portfolio ``section``; otherwise run the view and add the ETag.
+
+    Goes below @api_view/@permission_classes so request.user is set.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+            portfolio_id = Portfolio.objects.filter(user=request.user).values_list('id', flat=True).first()
+            if portfolio_id is None:
+                return view(request, *args, **kwargs)
+
+            # Pages of a list (?cursor=...) differ, so the query string is part of the tag
+            etag = portfolio_etag(request.user, portfolio_id, f"{section}?{request.GET.urlencode()}")
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response['ETag'] = etag
+            # Browsers keep the response but revalidate it every time
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,202 @@
+# portfolio/dates.py
+"""
+Date parsing shared by resume normalization and the portfolio serializers.
+
+Resume dates are free text ("Aug 2019 – May 2023", "2021 - Present") and the
+Experience/Education models store them as strings ("September 2024", "2024",
+"2024-05-01"). Both paths parse into a DatePoint; the parsers are pure and
+LRU-cached, since the same few strings come up on every row of every
+portfolio response.
+"""
+import calendar
+import datetime
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+MONTH_MAP = {
+    "jan": "January",
+    "feb": "February",
+    "mar": "March",
+    "apr": "April",
+    "may": "May",
+    "jun": "June",
+    "jul": "July",
+    "aug": "August",
+    "sep": "September",
+    "sept": "September",
+    "oct": "October",
+    "nov": "November",
+    "dec": "December",
+}
+
+# "september" / "sep" / "sept" -> 9
+MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTH_NUMBERS.update({abbr: MONTH_NUMBERS[name.lower()] for abbr, name in MONTH_MAP.items()})
+
+PRESENT_WORDS = frozenset({"present", "current", "now"})
+
+# Matches: Aug 2019 – May 2023, September ’21 – Present, etc.
+MONTH_YEAR_RANGE = re.compile(
+    r"(?i)"
+    r"((jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*)"   # month1
+    r"\s*['’]?\s*"
+    r"(\d{2,4})"                                                       # year1 (2 or 4 digits)
+    r"\s*[-–—]\s*"
+    r"((jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*)"   # month2
+    r"\s*['’]?\s*"
+    r"(\d{2,4}|present)"                                               # year2
+)
+
+# Matches: 2019 – 2023, 2017-present, 2020–, 2021 - Present
+# (the whole start year is captured: the old pattern captured only the
+# century, so year-only ranges used to be stored as '20')
+YEAR_RANGE = re.compile(
+    r"(?i)"
+    r"((?:19|20)\d{2})"
+    r"\s*[-–—]\s*"
+    r"((?:19|20)\d{2}|present)?"
+)
+
+# Matches: 2019, 2020, etc.
+JUST_YEAR = re.compile(r"(?:19|20)\d{2}")
+
+# '24 or ’24 -> 2024
+SHORT_YEAR = re.compile(r"'\s*(\d{2})")
+
+ISO_DATE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+
+# Entries per parser cache; the distinct date strings in use are few
+PARSE_CACHE_SIZE = 2048
+
+
+class DatePoint(NamedTuple):
+    year: Optional[int]
+    month: Optional[int] = None     # 1-12, None when only the year is known
+    is_present: bool = False        # "Present": no year or month
+    day: int = 1
+
+    def to_date(self, today: datetime.date = None) -> Optional[datetime.date]:
+        if self.is_present:
+            return today or datetime.date.today()
+        try:
+            return datetime.date(self.year, self.month or 1, self.day)
+        except (TypeError, ValueError):
+            return None
+
+    def label(self) -> Optional[str]:
+        """'September 2024' or '2024', the form stored on Experience/Education."""
+        if self.is_present or self.year is None:
+            return None
+        if self.month:
+            return f"{calendar.month_name[self.month]} {self.year}"
+        return str(self.year)
+
+
+PRESENT = DatePoint(None, None, True)
+
+
+def _year(raw: str) -> int:
+    return int(raw) if len(raw) == 4 else int("20" + raw)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(text: Optional[str]) -> Optional[DatePoint]:
+    """
+    Parse one stored date: '2024-05-01', 'September 2024', 'Sep 2024',
+    '2024' or 'Present'. Returns None when it cannot be read.
+    """
+    if not text:
+        return None
+    # Unsaved instances can still hold the date objects they were built with
+    text = str(text).strip()
+    if text.lower() in PRESENT_WORDS:
+        return PRESENT
+
+    m = ISO_DATE.match(text)
+    if m:
+        year, month, day = map(int, m.groups())
+        point = DatePoint(year, month, False, day)
+        return point if point.to_date() else None
+
+    parts = text.split()
+    # Case: "2024"
+    if len(parts) == 1 and parts[0].isdigit() and len(parts[0]) == 4:
+        return DatePoint(int(parts[0]))
+    # Case: "September 2024"
+    if len(parts) == 2 and parts[1].isdigit():
+        month = MONTH_NUMBERS.get(parts[0].lower())
+        point = DatePoint(int(parts[1]), month)
+        if month and point.to_date():
+            return point
+    return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date_range(text: Optional[str]) -> Tuple[Optional[DatePoint], Optional[DatePoint]]:
+    """
+    Parse a resume date range ('Aug 2019 – May 2023', '2021 - Present',
+    '2020') into (start, end); end is PRESENT for ongoing ranges and None
+    when there is no end.
+    """
+    if not text:
+        return (None, None)
+
+    s_norm = text.lower().strip().replace("’", "'")
+    s_norm = SHORT_YEAR.sub(lambda m: "20" + m.group(1), s_norm)
+
+    # ---------- 1. MONTH + YEAR RANGE ----------
+    m = MONTH_YEAR_RANGE.search(s_norm)
+    if m:
+        month1_raw, _, year1_raw, month2_raw, _, year2_raw = m.groups()
+        start = DatePoint(_year(year1_raw), MONTH_NUMBERS[month1_raw[:3]])
+        if year2_raw == "present":
+            return (start, PRESENT)
+        return (start, DatePoint(_year(year2_raw), MONTH_NUMBERS[month2_raw[:3]]))
+
+    # ---------- 2. YEAR RANGE ----------
+    m = YEAR_RANGE.search(s_norm)
+    if m:
+        start = DatePoint(int(m.group(1)))
+        end_raw = m.group(2)
+        if not end_raw:
+            return (start, None)
+        if end_raw == "present":
+            return (start, PRESENT)
+        return (start, DatePoint(int(end_raw)))
+
+    # ---------- 3. SINGLE YEAR ----------
+    m = JUST_YEAR.search(s_norm)
+    if m:
+        return (DatePoint(int(m.group(0))), None)
+
+    return (None, None)
+
+
+def format_duration(start: Optional[str], end: Optional[str], is_current: bool = False,
+                    today: datetime.date = None) -> Optional[str]:
+    """Human-friendly length of a stored start/end pair, e.g. '2 yr 3 mo'."""
+    start_point = parse_date(start)
+    if not start_point or start_point.is_present:
+        return None
+    end_point = PRESENT if is_current else parse_date(end)
+    if not end_point:
+        return None
+
+    start_dt = start_point.to_date()
+    end_dt = end_point.to_date(today)
+    if not start_dt or not end_dt:
+        return None
+
+    delta = end_dt - start_dt
+    years = delta.days // 365
+    months = (delta.days % 365) // 30
+
+    if years > 0 and months > 0:
+        return f"{years} yr {months} mo"
+    elif years > 0:
+        return f"{years} yr"
+    elif months > 0:
+        return f"{months} mo"
+
+    return "Less than 1 month"
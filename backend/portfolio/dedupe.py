@@ -0,0 +1,81 @@
+# portfolio/dedupe.py
+"""
+Normalized deduplication keys for portfolio items.
+
+Education, Experience, Project, Skill and Hobby carry an indexed
+``dedupe_key`` column built from their natural key (institution + field of
+study, company + position, title, canonical skill name, hobby name),
+normalized so that formatting differences do not matter:
+"Acme, Inc." / "ACME" and "Software  Engineer" / "software engineer" give the
+same key, while "Meta" and "Metabase" do not. Duplicate checks are exact
+lookups on (portfolio, dedupe_key) instead of icontains scans.
+
+Stored keys go stale when these rules change, and skill keys also depend on
+data/skill_taxonomy.json (an alias added there changes the canonical name a
+skill is keyed by). After changing either, run
+``manage.py renormalize_resumes --rekey`` (batch.rekey_portfolio_items) to
+recompute them. Optional fuzzy matching of near-duplicates
+(PORTFOLIO_FUZZY_DEDUPE_THRESHOLD) compares character trigrams of keys.
+"""
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+from .skills import canonicalize_skill
+
+MAX_KEY_LENGTH = 255
+
+NON_WORD = re.compile(r"[^\w+#]+")
+COMPANY_SUFFIX = re.compile(r"(?:\s+(?:inc|llc|ltd|limited|corp|corporation|co|company|gmbh|plc|pvt|sa|ag))+$")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Casefold, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return NON_WORD.sub(' ', text).strip()
+
+
+def make_key(*parts: Optional[str]) -> str:
+    return '|'.join(normalize_text(part) for part in parts)[:MAX_KEY_LENGTH]
+
+
+def _company(name: Optional[str]) -> str:
+    return COMPANY_SUFFIX.sub('', normalize_text(name))
+
+
+# model_name -> function(row) -> key; rows may be historical models
+KEY_BUILDERS = {
+    'education': lambda row: make_key(row.institution, row.field_of_study),
+    'experience': lambda row: make_key(_company(row.company), row.position),
+    'project': lambda row: make_key(row.title),
+    'skill': lambda row: make_key(canonicalize_skill(row.name)[0]),
+    'hobby': lambda row: make_key(row.name),
+}
+
+
+def dedupe_key_for(row) -> str:
+    return KEY_BUILDERS[row._meta.model_name](row)
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Trigram similarity (Jaccard) of two keys, as pg_trgm computes it."""
+    if a == b:
+        return 1.0
+    ta, tb = _trigrams(a), _trigrams(b)
+    return len(ta & tb) / len(ta | tb) if ta and tb else 0.0
+
+
+def find_near_duplicate(key: str, candidates: Iterable[str], threshold: float) -> Optional[str]:
+    """The most similar candidate key at or above ``threshold``, if any."""
+    best, best_score = None, threshold
+    for candidate in candidates:
+        score = similarity(key, candidate)
+        if score >= best_score:
+            best, best_score = candidate, score
+    return best
@@ -0,0 +1,81 @@
+"""
+Management command to micro-benchmark portfolio text normalization.
+
+The corpus is every sample resume parsed with the local parser, plus a noisy
+copy of each (bullet marks, dashes, doubled spaces, joined words like
+"B.S.inInformatics") and, with --from-db, the structured data of stored
+resumes. Reports normalize_whitespace throughput against the previous
+regex-loop implementation (and checks both give the same output), then
+clean_structured throughput over whole resumes.
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.normalize import clean_structured, normalize_whitespace
+from portfolio.testing import add_noise, legacy_normalize_whitespace
+from resume_parser.models import Resume
+from resume_parser.parser import parse_resume_text
+
+SAMPLE_DIR = Path(__file__).resolve().parents[3] / 'resume_parser' / 'bench_data' / 'resumes'
+
+
+def collect_strings(value, out):
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, list):
+        for item in value:
+            collect_strings(item, out)
+    elif isinstance(value, dict):
+        for item in value.values():
+            collect_strings(item, out)
+    return out
+
+
+def _throughput(fn, items, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    elapsed = time.perf_counter() - start
+    return repeat * len(items) / elapsed if elapsed else float('inf')
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark normalize_whitespace and clean_structured over a corpus of parsed resumes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=str(SAMPLE_DIR), help='Directory of .txt resumes')
+        parser.add_argument('--from-db', action='store_true', help='Also include stored resumes')
+        parser.add_argument('--repeat', type=int, default=200, help='Passes over the corpus')
+
+    def handle(self, *args, **options):
+        corpus = [parse_resume_text(path.read_text()) for path in sorted(Path(options['dir']).glob('*.txt'))]
+        corpus += [add_noise(resume) for resume in corpus]
+        if options['from_db']:
+            corpus += [
+                data for data in Resume.objects.exclude(structured_data__isnull=True)
+                .values_list('structured_data', flat=True).iterator()
+                if isinstance(data, dict)
+            ]
+        if not corpus:
+            raise CommandError('Corpus is empty')
+
+        strings = []
+        for resume in corpus:
+            collect_strings(resume, strings)
+        mismatches = [s for s in strings if normalize_whitespace(s) != legacy_normalize_whitespace(s)]
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} strings normalize differently, e.g. {mismatches[0]!r}")
+
+        repeat = options['repeat']
+        self.stdout.write(f"Corpus: {len(corpus)} resumes, {len(strings)} strings, output identical")
+        self.stdout.write(f"\n{'benchmark':<34}{'ops/s':>14}")
+        legacy = _throughput(legacy_normalize_whitespace, strings, repeat)
+        current = _throughput(normalize_whitespace, strings, repeat)
+        self.stdout.write(f"{'normalize_whitespace (legacy)':<34}{legacy:>14,.0f}")
+        self.stdout.write(f"{'normalize_whitespace':<34}{current:>14,.0f}")
+        resumes_per_second = _throughput(clean_structured, corpus, max(1, repeat // 10))
+        self.stdout.write(f"{'clean_structured (resumes)':<34}{resumes_per_second:>14,.0f}")
+        self.stdout.write(self.style.SUCCESS(f"\nnormalize_whitespace speedup: {current / legacy:.2f}x"))
@@ -0,0 +1,78 @@
+"""
+Management command to benchmark skill canonicalization on large skill lists.
+
+Builds a list of skill strings from the taxonomy aliases with the usual resume
+decorations ("Advanced ...", "... 3.x", "(ES6)") plus unknown skills, then
+times the matcher (LRU cache bypassed) and canonicalize_skills() against
+matching each string with one precompiled regex per alias.
+"""
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio import skills
+
+UNKNOWN_SKILLS = ['Machine Learning', 'Data Structures', 'Underwater Basket Weaving', 'Distributed Systems',
+                  'Technical Writing', 'Docker containers', 'React/Redux', 'AWS (EC2, S3, Lambda)']
+DECORATIONS = ['{}', '{}', 'Advanced {}', '{} 3.x', '{} (ES6)', 'Proficient in {}', '{} programming']
+
+
+def build_skill_list(size, seed=0):
+    rng = random.Random(seed)
+    aliases = list(skills.get_matcher().aliases)
+    out = []
+    for _ in range(size):
+        if rng.random() < 0.2:
+            out.append(rng.choice(UNKNOWN_SKILLS))
+        else:
+            out.append(rng.choice(DECORATIONS).format(rng.choice(aliases)))
+    return out
+
+
+class Command(BaseCommand):
+    help = 'Benchmark skill canonicalization (Aho-Corasick matcher vs one regex per alias)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=50000, help='Skill strings in the list')
+        parser.add_argument('--regex-sample', type=int, default=2000,
+                            help='Strings timed with the regex-per-alias baseline (it is slow)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        matcher = skills.get_matcher()
+        build_ms = (time.perf_counter() - started) * 1000
+        names = build_skill_list(options['size'])
+        self.stdout.write(f"Taxonomy: {len(matcher.aliases)} aliases, automaton built in {build_ms:.1f} ms")
+        self.stdout.write(f"Skill list: {len(names)} strings, {len(set(names))} distinct\n")
+
+        # The list repeats names, as real resumes do; time the matcher itself
+        # with the LRU cache bypassed, then through canonicalize_skills()
+        uncached_match = skills._canonicalize_key.__wrapped__
+        cold = self._rate(lambda: [uncached_match(skills._key(name)) for name in names], len(names))
+        skills._canonicalize_key.cache_clear()
+        warm = self._rate(lambda: skills.canonicalize_skills(names), len(names))
+
+        patterns = [(re.compile(r"(?<![\w+#])" + re.escape(alias) + r"(?![\w+#])"), alias) for alias in matcher.aliases]
+        sample = names[:options['regex_sample']]
+
+        def regex_baseline():
+            for name in sample:
+                key = name.lower()
+                [alias for pattern, alias in patterns if pattern.search(key)]
+
+        baseline = self._rate(regex_baseline, len(sample))
+
+        self.stdout.write(f"{'method':<36}{'skills/s':>14}")
+        self.stdout.write(f"{'regex per alias':<36}{baseline:>14,.0f}")
+        self.stdout.write(f"{'Aho-Corasick, uncached':<36}{cold:>14,.0f}")
+        self.stdout.write(f"{'canonicalize_skills (LRU cache)':<36}{warm:>14,.0f}")
+        self.stdout.write(self.style.SUCCESS(f"\nUncached matcher vs regex per alias: {cold / baseline:.0f}x"))
+
+    @staticmethod
+    def _rate(fn, count):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        return count / elapsed if elapsed else float('inf')
@@ -0,0 +1,51 @@
+"""
+Management command to build the public portfolio snapshots.
+
+Run after a deploy (or after changing PortfolioSerializer) so the first
+visitor of each shared link gets a precompressed snapshot instead of a cold
+render. Snapshots of portfolios that are no longer public are removed.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.models import Portfolio, PortfolioSnapshot
+from portfolio.snapshots import rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Build (or rebuild) PortfolioSnapshot rows for all public portfolios'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-only', action='store_true',
+                            help='Only build missing or stale snapshots')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        removed, _ = PortfolioSnapshot.objects.filter(portfolio__is_public=False).delete()
+
+        portfolio_ids = Portfolio.objects.filter(is_public=True).order_by('id').values_list('id', flat=True)
+        if options['stale_only']:
+            portfolio_ids = portfolio_ids.exclude(snapshot__is_stale=False)
+
+        built = failed = 0
+        raw_bytes = compressed_bytes = 0
+        for portfolio_id in portfolio_ids.iterator():
+            try:
+                snapshot = rebuild_snapshot(portfolio_id)
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"  ✗ portfolio {portfolio_id}: {e}"))
+                continue
+            if snapshot is not None:
+                built += 1
+                raw_bytes += len(snapshot.content)
+                compressed_bytes += len(snapshot.content_br or snapshot.content_gzip)
+
+        elapsed = time.perf_counter() - started
+        if built:
+            self.stdout.write(f"Average payload {raw_bytes // built} bytes, "
+                              f"{compressed_bytes // built} bytes compressed")
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Built {built} snapshots in {elapsed:.1f}s ({failed} failed, {removed} removed)"
+        ))
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:20
+
+import re
+import unicodedata
+from itertools import islice
+
+from django.db import migrations, models
+
+# Frozen copy of the key rules in portfolio/dedupe.py as of this migration,
+# so later changes to them do not change what it writes. Skills are keyed by
+# their plain normalized name: canonical names come from the skill taxonomy,
+# which changes independently; `manage.py renormalize_resumes --rekey`
+# recomputes every key with the current rules.
+MAX_KEY_LENGTH = 255
+NON_WORD = re.compile(r"[^\w+#]+")
+COMPANY_SUFFIX = re.compile(r"(?:\s+(?:inc|llc|ltd|limited|corp|corporation|co|company|gmbh|plc|pvt|sa|ag))+$")
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return NON_WORD.sub(' ', text).strip()
+
+
+def make_key(*parts):
+    return '|'.join(normalize_text(part) for part in parts)[:MAX_KEY_LENGTH]
+
+
+# model -> (fields the key reads, key builder)
+KEY_BUILDERS = {
+    'education': (('institution', 'field_of_study'), lambda row: make_key(row.institution, row.field_of_study)),
+    'experience': (('company', 'position'),
+                   lambda row: make_key(COMPANY_SUFFIX.sub('', normalize_text(row.company)), row.position)),
+    'hobby': (('name',), lambda row: make_key(row.name)),
+    'project': (('title',), lambda row: make_key(row.title)),
+    'skill': (('name',), lambda row: make_key(row.name)),
+}
+BATCH_SIZE = 1000
+
+
+def backfill_dedupe_keys(apps, schema_editor):
+    for model_name, (fields, build_key) in KEY_BUILDERS.items():
+        model = apps.get_model('portfolio', model_name)
+        rows = model.objects.only('id', *fields).order_by('id').iterator(chunk_size=BATCH_SIZE)
+        while True:
+            chunk = list(islice(rows, BATCH_SIZE))
+            if not chunk:
+                break
+            for row in chunk:
+                row.dedupe_key = build_key(row)
+            model.objects.bulk_update(chunk, ['dedupe_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_alter_experience_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='education',
+            name='dedupe_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='dedupe_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='hobby',
+            name='dedupe_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='dedupe_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='dedupe_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['portfolio', 'dedupe_key'], name='education_dedupe_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['portfolio', 'dedupe_key'], name='experience_dedupe_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hobby',
+            index=models.Index(fields=['portfolio', 'dedupe_key'], name='hobby_dedupe_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['portfolio', 'dedupe_key'], name='project_dedupe_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['portfolio', 'dedupe_key'], name='skill_dedupe_key_idx'),
+        ),
+        migrations.RunPython(backfill_dedupe_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.BinaryField(help_text='UTF-8 JSON as served by the public portfolio endpoint')),
+                ('content_gzip', models.BinaryField()),
+                ('content_br', models.BinaryField(blank=True, help_text='Empty when brotli is not installed', null=True)),
+                ('etag', models.CharField(max_length=66)),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('portfolio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='portfolio.portfolio')),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_portfolio_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='award',
+            index=models.Index(fields=['portfolio', '-date', 'order', 'id'], name='award_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['portfolio', '-issue_date', 'order', 'id'], name='certification_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['portfolio', '-is_primary', 'order', 'contact_type', 'id'], name='contact_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['portfolio', '-is_current', '-start_date', 'order', 'id'], name='education_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['portfolio', '-is_current', '-start_date', 'order', 'id'], name='experience_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hobby',
+            index=models.Index(fields=['portfolio', '-is_current', '-start_date', 'order', 'id'], name='hobby_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='other',
+            index=models.Index(fields=['portfolio', 'order', '-date', '-created_at', 'id'], name='other_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patent',
+            index=models.Index(fields=['portfolio', '-filing_date', 'order', 'id'], name='patent_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['portfolio', '-featured', 'order', '-created_at', 'id'], name='project_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['portfolio', '-publication_date', 'order', 'id'], name='publication_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['portfolio', 'category', 'order', 'name', 'id'], name='skill_page_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator, URLValidator
 
+from .dedupe import MAX_KEY_LENGTH, dedupe_key_for
+
 User = get_user_model()
 
 
@@ -27,7 +29,27 @@ class Portfolio(models.Model):
         return f"{self.user.email}'s Portfolio - {self.title}"
 
 
-class Project(models.Model):
+class DedupeKeyMixin(models.Model):
+    """Keeps the normalized, indexed dedupe_key up to date on save (see dedupe.py)."""
+    dedupe_key = models.CharField(max_length=MAX_KEY_LENGTH, blank=True, default='', editable=False)
+
+    class Meta:
+        abstract = True
+
+    def refresh_dedupe_key(self):
+        # Call before bulk_create/bulk_update, which skip save()
+        self.dedupe_key = dedupe_key_for(self)
+        return self.dedupe_key
+
+    def save(self, *args, **kwargs):
+        self.refresh_dedupe_key()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'dedupe_key' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'dedupe_key']
+        super().save(*args, **kwargs)
+
+
+class Project(DedupeKeyMixin):
     """Portfolio projects."""
     STATUS_CHOICES = [
         ('completed', 'Completed'),
@@ -53,12 +75,17 @@ class Project(models.Model):
     
     class Meta:
         ordering = ['-featured', 'order', '-created_at']
+        indexes = [
+            models.Index(fields=['portfolio', 'dedupe_key'], name='project_dedupe_key_idx'),
+            # Keyset pagination (see pagination.py)
+            models.Index(fields=['portfolio', '-featured', 'order', '-created_at', 'id'], name='project_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.portfolio.user.email} - {self.title}"
 
 
-class Skill(models.Model):
+class Skill(DedupeKeyMixin):
     """Skills in portfolio."""
     PROFICIENCY_CHOICES = [
         ('beginner', 'Beginner'),
@@ -94,12 +121,17 @@ class Skill(models.Model):
     class Meta:
         ordering = ['category', 'order', 'name']
         unique_together = ['portfolio', 'name']
+        indexes = [
+            models.Index(fields=['portfolio', 'dedupe_key'], name='skill_dedupe_key_idx'),
+            # Keyset pagination (see pagination.py)
+            models.Index(fields=['portfolio', 'category', 'order', 'name', 'id'], name='skill_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_proficiency_level_display()})"
 
 
-class Experience(models.Model):
+class Experience(DedupeKeyMixin):
     """Work experience entries."""
     EMPLOYMENT_TYPE_CHOICES = [
         ('full_time', 'Full-time'),
@@ -127,6 +159,11 @@ class Experience(models.Model):
     class Meta:
         ordering = ['-is_current', '-start_date', 'order']
         verbose_name_plural = 'Experiences'
+        indexes = [
+            models.Index(fields=['portfolio', 'dedupe_key'], name='experience_dedupe_key_idx'),
+            # Keyset pagination (see pagination.py)
+            models.Index(fields=['portfolio', '-is_current', '-start_date', 'order', 'id'], name='experience_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.position} at {self.company}"
@@ -138,7 +175,7 @@ class Experience(models.Model):
         super().save(*args, **kwargs)
 
 
-class Education(models.Model):
+class Education(DedupeKeyMixin):
     """Education history."""
     DEGREE_CHOICES = [
         ('high_school', 'High School'),
@@ -169,6 +206,11 @@ class Education(models.Model):
     class Meta:
         ordering = ['-is_current', '-start_date', 'order']
         verbose_name_plural = 'Education'
+        indexes = [
+            models.Index(fields=['portfolio', 'dedupe_key'], name='education_dedupe_key_idx'),
+            # Keyset pagination (see pagination.py)
+            models.Index(fields=['portfolio', '-is_current', '-start_date', 'order', 'id'], name='education_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.degree} in {self.field_of_study} from {self.institution}"
@@ -196,12 +238,14 @@ class Certification(models.Model):
     
     class Meta:
         ordering = ['-issue_date', 'order']
+        # Keyset pagination (see pagination.py)
+        indexes = [models.Index(fields=['portfolio', '-issue_date', 'order', 'id'], name='certification_page_idx')]
     
     def __str__(self):
         return f"{self.name} from {self.issuing_organization}"
 
 
-class Hobby(models.Model):
+class Hobby(DedupeKeyMixin):
     """Hobbies and extracurricular activities."""
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='hobbies')
     name = models.CharField(max_length=200)
@@ -229,6 +273,11 @@ class Hobby(models.Model):
     class Meta:
         ordering = ['-is_current', '-start_date', 'order']
         verbose_name_plural = 'Hobbies'
+        indexes = [
+            models.Index(fields=['portfolio', 'dedupe_key'], name='hobby_dedupe_key_idx'),
+            # Keyset pagination (see pagination.py)
+            models.Index(fields=['portfolio', '-is_current', '-start_date', 'order', 'id'], name='hobby_page_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -261,6 +310,8 @@ class Award(models.Model):
     
     class Meta:
         ordering = ['-date', 'order']
+        # Keyset pagination (see pagination.py)
+        indexes = [models.Index(fields=['portfolio', '-date', 'order', 'id'], name='award_page_idx')]
     
     def __str__(self):
         return f"{self.title} from {self.issuer}"
@@ -295,6 +346,8 @@ class Contact(models.Model):
     
     class Meta:
         ordering = ['-is_primary', 'order', 'contact_type']
+        # Keyset pagination (see pagination.py)
+        indexes = [models.Index(fields=['portfolio', '-is_primary', 'order', 'contact_type', 'id'], name='contact_page_idx')]
     
     def __str__(self):
         return f"{self.label} ({self.get_contact_type_display()})"
@@ -332,6 +385,8 @@ class Publication(models.Model):
     
     class Meta:
         ordering = ['-publication_date', 'order']
+        # Keyset pagination (see pagination.py)
+        indexes = [models.Index(fields=['portfolio', '-publication_date', 'order', 'id'], name='publication_page_idx')]
     
     def __str__(self):
         return self.title
@@ -365,6 +420,8 @@ class Patent(models.Model):
     
     class Meta:
         ordering = ['-filing_date', 'order']
+        # Keyset pagination (see pagination.py)
+        indexes = [models.Index(fields=['portfolio', '-filing_date', 'order', 'id'], name='patent_page_idx')]
     
     def __str__(self):
         return f"{self.title} ({self.patent_number or 'No number'})"
@@ -385,9 +442,27 @@ class Other(models.Model):
 
     class Meta:
         ordering = ['order', '-date', '-created_at']
+        # Keyset pagination (see pagination.py)
+        indexes = [models.Index(fields=['portfolio', 'order', '-date', '-created_at', 'id'], name='other_page_idx')]
         verbose_name = 'Other Item'
         verbose_name_plural = 'Other Items'
 
     def __str__(self):
         return f"{self.title}" + (f" ({self.category})" if self.category else "")
 
+
+
+class PortfolioSnapshot(models.Model):
+    """Rendered public JSON of a portfolio with precompressed copies (see snapshots.py)."""
+    portfolio = models.OneToOneField(Portfolio, on_delete=models.CASCADE, related_name='snapshot')
+    content = models.BinaryField(help_text="UTF-8 JSON as served by the public portfolio endpoint")
+    content_gzip = models.BinaryField()
+    content_br = models.BinaryField(null=True, blank=True, help_text="Empty when brotli is not installed")
+    etag = models.CharField(max_length=66)
+    # Bumped on every change; a rebuild only lands if it is still current
+    generation = models.PositiveIntegerField(default=0)
+    is_stale = models.BooleanField(default=False)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Snapshot of portfolio {self.portfolio_id}"
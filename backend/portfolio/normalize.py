@@ -2,60 +2,29 @@
 import re
 from typing import Any, Dict, List, Tuple, Optional
 
-SPACE_FIXES = [
+# Character-level fixes, applied in one str.translate pass
+SPACE_FIXES = str.maketrans({
     # common ligatures/symbols
-    (r"–|—|−", "-"),
-    (r"•|▪|‣|●|■|\*", ""),   # bullet marks
-    (r"\s{2,}", " "),
-]
+    "–": "-", "—": "-", "−": "-",
+    # bullet marks
+    "•": None, "▪": None, "‣": None, "●": None, "■": None, "*": None,
+})
+# e.g. "B.S.inInformatics" -> "B.S.in Informatics"
+CAMEL_JOIN = re.compile(r"([A-Za-z])([A-Z][a-z])")
+MULTI_SPACE = re.compile(r"\s{2,}")
 
 
 
 
 URL_FIX = re.compile(r"\s")
 PHONE_CLEAN = re.compile(r"[^\d+]")
+NON_DIGIT = re.compile(r"\D")
+BULLET_SPLIT = re.compile(r"(?:\n|\r|\u2022|•|- |\* )+")
+SKILL_SPLIT = re.compile(r"[,\|/;]")
+SKILL_PREFIX = re.compile(r"(?i)^(libraries|frameworks|tools|languages|data science/ml)\s*:\s*")
 
-import re
-
-MONTH_MAP = {
-    "jan": "January",
-    "feb": "February",
-    "mar": "March",
-    "apr": "April",
-    "may": "May",
-    "jun": "June",
-    "jul": "July",
-    "aug": "August",
-    "sep": "September",
-    "sept": "September",
-    "oct": "October",
-    "nov": "November",
-    "dec": "December",
-}
-
-# Matches: Aug 2019 – May 2023, September ’21 – Present, etc.
-MONTH_YEAR_RANGE = re.compile(
-    r"(?i)"
-    r"((jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*)"   # month1
-    r"\s*['’]?\s*"
-    r"(\d{2,4})"                                                       # year1 (2 or 4 digits)
-    r"\s*[-–—]\s*"
-    r"((jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*)"   # month2
-    r"\s*['’]?\s*"
-    r"(\d{2,4}|present)"                                               # year2
-)
-
-
-# Matches: 2019 – 2023, 2017-present, 2020–, 2021 - Present
-YEAR_RANGE = re.compile(
-    r"(?i)"
-    r"(19|20)\d{2}"
-    r"\s*[-–—]\s*"
-    r"((19|20)\d{2}|present)?"
-)
-
-# Matches: 2019, 2020, etc.
-JUST_YEAR = re.compile(r"(19|20)\d{2}")
+from .dates import parse_date_range
+from .skills import canonicalize_skills
 
 
 def _fix_short_years(s: str):
@@ -64,55 +33,16 @@ def _fix_short_years(s: str):
 
 
 def parse_years(s: str):
-    if not s:
-        return (None, None, False)
-
-    s_norm = s.lower().strip()
-    s_norm = s_norm.replace("’", "'")
-
-    # Convert short years ('24 → 2024)
-    s_norm = re.sub(r"'\s*(\d{2})", lambda m: "20" + m.group(1), s_norm)
-
-    # ---------- 1. MONTH + YEAR RANGE ----------
-    m = MONTH_YEAR_RANGE.search(s_norm)
-    if m:
-        month1_raw, _, year1_raw, month2_raw, _, year2_raw = m.groups()
-
-        # Normalize months
-        month1 = MONTH_MAP[month1_raw[:3]]
-        month2 = MONTH_MAP[month2_raw[:3]]
-
-        # Normalize years
-        year1 = int(year1_raw) if len(year1_raw) == 4 else int("20" + year1_raw)
-        if year2_raw == "present":
-            return (f"{month1} {year1}", None, True)
-
-        year2 = int(year2_raw) if len(year2_raw) == 4 else int("20" + year2_raw)
-
-        print("Parsed month-year range:", month1, year1, month2, year2, "from", s)
-        return (f"{month1} {year1}", f"{month2} {year2}", False)
-
-    # ---------- 2. YEAR RANGE ----------
-    m = YEAR_RANGE.search(s_norm)
-    if m:
-        y1_raw = m.group(1)
-        y2_raw = m.group(2)
-
-        start = int(y1_raw)
-
-        if not y2_raw:
-            return (str(start), None, False)
-        if y2_raw == "present":
-            return (str(start), None, True)
-        print("Parsed year range:", start, y2_raw, "from", s)
-        return (str(start), str(int(y2_raw)), False)
-
-    # ---------- 3. SINGLE YEAR ----------
-    ys = JUST_YEAR.findall(s_norm)
-    if ys:
-        return (ys[0], None, False)
-
-    return (None, None, False)
+    """
+    Parse a resume date range into (start, end, is_current), with start/end
+    as stored on Experience/Education ('August 2019', '2021') or None.
+    """
+    start, end = parse_date_range(s)
+    return (
+        start.label() if start else None,
+        end.label() if end else None,
+        bool(end and end.is_present),
+    )
 
 
 # YEAR_RANGE = re.compile(
@@ -129,12 +59,11 @@ def _s(text: Optional[str]) -> str:
     return (text or "").strip()
 
 def normalize_whitespace(text: str) -> str:
-    t = text
-    # remove weird joins: e.g., "B.S.inInformatics" -> "B.S. in Informatics"
-    t = re.sub(r"([A-Za-z])([A-Z][a-z])", r"\1 \2", t)
-    t = t.replace("inIn", " in In")
-    for pat, repl in SPACE_FIXES:
-        t = re.sub(pat, repl, t)
+    # Order matters: joins are split before bullets are dropped, so "a•Bc"
+    # stays "aBc", and whitespace is collapsed last.
+    t = CAMEL_JOIN.sub(r"\1 \2", text)
+    t = t.translate(SPACE_FIXES)
+    t = MULTI_SPACE.sub(" ", t)
     return t.strip()
 
 def clean_url(url: str) -> str:
@@ -153,13 +82,13 @@ def clean_email(raw: str) -> str:
 def clean_phone(raw: str) -> str:
     p = PHONE_CLEAN.sub("", raw or "")
     # keep basic + and digits, require at least 10 digits to be useful
-    return p if len(re.sub(r"\D", "", p)) >= 10 else ""
+    return p if len(NON_DIGIT.sub("", p)) >= 10 else ""
 
 def split_bullets(text: str) -> List[str]:
     if not text:
         return []
     # split on bullets or line breaks
-    parts = re.split(r"(?:\n|\r|\u2022|•|- |\* )+", text)
+    parts = BULLET_SPLIT.split(text)
     out = []
     for p in parts:
         p = normalize_whitespace(p)
@@ -191,7 +120,7 @@ def clean_skills(raw_list: Any) -> List[str]:
     if isinstance(raw_list, list):
         items = raw_list
     elif isinstance(raw_list, str):
-        items = re.split(r"[,\|/;]", raw_list)
+        items = SKILL_SPLIT.split(raw_list)
     else:
         items = []
 
@@ -199,19 +128,12 @@ def clean_skills(raw_list: Any) -> List[str]:
     for it in items:
         it = normalize_whitespace(it)
         # remove prefixes like "Libraries:" "Data Science/ML:"
-        it = re.sub(r"(?i)^(libraries|frameworks|tools|languages|data science/ml)\s*:\s*", "", it)
+        it = SKILL_PREFIX.sub("", it)
         # drop empties and too short
         if 2 <= len(it) <= 50:
             out.append(it)
-    # dedupe preserving order
-    seen = set()
-    uniq = []
-    for s in out:
-        key = s.lower()
-        if key not in seen:
-            seen.add(key)
-            uniq.append(s)
-    return uniq
+    # "JS" / "Javascript" / "JavaScript (ES6)" -> "JavaScript", deduped preserving order
+    return [name for name, _ in canonicalize_skills(out)]
 
 def clean_structured(d: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(d, dict):
@@ -284,7 +206,7 @@ def clean_structured(d: Dict[str, Any]) -> Dict[str, Any]:
         })
 
     skills = clean_skills(d.get("skills", []))
-    extracurriculars = [normalize_whitespace(x) for x in d.get("extracurriculars", []) or [] if len(normalize_whitespace(x)) >= 5][:50]
+    extracurriculars = [x for x in map(normalize_whitespace, d.get("extracurriculars", []) or []) if len(x) >= 5][:50]
 
     return {
         "name": name,
@@ -0,0 +1,152 @@
+# portfolio/pagination.py
+"""
+Opt-in keyset (cursor) pagination for the portfolio section list endpoints.
+
+Lists stay unpaginated unless the request has ``page_size`` or ``cursor``.
+Pages follow the model's Meta.ordering with the id as tie-breaker, and the
+cursor holds the sort values of the last row of the previous page, so the
+next page is a WHERE on those values (served by the composite
+``*_page_idx`` indexes) rather than an OFFSET that scans every earlier row.
+Rows added or removed between requests do not shift later pages.
+
+Pages use the database's own NULL placement (PostgreSQL puts NULLs last
+ascending and first descending, SQLite the other way round), so the order is
+exactly Meta.ordering and matches the indexes. The seek only adds IS NULL
+branches for nullable keys whose NULLs come after the cursor, and bounds the
+first key on its own (k1 >= v1) so the index is range-scanned from the cursor
+instead of the OR being tested against every row of the portfolio.
+"""
+import base64
+import binascii
+import json
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import F, Q
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def sort_keys(model) -> List[Tuple[str, bool]]:
+    """(field name, descending) for Meta.ordering plus the id tie-breaker."""
+    keys = [(name.lstrip('-'), name.startswith('-')) for name in model._meta.ordering]
+    if not any(name in ('id', 'pk') for name, _ in keys):
+        keys.append(('id', False))
+    return keys
+
+
+def _order_by(keys):
+    return [F(name).desc() if descending else F(name).asc() for name, descending in keys]
+
+
+def _nulls_last(descending) -> bool:
+    """Whether the database sorts NULLs after other values in this direction."""
+    return descending != connection.features.nulls_order_largest
+
+
+def _after(name, descending, nullable, value) -> Q:
+    """Rows strictly after ``value`` in this key's direction."""
+    nulls_last = _nulls_last(descending)
+    if value is None:
+        return Q(pk__in=[]) if nulls_last else Q(**{f'{name}__isnull': False})
+    after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+    if nullable and nulls_last:
+        after |= Q(**{f'{name}__isnull': True})
+    return after
+
+
+def _equal(name, value) -> Q:
+    return Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+
+
+def _seek(model, keys, values) -> Q:
+    """(k1 after v1) OR (k1 = v1 AND k2 after v2) OR ..., for the cursor values."""
+    condition = Q(pk__in=[])
+    prefix = Q()
+    for (name, descending), value in zip(keys, values):
+        nullable = model._meta.get_field(name).null
+        condition |= prefix & _after(name, descending, nullable, value)
+        prefix &= _equal(name, value)
+
+    # Redundant with the OR above, but a plain range on the first key that
+    # the index can seek to
+    (name, descending), value = keys[0], values[0]
+    if value is not None and not (model._meta.get_field(name).null and _nulls_last(descending)):
+        condition &= Q(**{f"{name}__{'lte' if descending else 'gte'}": value})
+    return condition
+
+
+def encode_cursor(section, keys, row) -> str:
+    values = [getattr(row, name) for name, _ in keys]
+    payload = json.dumps([section, values], default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(section, model, keys, cursor: str) -> list:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_section, values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if cursor_section != section or len(values) != len(keys):
+            raise InvalidCursor(cursor)
+        return [
+            None if value is None else model._meta.get_field(name).to_python(value)
+            for (name, _), value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeError, ValidationError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def _page_size(request) -> int:
+    raw = request.query_params.get('page_size')
+    if raw is None:
+        return settings.PORTFOLIO_PAGE_SIZE
+    size = int(raw)
+    if size < 1:
+        raise ValueError(raw)
+    return min(size, settings.PORTFOLIO_MAX_PAGE_SIZE)
+
+
+def paginate_section(request, queryset, serializer_class, section: str) -> Optional[Response]:
+    """
+    One page of ``queryset`` as {section: [...], 'count', 'page_size',
+    'next_cursor'} when the request asks for pagination, else None (the
+    caller returns the full list as before).
+    """
+    params = request.query_params
+    if 'page_size' not in params and 'cursor' not in params:
+        return None
+
+    model = queryset.model
+    keys = sort_keys(model)
+    try:
+        size = _page_size(request)
+    except ValueError:
+        return Response({
+            'error': 'page_size must be a positive integer'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = queryset.order_by(*_order_by(keys))
+    if params.get('cursor'):
+        try:
+            values = decode_cursor(section, model, keys, params['cursor'])
+        except InvalidCursor:
+            return Response({
+                'error': 'Invalid cursor'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(_seek(model, keys, values))
+
+    rows = list(queryset[:size + 1])
+    page, has_more = rows[:size], len(rows) > size
+    data = serializer_class(page, many=True).data
+    return Response({
+        section: data,
+        'count': len(data),
+        'page_size': size,
+        'next_cursor': encode_cursor(section, keys, page[-1]) if has_more else None
+    }, status=status.HTTP_200_OK)
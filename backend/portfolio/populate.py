@@ -0,0 +1,403 @@
+# portfolio/populate.py
+"""
+Populate a portfolio from cleaned resume data (see normalize.clean_structured).
+
+Each section is handled as a set: the existing dedupe keys are loaded once,
+incoming items are matched against them (and against each other) by their
+normalized dedupe key (see dedupe.py), and the result is written with one
+delete() and one bulk_create() per section, all in a single transaction. The
+query count no longer grows with the size of the resume.
+
+bulk_create() skips Model.save(), so anything save() would do (clearing
+end_date on current entries, setting dedupe_key) is done while building the
+rows.
+"""
+import re
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .dedupe import find_near_duplicate
+from .public_cache import invalidate, invalidation_batch
+from .models import Education, Experience, Hobby, Portfolio, Project, Skill
+from .skills import skill_category
+
+SECTIONS = ('education', 'experience', 'projects', 'skills', 'hobbies')
+
+# Where each section's items live in clean_structured output
+DATA_KEYS = {'hobbies': 'extracurriculars'}
+
+
+def _degree_choice(degree_text: str) -> str:
+    degree_text = degree_text.lower()
+    if 'bachelor' in degree_text or 'b.s' in degree_text or 'b.a' in degree_text:
+        return 'bachelor'
+    elif 'master' in degree_text or 'm.s' in degree_text or 'm.a' in degree_text:
+        return 'master'
+    elif 'phd' in degree_text or 'ph.d' in degree_text or 'doctor' in degree_text:
+        return 'phd'
+    elif 'associate' in degree_text:
+        return 'associate'
+    elif 'high school' in degree_text:
+        return 'high_school'
+    return 'other'
+
+
+def _build_education(portfolio, edu_data) -> Optional[Education]:
+    if not edu_data.get('degree'):
+        return None
+
+    # Parse year to date
+    year_str = edu_data.get('year', '')
+    end_date = None
+    start_date = None
+    if year_str:
+        try:
+            year = int(''.join(filter(str.isdigit, year_str))[:4])
+            if year > 0:
+                end_date = date(year, 12, 31).isoformat()
+                start_date = date(max(year - 4, 2000), 9, 1).isoformat()  # Assume 4-year degree
+        except ValueError:
+            pass
+
+    # If no date parsed, use defaults
+    if not start_date:
+        start_date = date(2020, 9, 1).isoformat()
+
+    return Education(
+        portfolio=portfolio,
+        degree=_degree_choice(edu_data.get('degree', '')),
+        institution=edu_data.get('institution', 'Unknown Institution')[:200],
+        field_of_study=edu_data.get('degree', 'Not Specified')[:200],
+        start_date=edu_data.get('start_date', start_date),
+        end_date=edu_data.get('end_date', end_date),
+        grade=edu_data.get('gpa', '')[:50] if edu_data.get('gpa') else ''
+    )
+
+
+def _build_experience(portfolio, exp_data) -> Optional[Experience]:
+    if not exp_data.get('company') or not exp_data.get('role'):
+        return None
+
+    # Parse years
+    years_str = exp_data.get('years', '')
+    start_date = date(2020, 1, 1).isoformat()  # Default
+    end_date = None
+    is_current = 'present' in years_str.lower() if years_str else False
+
+    # Try to parse year from years string
+    if years_str:
+        years = re.findall(r'(?:19|20)\d{2}', years_str)
+        if len(years) >= 1:
+            start_date = date(int(years[0]), 1, 1).isoformat()
+            if len(years) >= 2 and not is_current:
+                end_date = date(int(years[1]), 12, 31).isoformat()
+
+    experience = Experience(
+        portfolio=portfolio,
+        company=exp_data.get('company', '')[:200],
+        position=exp_data.get('role', '')[:200],
+        description=exp_data.get('role_summary', ''),
+        start_date=exp_data.get('start_date', start_date),
+        end_date=exp_data.get('end_date', end_date),
+        is_current=exp_data.get('is_current', is_current)
+    )
+    # What Experience.save() would do
+    if experience.is_current:
+        experience.end_date = None
+    return experience
+
+
+def _build_project(portfolio, proj_data) -> Optional[Project]:
+    if not proj_data.get('title'):
+        return None
+    return Project(
+        portfolio=portfolio,
+        title=proj_data.get('title', '')[:200],
+        description=proj_data.get('description', ''),
+        tech_stack=proj_data.get('technologies', [])
+    )
+
+
+def _build_skill(portfolio, skill_name) -> Optional[Skill]:
+    if not skill_name or len(skill_name) < 2:
+        return None
+    return Skill(
+        portfolio=portfolio,
+        name=skill_name[:100],
+        category=skill_category(skill_name)
+    )
+
+
+def _build_hobby(portfolio, hobby_text) -> Optional[Hobby]:
+    if not hobby_text or len(hobby_text) < 5:
+        return None
+    # Extract name (first part before any punctuation or newline)
+    name = hobby_text.split('.')[0].split('\n')[0][:200]
+    return Hobby(
+        portfolio=portfolio,
+        name=name,
+        description=hobby_text
+    )
+
+
+# section -> (model, build(portfolio, item), replace on overwrite)
+SECTION_SPECS: Dict[str, Tuple[Any, Callable, bool]] = {
+    'education': (Education, _build_education, True),
+    'experience': (Experience, _build_experience, True),
+    'projects': (Project, _build_project, True),
+    'skills': (Skill, _build_skill, False),
+    'hobbies': (Hobby, _build_hobby, True),
+}
+
+
+def _match(key: str, keys, threshold: float) -> Optional[str]:
+    """The key in ``keys`` that ``key`` duplicates, exactly or (threshold > 0) fuzzily."""
+    if key in keys:
+        return key
+    if threshold > 0:
+        return find_near_duplicate(key, keys, threshold)
+    return None
+
+
+def _plan_section(portfolio, section, items, existing_keys, overwrite) -> Tuple[List[Any], int]:
+    """Return (rows to create, number skipped) for one section."""
+    model, build, replaces = SECTION_SPECS[section]
+    threshold = settings.PORTFOLIO_FUZZY_DEDUPE_THRESHOLD
+    pending: Dict[str, Any] = {}
+    skipped = 0
+    for item in items or []:
+        row = build(portfolio, item)
+        if row is None:
+            continue
+        key = row.refresh_dedupe_key()
+        if _match(key, existing_keys, threshold) is not None:
+            skipped += 1
+            continue
+        duplicate = _match(key, pending, threshold)
+        if duplicate is not None:
+            # A later entry replaces an earlier one on overwrite, as the
+            # delete-then-create did row by row
+            if overwrite and replaces:
+                del pending[duplicate]
+            else:
+                skipped += 1
+                continue
+        pending[key] = row
+    return list(pending.values()), skipped
+
+
+def _refresh_portfolio(portfolio, data) -> Dict[str, Any]:
+    """Copy top-level fields from ``data``; return {changed field: old value}."""
+    values = {
+        'github': data.get('github', portfolio.github),
+        'linkedin': data.get('linkedin', portfolio.linkedin),
+        'title': data.get('name') or portfolio.title,
+    }
+    changed = {name: getattr(portfolio, name) for name, value in values.items() if getattr(portfolio, name) != value}
+    for name in changed:
+        setattr(portfolio, name, values[name])
+    return changed
+
+
+def _get_portfolio(user, data) -> Tuple[Portfolio, bool]:
+    # Call inside a transaction: the row lock makes concurrent populates and
+    # preview applies of one portfolio run one after the other
+    portfolio = Portfolio.objects.select_for_update().filter(user=user).first()
+    if portfolio is not None:
+        return portfolio, False
+    return Portfolio.objects.get_or_create(
+        user=user,
+        defaults={
+            'title': data.get('name', 'My Portfolio'),
+            'github': data.get('github', ''),
+            'linkedin': data.get('linkedin', '')
+        }
+    )
+
+
+def populate_portfolio(user, data: Dict[str, Any], overwrite: bool = True) -> Tuple[Portfolio, Dict[str, Any]]:
+    """
+    Create portfolio entries for ``user`` from cleaned resume ``data``.
+
+    With ``overwrite`` the existing education, experience, projects, skills
+    and hobbies are replaced; without it, items that already exist are
+    skipped.
+
+    Returns:
+        (portfolio, stats) where stats counts created and skipped per section
+    """
+    stats = {
+        'created': {section: 0 for section in SECTIONS},
+        'skipped': {section: 0 for section in SECTIONS},
+    }
+    # Bulk writes send no signals; deletes would invalidate once per row
+    with invalidation_batch(), transaction.atomic():
+        portfolio, created = _get_portfolio(user, data)
+        invalidate(portfolio.pk)
+
+        # Refresh top-level fields on overwrite
+        if overwrite and not created:
+            _refresh_portfolio(portfolio, data)
+            portfolio.save()
+
+        wipe = overwrite and not created
+        for section in SECTIONS:
+            model = SECTION_SPECS[section][0]
+            # A new or wiped portfolio has nothing to compare against
+            existing_keys = set() if created or wipe else set(
+                model.objects.filter(portfolio=portfolio).values_list('dedupe_key', flat=True)
+            )
+            items = data.get(DATA_KEYS.get(section, section))
+            rows, skipped = _plan_section(portfolio, section, items, existing_keys, overwrite)
+            if wipe:
+                model.objects.filter(portfolio=portfolio).delete()
+            if rows:
+                model.objects.bulk_create(rows)
+            stats['created'][section] = len(rows)
+            stats['skipped'][section] = skipped
+
+    return portfolio, stats
+
+
+# ==================== Merge ====================
+
+# Fields a re-upload may change on a matched row; anything else (order,
+# featured, proficiency, links the user added) is left alone
+MERGE_FIELDS = {
+    'education': ('degree', 'institution', 'field_of_study', 'start_date', 'end_date', 'grade'),
+    'experience': ('company', 'position', 'description', 'start_date', 'end_date', 'is_current'),
+    'projects': ('title', 'description', 'tech_stack'),
+    'skills': ('name',),
+    'hobbies': ('name', 'description'),
+}
+
+
+def diff_section(portfolio, section, items, existing) -> Dict[str, Any]:
+    """
+    Match incoming ``items`` to ``existing`` rows by dedupe key.
+
+    Matched rows are modified in place (not saved) when a merge field
+    differs. Existing rows nothing matched, including extra rows sharing a
+    key, are to be deleted.
+
+    Returns:
+        {'create': [new rows], 'update': [(row, {changed field: old value})],
+         'delete': [rows], 'unchanged': count}
+    """
+    model = SECTION_SPECS[section][0]
+    threshold = settings.PORTFOLIO_FUZZY_DEDUPE_THRESHOLD
+    incoming, _ = _plan_section(portfolio, section, items, set(), overwrite=True)
+
+    unmatched: Dict[str, Any] = {}
+    for row in existing:
+        unmatched.setdefault(row.dedupe_key, row)
+    matched_ids = set()
+    diff = {'create': [], 'update': [], 'delete': [], 'unchanged': 0}
+    for new in incoming:
+        key = _match(new.dedupe_key, unmatched, threshold)
+        if key is None:
+            diff['create'].append(new)
+            continue
+        old = unmatched.pop(key)
+        matched_ids.add(old.pk)
+        changed = {}
+        for name in MERGE_FIELDS[section]:
+            value = model._meta.get_field(name).to_python(getattr(new, name))
+            if getattr(old, name) != value:
+                changed[name] = getattr(old, name)
+                setattr(old, name, value)
+        if changed:
+            if old.refresh_dedupe_key() != key:
+                changed['dedupe_key'] = key
+            diff['update'].append((old, changed))
+        else:
+            diff['unchanged'] += 1
+    diff['delete'] = [row for row in existing if row.pk not in matched_ids]
+    return diff
+
+
+def apply_section_diff(model, diff) -> Dict[str, Any]:
+    """Write one section's diff; return {'created': [ids], 'updated': {id: fields}, 'deleted': [ids]}."""
+    deleted = [row.pk for row in diff['delete']]
+    # Delete first so a renamed row can take over a freed unique name
+    if deleted:
+        model.objects.filter(pk__in=deleted).delete()
+    if diff['update']:
+        rows = [row for row, _ in diff['update']]
+        fields = sorted({name for _, changed in diff['update'] for name in changed})
+        # bulk_update() skips auto_now
+        if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+            now = timezone.now()
+            for row in rows:
+                row.updated_at = now
+            fields.append('updated_at')
+        model.objects.bulk_update(rows, fields)
+    created = model.objects.bulk_create(diff['create']) if diff['create'] else []
+    return {
+        'created': [row.pk for row in created],
+        'updated': {row.pk: list(changed) for row, changed in diff['update']},
+        'deleted': deleted,
+    }
+
+
+def load_sections(portfolio) -> Dict[str, List[Any]]:
+    """Existing rows of every section: one query each, none for a new portfolio."""
+    if portfolio is None or portfolio.pk is None:
+        return {section: [] for section in SECTIONS}
+    return {section: list(SECTION_SPECS[section][0].objects.filter(portfolio=portfolio)) for section in SECTIONS}
+
+
+def plan_merge(portfolio, data: Dict[str, Any], existing: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+    """diff_section() for every section; ``existing`` is load_sections() output."""
+    return {
+        section: diff_section(portfolio, section, data.get(DATA_KEYS.get(section, section)), existing[section])
+        for section in SECTIONS
+    }
+
+
+def apply_merge(portfolio, plan: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Write a plan_merge() result; return the merge statistics."""
+    stats = {key: {section: 0 for section in SECTIONS} for key in ('created', 'updated', 'deleted', 'unchanged')}
+    stats['diff'] = {}
+    for section, diff in plan.items():
+        # The plan may have been made before the portfolio existed
+        for row in diff['create']:
+            row.portfolio = portfolio
+        applied = apply_section_diff(SECTION_SPECS[section][0], diff)
+        stats['created'][section] = len(applied['created'])
+        stats['updated'][section] = len(applied['updated'])
+        stats['deleted'][section] = len(applied['deleted'])
+        stats['unchanged'][section] = diff['unchanged']
+        stats['diff'][section] = applied
+    return stats
+
+
+def merge_portfolio(user, data: Dict[str, Any]) -> Tuple[Portfolio, Dict[str, Any]]:
+    """
+    Merge cleaned resume ``data`` into the portfolio of ``user``.
+
+    Unlike populate_portfolio(overwrite=True), existing rows keep their ids:
+    items are matched by dedupe key, only changed fields are written (one
+    bulk_update per section), new items are inserted and rows missing from
+    the resume are deleted.
+
+    Returns:
+        (portfolio, stats) with created/updated/deleted/unchanged counts per
+        section and the per-section diff of ids (and changed fields)
+    """
+    with invalidation_batch(), transaction.atomic():
+        portfolio, created = _get_portfolio(user, data)
+        invalidate(portfolio.pk)
+        if not created:
+            changed = _refresh_portfolio(portfolio, data)
+            if changed:
+                portfolio.save(update_fields=[*changed, 'updated_at'])
+
+        plan = plan_merge(portfolio, data, load_sections(None if created else portfolio))
+        stats = apply_merge(portfolio, plan)
+
+    return portfolio, stats
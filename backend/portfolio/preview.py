@@ -0,0 +1,172 @@
+# portfolio/preview.py
+"""
+Dry-run previews of merging a resume into a portfolio.
+
+preview_merge() reads the portfolio and its five resume-populated sections (a
+fixed number of queries whatever the size of the resume), runs plan_merge()
+in memory and keeps the plan in the Django cache under a random token. After
+the user has reviewed the diff, apply_preview() writes exactly that plan; the
+resume is not re-read and nothing is matched again.
+
+A plan carries a fingerprint of the rows it was computed against. If the
+portfolio changed in between (an edit in another tab, another upload), the
+plan is refused and the client has to ask for a new preview. The check and
+the write run in one transaction with the portfolio row locked.
+"""
+import hashlib
+import json
+import secrets
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Portfolio
+from .populate import (
+    MERGE_FIELDS, SECTION_SPECS, SECTIONS, _get_portfolio, _refresh_portfolio, apply_merge, load_sections, plan_merge,
+)
+from .public_cache import invalidate, invalidation_batch
+
+PORTFOLIO_FIELDS = ('title', 'github', 'linkedin')
+
+
+class PreviewExpired(Exception):
+    """The token is unknown, expired, already applied or someone else's."""
+
+
+class PreviewStale(Exception):
+    """The portfolio changed after the preview was made."""
+
+
+def _cache_key(user_id, token) -> str:
+    return f"populate-preview:{user_id}:{token}"
+
+
+def _fingerprint(portfolio, rows: Dict[str, list]) -> str:
+    """SHA-256 over the portfolio fields and each section's (id, dedupe_key, merge fields) tuples."""
+    state = {
+        'portfolio': [portfolio.pk, *(getattr(portfolio, name) for name in PORTFOLIO_FIELDS)] if portfolio else None,
+        'sections': {section: sorted(rows[section], key=lambda values: values[0]) for section in SECTIONS},
+    }
+    payload = json.dumps(state, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _row_values(section, row) -> tuple:
+    return (row.pk, row.dedupe_key, *(getattr(row, name) for name in MERGE_FIELDS[section]))
+
+
+def _current_fingerprint(portfolio) -> str:
+    """_fingerprint() of what is in the database now (one query per section)."""
+    rows = {section: [] for section in SECTIONS}
+    if portfolio is not None:
+        for section in SECTIONS:
+            rows[section] = list(
+                SECTION_SPECS[section][0].objects.filter(portfolio=portfolio)
+                .values_list('pk', 'dedupe_key', *MERGE_FIELDS[section])
+            )
+    return _fingerprint(portfolio, rows)
+
+
+def describe_plan(plan, portfolio_changes: Dict[str, Any], creates_portfolio: bool) -> Dict[str, Any]:
+    """JSON-friendly view of a plan_merge() result for the client."""
+    sections = {}
+    for section, diff in plan.items():
+        fields = MERGE_FIELDS[section]
+        sections[section] = {
+            'create': [{name: getattr(row, name) for name in fields} for row in diff['create']],
+            'update': [
+                {
+                    'id': row.pk,
+                    'changes': {
+                        name: {'from': old, 'to': getattr(row, name)}
+                        for name, old in changed.items() if name != 'dedupe_key'
+                    },
+                }
+                for row, changed in diff['update']
+            ],
+            'delete': [{'id': row.pk, **{name: getattr(row, name) for name in fields}} for row in diff['delete']],
+            'unchanged': diff['unchanged'],
+        }
+    return {
+        'portfolio': {
+            'create': creates_portfolio,
+            'changes': {name: {'from': old, 'to': new} for name, (old, new) in portfolio_changes.items()},
+        },
+        'sections': sections,
+    }
+
+
+def preview_merge(user, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Compute the merge of cleaned resume ``data`` into the portfolio of
+    ``user`` without writing it.
+
+    Returns:
+        (token, diff) where diff is describe_plan() output; pass the token
+        to apply_preview() within POPULATE_PREVIEW_TTL_SECONDS
+    """
+    portfolio = Portfolio.objects.filter(user=user).first()
+    existing = load_sections(portfolio)
+    # Before plan_merge(), which modifies matched rows in place
+    fingerprint = _fingerprint(portfolio, {
+        section: [_row_values(section, row) for row in rows] for section, rows in existing.items()
+    })
+
+    top = {name: data.get(name) for name in ('name', 'github', 'linkedin') if name in data}
+    portfolio_changes = {}
+    if portfolio is None:
+        planned = Portfolio(user=user)
+    else:
+        planned = portfolio
+        old_values = _refresh_portfolio(portfolio, top)
+        portfolio_changes = {name: (old, getattr(portfolio, name)) for name, old in old_values.items()}
+    plan = plan_merge(planned, data, existing)
+
+    token = secrets.token_urlsafe(24)
+    cache.set(
+        _cache_key(user.id, token),
+        {'top': top, 'plan': plan, 'fingerprint': fingerprint},
+        timeout=settings.POPULATE_PREVIEW_TTL_SECONDS,
+    )
+    return token, describe_plan(plan, portfolio_changes, creates_portfolio=portfolio is None)
+
+
+def apply_preview(user, token: str) -> Tuple[Portfolio, Dict[str, Any]]:
+    """
+    Write the plan stored by preview_merge() under ``token``. A token can be
+    applied once.
+
+    Raises:
+        PreviewExpired: no plan for this user and token
+        PreviewStale: the portfolio changed since the preview
+
+    Returns:
+        (portfolio, stats) as merge_portfolio() does
+    """
+    key = _cache_key(user.id, token)
+    preview = cache.get(key)
+    if preview is None:
+        raise PreviewExpired(token)
+    cache.delete(key)
+
+    with invalidation_batch(), transaction.atomic():
+        # Lock the portfolio row so no other apply or populate can change the
+        # sections between the fingerprint check and the write
+        portfolio = Portfolio.objects.select_for_update().filter(user=user).first()
+        if _current_fingerprint(portfolio) != preview['fingerprint']:
+            raise PreviewStale(token)
+        if portfolio is None:
+            portfolio, created = _get_portfolio(user, preview['top'])
+            if not created:
+                # Created by a concurrent request after the check
+                raise PreviewStale(token)
+        else:
+            changed = _refresh_portfolio(portfolio, preview['top'])
+            if changed:
+                portfolio.save(update_fields=[*changed, 'updated_at'])
+        stats = apply_merge(portfolio, preview['plan'])
+        invalidate(portfolio.pk)
+
+    return portfolio, stats
@@ -0,0 +1,161 @@
+# portfolio/public_cache.py
+"""
+Cache of public portfolio payloads (GET /api/portfolio/public/<user_id>/).
+Payloads are the precompressed bytes of the portfolio's snapshot (see
+snapshots.py).
+
+Every portfolio has a version in the Django cache (also behind the owner's
+ETags, see conditional.py). It is replaced whenever
+the portfolio or one of its items is saved or deleted (signals.py), and
+explicitly after bulk writes, which send no signals (populate.py). Payloads
+are stored per owner together with the portfolio id and the version they were
+built from, so a hit is two cache reads and no model queries. With the default
+DatabaseCache those reads are cache-table lookups; point CACHE_BACKEND at
+redis to keep hits off the database entirely.
+
+On a miss, single_flight() lets one worker load the snapshot (rendering it
+if its background rebuild has not finished) while concurrent requests for the
+same owner wait for its result.
+"""
+import threading
+import uuid
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from resume_parser.single_flight import single_flight
+
+from . import snapshots
+from .models import Portfolio
+
+# Max seconds a request waits for another worker's rebuild before doing it itself
+REBUILD_TIMEOUT = 10
+
+_local = threading.local()
+
+
+def _version_key(portfolio_id) -> str:
+    return f"portfolio:public:version:{portfolio_id}"
+
+
+def _payload_key(user_id) -> str:
+    return f"portfolio:public:payload:{user_id}"
+
+
+def bump_version(portfolio_id):
+    cache.set(_version_key(portfolio_id), uuid.uuid4().hex, None)
+
+
+def _changed(portfolio_id):
+    # Snapshot first: a reader that sees the new version must not find the
+    # old snapshot still marked current
+    try:
+        snapshots.portfolio_changed(portfolio_id)
+    except Exception as e:
+        print(f"⚠️ Could not refresh snapshot of portfolio {portfolio_id}: {e}")
+    bump_version(portfolio_id)
+
+
+def forget_owner(user_id):
+    """Drop the payload of ``user_id`` (owner fields such as the name changed)."""
+    cache.delete(_payload_key(user_id))
+
+
+def owner_changed(user_id):
+    """The name or email of ``user_id`` changed; both are part of the snapshot and the payload."""
+    portfolio_id = Portfolio.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+    if portfolio_id is not None:
+        _changed(portfolio_id)
+    forget_owner(user_id)
+
+
+def current_version(portfolio_id) -> str:
+    key = _version_key(portfolio_id)
+    version = cache.get(key)
+    if version is None:
+        # Evicted or never set: start a fresh one so no old payload matches
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key) or version
+    return version
+
+
+def invalidate(portfolio_id):
+    """Bump the version of ``portfolio_id`` once the current transaction commits."""
+    batch = getattr(_local, 'batch', None)
+    if batch is not None:
+        batch.add(portfolio_id)
+        return
+    transaction.on_commit(partial(_changed, portfolio_id))
+
+
+@contextmanager
+def invalidation_batch():
+    """
+    Collect invalidations inside the block and bump each portfolio once at
+    the end, instead of once per saved or deleted row.
+    """
+    if getattr(_local, 'batch', None) is not None:
+        yield
+        return
+    _local.batch = set()
+    try:
+        yield
+    finally:
+        batch, _local.batch = _local.batch, None
+    for portfolio_id in batch:
+        invalidate(portfolio_id)
+
+
+def _entry(portfolio_id, version, snapshot) -> Dict[str, Any]:
+    # BinaryField values may come back as memoryview
+    return {
+        'portfolio_id': portfolio_id,
+        'version': version,
+        'etag': snapshot.etag,
+        'content': bytes(snapshot.content),
+        'content_gzip': bytes(snapshot.content_gzip),
+        'content_br': bytes(snapshot.content_br) if snapshot.content_br else None,
+    }
+
+
+def _public_portfolio_id(user_id) -> Optional[int]:
+    return Portfolio.objects.filter(user_id=user_id, is_public=True).values_list('id', flat=True).first()
+
+
+def _build(user_id) -> Optional[Dict[str, Any]]:
+    portfolio_id = _public_portfolio_id(user_id)
+    if portfolio_id is None:
+        return None
+    # Read the version before the data, so a change made while loading
+    # leaves the entry already outdated rather than wrongly current
+    version = current_version(portfolio_id)
+    snapshot = snapshots.get_snapshot(portfolio_id)
+    if snapshot is None:
+        return None
+    entry = _entry(portfolio_id, version, snapshot)
+    cache.set(_payload_key(user_id), entry, settings.PUBLIC_PORTFOLIO_CACHE_TTL)
+    return entry
+
+
+def get_public_portfolio(user_id) -> Optional[Dict[str, Any]]:
+    """
+    The public portfolio of ``user_id`` as {'portfolio_id', 'version',
+    'etag', 'content', 'content_gzip', 'content_br'}, or None if there is no
+    public portfolio.
+    """
+    try:
+        entry = cache.get(_payload_key(user_id))
+        if entry is not None and cache.get(_version_key(entry['portfolio_id'])) == entry['version']:
+            return entry
+    except Exception as e:
+        # Cache unavailable (e.g. cache table not created): serve the snapshot
+        print(f"⚠️ public portfolio cache disabled, cache error: {e}")
+        portfolio_id = _public_portfolio_id(user_id)
+        snapshot = snapshots.get_snapshot(portfolio_id) if portfolio_id else None
+        return _entry(portfolio_id, None, snapshot) if snapshot else None
+    return single_flight(f"portfolio:public:build:{user_id}", partial(_build, user_id), timeout=REBUILD_TIMEOUT)
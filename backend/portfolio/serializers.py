@@ -1,4 +1,10 @@
+import re
+
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
+from .dates import format_duration
+from .skills import canonicalize_skill
 from .models import Portfolio, Project, Skill, Experience, Education, Certification, Hobby, Award, Contact, Publication, Patent, Other
 
 
@@ -56,6 +62,16 @@ class SkillSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    def validate(self, data):
+        """Store the canonical skill name and infer the category unless one was given."""
+        if data.get('name'):
+            name, category = canonicalize_skill(data['name'])
+            data['name'] = name[:100]
+            keeps_category = self.instance is not None and self.instance.category != 'other'
+            if 'category' not in self.initial_data and not keeps_category:
+                data['category'] = category
+        return data
+
 
 class ExperienceSerializer(serializers.ModelSerializer):
     """Serializer for Experience model."""
@@ -72,67 +88,8 @@ class ExperienceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'duration']
     
     def get_duration(self, obj):
-        """Return human-friendly duration; works even if dates are stored as strings."""
-
-        import datetime
-        import calendar
-
-        start = obj.start_date
-        end = obj.end_date
-
-        if not start:
-            return None
-
-        # If using Present
-        if obj.is_current or (end and end.lower() == "present"):
-            end = datetime.date.today().strftime("%Y-%m-%d")
-
-        # Convert strings like "September 2024" or "2024" → YYYY-MM-DD
-        def parse_date(date_str):
-            if not date_str:
-                return None
-
-            # Already ISO format?
-            try:
-                return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-            except:
-                pass
-
-            parts = date_str.split()
-
-            # Case: "2024"
-            if len(parts) == 1 and parts[0].isdigit() and len(parts[0]) == 4:
-                return datetime.date(int(parts[0]), 1, 1)
-
-            # Case: "September 2024"
-            if len(parts) == 2:
-                month_name, year = parts
-                try:
-                    month = list(calendar.month_name).index(month_name.capitalize())
-                    return datetime.date(int(year), month, 1)
-                except:
-                    return None
-
-            return None
-
-        start_dt = parse_date(start)
-        end_dt = parse_date(end)
-
-        if not start_dt or not end_dt:
-            return None
-
-        delta = end_dt - start_dt
-        years = delta.days // 365
-        months = (delta.days % 365) // 30
-
-        if years > 0 and months > 0:
-            return f"{years} yr {months} mo"
-        elif years > 0:
-            return f"{years} yr"
-        elif months > 0:
-            return f"{months} mo"
-
-        return "Less than 1 month"
+        """Return human-friendly duration; works even if dates are stored as strings (see dates.py)."""
+        return format_duration(obj.start_date, obj.end_date, obj.is_current)
 
     def validate(self, data):
         """Relaxed date validation for string-based dates."""
@@ -165,67 +122,8 @@ class EducationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'duration']
 
     def get_duration(self, obj):
-        """Return human-friendly duration; works even if dates are stored as strings."""
-
-        import datetime
-        import calendar
-
-        start = obj.start_date
-        end = obj.end_date
-
-        if not start:
-            return None
-
-        # If using Present
-        if obj.is_current or (end and end.lower() == "present"):
-            end = datetime.date.today().strftime("%Y-%m-%d")
-
-        # Convert strings like "September 2024" or "2024" → YYYY-MM-DD
-        def parse_date(date_str):
-            if not date_str:
-                return None
-
-            # Already ISO format?
-            try:
-                return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-            except:
-                pass
-
-            parts = date_str.split()
-
-            # Case: "2024"
-            if len(parts) == 1 and parts[0].isdigit() and len(parts[0]) == 4:
-                return datetime.date(int(parts[0]), 1, 1)
-
-            # Case: "September 2024"
-            if len(parts) == 2:
-                month_name, year = parts
-                try:
-                    month = list(calendar.month_name).index(month_name.capitalize())
-                    return datetime.date(int(year), month, 1)
-                except:
-                    return None
-
-            return None
-
-        start_dt = parse_date(start)
-        end_dt = parse_date(end)
-
-        if not start_dt or not end_dt:
-            return None
-
-        delta = end_dt - start_dt
-        years = delta.days // 365
-        months = (delta.days % 365) // 30
-
-        if years > 0 and months > 0:
-            return f"{years} yr {months} mo"
-        elif years > 0:
-            return f"{years} yr"
-        elif months > 0:
-            return f"{months} mo"
-
-        return "Less than 1 month"
+        """Return human-friendly duration; works even if dates are stored as strings (see dates.py)."""
+        return format_duration(obj.start_date, obj.end_date, obj.is_current)
 
     def validate(self, data):
         """Relaxed date validation for string-based dates."""
@@ -418,26 +316,138 @@ class PortfolioSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+
+    # Nested relations, loaded with one query each by setup_eager_loading()
+    PREFETCH_RELATED = (
+        'projects', 'skills', 'experiences', 'education',
+        'certifications', 'hobbies', 'awards', 'contacts',
+    )
+    COUNT_FIELDS = {
+        'projects_count': 'projects',
+        'skills_count': 'skills',
+        'experiences_count': 'experiences',
+        'education_count': 'education',
+    }
+
+    def __init__(self, *args, include=None, fields=None, **kwargs):
+        """
+        Args:
+            include: Nested relations to serialize (None = all), see
+                parse_sparse_fieldsets()
+            fields: {type: field names} keeping only those fields of the
+                portfolio ('portfolio') or of nested items ('project', ...)
+        """
+        super().__init__(*args, **kwargs)
+        relations = self.selected_relations(include, fields)
+        for name in set(self.PREFETCH_RELATED) - set(relations):
+            self.fields.pop(name)
+        fields = fields or {}
+        if 'portfolio' in fields:
+            for name in set(self.fields) - fields['portfolio']:
+                self.fields.pop(name)
+        for name in relations:
+            child = self.fields[name].child
+            wanted = fields.get(child.Meta.model._meta.model_name)
+            if wanted is not None:
+                for field_name in set(child.fields) - wanted:
+                    child.fields.pop(field_name)
+
+    @classmethod
+    def selected_relations(cls, include=None, fields=None):
+        relations = [name for name in cls.PREFETCH_RELATED if include is None or name in include]
+        if fields and 'portfolio' in fields:
+            relations = [name for name in relations if name in fields['portfolio']]
+        return relations
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, include=None, fields=None):
+        """
+        Load the user and the selected nested relations up front (1 query +
+        1 per relation). Counts of relations that are not loaded come from
+        a subquery instead.
+        """
+        relations = cls.selected_relations(include, fields)
+        queryset = queryset.select_related('user').prefetch_related(*relations)
+        wanted = (fields or {}).get('portfolio')
+        for count_field, relation in cls.COUNT_FIELDS.items():
+            if relation not in relations and (wanted is None or count_field in wanted):
+                model = Portfolio._meta.get_field(relation).related_model
+                total = model.objects.filter(portfolio=OuterRef('pk')).order_by().values('portfolio').annotate(
+                    total=Count('pk')
+                ).values('total')
+                queryset = queryset.annotate(**{f'{relation}_total': Coalesce(Subquery(total), 0)})
+        return queryset
     
     def get_user_name(self, obj):
         """Get user's full name."""
         return obj.user.get_full_name()
+
+    def _count(self, obj, relation):
+        # Annotated by setup_eager_loading(); otherwise count() reads the
+        # prefetch cache when there is one and runs a COUNT query when not
+        total = getattr(obj, f'{relation}_total', None)
+        if total is not None:
+            return total
+        return getattr(obj, relation).count()
     
     def get_projects_count(self, obj):
         """Get count of projects."""
-        return obj.projects.count()
+        return self._count(obj, 'projects')
     
     def get_skills_count(self, obj):
         """Get count of skills."""
-        return obj.skills.count()
+        return self._count(obj, 'skills')
     
     def get_experiences_count(self, obj):
         """Get count of experiences."""
-        return obj.experiences.count()
+        return self._count(obj, 'experiences')
     
     def get_education_count(self, obj):
         """Get count of education entries."""
-        return obj.education.count()
+        return self._count(obj, 'education')
+
+
+SPARSE_FIELDS_PARAM = re.compile(r"^fields\[(\w+)\]$")
+
+
+def parse_sparse_fieldsets(query_params):
+    """
+    Read ``?include=projects,skills`` and ``?fields[project]=id,title`` for
+    PortfolioSerializer.
+
+    Returns:
+        (include, fields): include is a set of relation names or None (all);
+        fields maps 'portfolio' or a nested item type to a set of field names
+
+    Raises:
+        ValueError: unknown section, type or field
+    """
+    include = None
+    if 'include' in query_params:
+        include = {name.strip() for name in query_params['include'].split(',') if name.strip()}
+        unknown = include - set(PortfolioSerializer.PREFETCH_RELATED)
+        if unknown:
+            raise ValueError(f"Unknown section(s) in include: {', '.join(sorted(unknown))}")
+
+    available = {'portfolio': set(PortfolioSerializer.Meta.fields)}
+    for name in PortfolioSerializer.PREFETCH_RELATED:
+        child = PortfolioSerializer._declared_fields[name].child
+        available[child.Meta.model._meta.model_name] = set(child.Meta.fields)
+
+    fields = {}
+    for key in query_params:
+        match = SPARSE_FIELDS_PARAM.match(key)
+        if not match:
+            continue
+        kind = match.group(1)
+        if kind not in available:
+            raise ValueError(f"Unknown type in {key}: {kind}")
+        names = {name.strip() for name in query_params[key].split(',') if name.strip()}
+        unknown = names - available[kind]
+        if unknown:
+            raise ValueError(f"Unknown field(s) in {key}: {', '.join(sorted(unknown))}")
+        fields[kind] = names
+    return include, fields
 
 
 class PortfolioBasicSerializer(serializers.ModelSerializer):
@@ -548,3 +558,18 @@ class OtherSerializer(serializers.ModelSerializer):
         
         return data
 
+
+
+class PortfolioEditorSerializer(PortfolioSerializer):
+    """
+    Portfolio with every section, including publications, patents and
+    others, for loading the editor in one request.
+    """
+    publications = PublicationSerializer(many=True, read_only=True)
+    patents = PatentSerializer(many=True, read_only=True)
+    others = OtherSerializer(many=True, read_only=True)
+
+    class Meta(PortfolioSerializer.Meta):
+        fields = PortfolioSerializer.Meta.fields + ['publications', 'patents', 'others']
+
+    PREFETCH_RELATED = PortfolioSerializer.PREFETCH_RELATED + ('publications', 'patents', 'others')
@@ -0,0 +1,54 @@
+# portfolio/signals.py
+"""Invalidate cached public portfolios when anything they show changes (see public_cache.py)."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import public_cache
+from .models import (
+    Award, Certification, Contact, Education, Experience, Hobby, Other, Patent, Portfolio, Project, Publication, Skill,
+)
+
+CHILD_MODELS = (
+    Project, Skill, Experience, Education, Certification, Hobby, Award, Contact, Publication, Patent, Other,
+)
+
+
+@receiver([post_save, post_delete], sender=Portfolio)
+def portfolio_changed(sender, instance, **kwargs):
+    public_cache.invalidate(instance.pk)
+
+
+def child_changed(sender, instance, **kwargs):
+    public_cache.invalidate(instance.portfolio_id)
+
+
+for model in CHILD_MODELS:
+    post_save.connect(child_changed, sender=model, dispatch_uid=f'public_cache_{model.__name__}_save')
+    post_delete.connect(child_changed, sender=model, dispatch_uid=f'public_cache_{model.__name__}_delete')
+
+
+# Owner fields that are part of the payload (user_email, user_name)
+OWNER_FIELDS = frozenset({'email', 'first_name', 'last_name'})
+
+
+def _owner_values(user) -> tuple:
+    return tuple(getattr(user, name) for name in sorted(OWNER_FIELDS))
+
+
+@receiver(post_init, sender=get_user_model())
+def remember_owner_fields(sender, instance, **kwargs):
+    instance._public_owner_values = _owner_values(instance)
+
+
+@receiver(post_save, sender=get_user_model())
+def owner_changed(sender, instance, created=False, update_fields=None, **kwargs):
+    # New users have no portfolio yet; logins only save last_login
+    if created or (update_fields is not None and not OWNER_FIELDS & set(update_fields)):
+        return
+    values = _owner_values(instance)
+    if values == instance._public_owner_values:
+        return
+    instance._public_owner_values = values
+    transaction.on_commit(lambda: public_cache.owner_changed(instance.pk))
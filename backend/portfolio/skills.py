@@ -0,0 +1,162 @@
+# portfolio/skills.py
+"""
+Skill canonicalization and category inference.
+
+data/skill_taxonomy.json maps each Skill category to canonical names and
+their aliases ("JS", "Javascript", "ES6" -> "JavaScript", programming). All
+aliases are compiled into one Aho-Corasick automaton, so a skill string is
+matched against every alias in a single pass over its characters instead of
+one regex per alias.
+
+A skill is renamed to its canonical form when the alias match covers it
+apart from noise ("JavaScript (ES6)", "Python 3.10", "Advanced Excel");
+otherwise the name is kept and only the category is taken from the longest
+match ("Docker containers" stays as is, category 'tool').
+"""
+import json
+import re
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TAXONOMY_PATH = Path(__file__).resolve().parent / 'data' / 'skill_taxonomy.json'
+
+DEFAULT_CATEGORY = 'other'
+
+# Characters that make up a word when checking match boundaries ("c" must
+# not match inside "c++" or "c#")
+WORD_EXTRA = frozenset('+#')
+
+# Words that may surround an alias without changing which skill it is
+NOISE_WORDS = frozenset("""
+basic basics advanced intermediate proficient proficiency expert beginner familiar familiarity
+knowledge working experience with in of and the language languages programming framework frameworks
+library libraries development developer scripting tools tool platform x
+""".split())
+TOKEN = re.compile(r"[a-z0-9+#]+")
+VERSION = re.compile(r"v?\d+(?:\.\d+)*x?")
+WHITESPACE = re.compile(r"\s+")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in WORD_EXTRA
+
+
+def _key(text: str) -> str:
+    return WHITESPACE.sub(' ', text.lower()).strip()
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over skill aliases; see find()."""
+
+    def __init__(self, aliases: Dict[str, Tuple[str, str]]):
+        # aliases: normalized alias -> (canonical name, category)
+        self.aliases = aliases
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for alias in aliases:
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(alias)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """All whole-word alias matches in normalized ``text`` as (start, end, alias)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for alias in out[state]:
+                start, end = i - len(alias) + 1, i + 1
+                if _is_word_char(alias[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(alias[-1]) and end < len(text) and _is_word_char(text[end]):
+                    continue
+                matches.append((start, end, alias))
+        return matches
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> SkillMatcher:
+    with open(TAXONOMY_PATH, encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    aliases = {}
+    for category, skills in taxonomy.items():
+        for canonical, names in skills.items():
+            for alias in [canonical, *names]:
+                aliases.setdefault(_key(alias), (canonical, category))
+    return SkillMatcher(aliases)
+
+
+def _is_noise(remainder: str) -> bool:
+    return all(token in NOISE_WORDS or VERSION.fullmatch(token) for token in TOKEN.findall(remainder))
+
+
+@lru_cache(maxsize=8192)
+def _canonicalize_key(key: str) -> Tuple[Optional[str], str]:
+    matcher = get_matcher()
+    exact = matcher.aliases.get(key)
+    if exact:
+        return exact
+
+    matches = matcher.find(key)
+    if not matches:
+        return None, DEFAULT_CATEGORY
+    start, end, alias = max(matches, key=lambda m: (m[1] - m[0], -m[0]))
+    canonical, category = matcher.aliases[alias]
+
+    # Blank out every match of the same skill ("javascript (es6)") and see
+    # whether anything meaningful is left
+    remainder = list(key)
+    for m_start, m_end, m_alias in matches:
+        if matcher.aliases[m_alias][0] == canonical:
+            remainder[m_start:m_end] = ' ' * (m_end - m_start)
+    if _is_noise(''.join(remainder)):
+        return canonical, category
+    return None, category
+
+
+def canonicalize_skill(name: str) -> Tuple[str, str]:
+    """Return (canonical or original name, Skill.category) for one skill name."""
+    canonical, category = _canonicalize_key(_key(name or ''))
+    return canonical or name, category
+
+
+def canonicalize_skills(names: Iterable[str]) -> List[Tuple[str, str]]:
+    """canonicalize_skill() over ``names``, deduplicated case-insensitively by result."""
+    seen = set()
+    out = []
+    for name in names:
+        canonical, category = canonicalize_skill(name)
+        if canonical.lower() not in seen:
+            seen.add(canonical.lower())
+            out.append((canonical, category))
+    return out
+
+
+def skill_category(name: str) -> str:
+    return canonicalize_skill(name)[1]
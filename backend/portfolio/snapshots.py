@@ -0,0 +1,154 @@
+# portfolio/snapshots.py
+"""
+Materialized public portfolio payloads.
+
+A PortfolioSnapshot holds the rendered public JSON of a portfolio together
+with gzip and (when the brotli package is installed) brotli compressed copies,
+so public_portfolio_view can send bytes as they are instead of running DRF
+serialization over every section.
+
+When a portfolio or one of its items changes (including is_public), the
+writer's commit marks its snapshot stale and queues a rebuild on a background
+thread (see public_cache.py), so visitors do not pay for the render. Each
+change bumps the snapshot's generation, and a rebuild only writes if the
+generation is the one it started from, so a slow rebuild cannot overwrite a
+newer change. Stale snapshots are never served: a request that arrives
+before the rebuild has finished, or finds no snapshot at all, renders one
+inline with cheaper compression and leaves the full-quality copy to a
+queued rebuild.
+
+With PORTFOLIO_SNAPSHOT_ASYNC off (tests, single-threaded servers), the
+rebuild runs inline in the writer's on_commit instead.
+
+After a deploy, `python manage.py warm_portfolio_snapshots` builds them all;
+`--stale-only` rebuilds just the stale ones ahead of visitors.
+"""
+import gzip
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, connection
+from django.db.models import F
+from rest_framework.renderers import JSONRenderer
+
+from .models import Portfolio, PortfolioSnapshot
+from .serializers import PortfolioSerializer
+
+try:
+    import brotli
+except ImportError:  # optional, see requirements.txt
+    brotli = None
+
+# (gzip level, brotli quality): the best compression off the read path, and
+# a cheap one when a request has to render the snapshot itself
+FULL_COMPRESSION = (9, 11)
+FAST_COMPRESSION = (6, 5)
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def render(portfolio, compression=FULL_COMPRESSION) -> dict:
+    """Snapshot fields for ``portfolio`` (loaded with setup_eager_loading)."""
+    gzip_level, brotli_quality = compression
+    content = JSONRenderer().render(PortfolioSerializer(portfolio).data)
+    return {
+        'content': content,
+        'content_gzip': gzip.compress(content, compresslevel=gzip_level, mtime=0),
+        'content_br': brotli.compress(content, quality=brotli_quality) if brotli else None,
+        'etag': f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+    }
+
+
+def rebuild_snapshot(portfolio_id, compression=FULL_COMPRESSION) -> Optional[PortfolioSnapshot]:
+    """Render and store the snapshot of ``portfolio_id``; None (and no snapshot) if it is not public."""
+    # Read the generation before the data, so a change made while rendering
+    # makes the write below miss instead of storing outdated content
+    generation = PortfolioSnapshot.objects.filter(portfolio_id=portfolio_id).values_list(
+        'generation', flat=True
+    ).first()
+    portfolio = PortfolioSerializer.setup_eager_loading(Portfolio.objects).filter(
+        id=portfolio_id, is_public=True
+    ).first()
+    if portfolio is None:
+        PortfolioSnapshot.objects.filter(portfolio_id=portfolio_id).delete()
+        return None
+
+    fields = render(portfolio, compression)
+    if generation is None:
+        try:
+            return PortfolioSnapshot.objects.create(portfolio=portfolio, **fields)
+        except IntegrityError:
+            # Built concurrently by another worker
+            return PortfolioSnapshot.objects.filter(portfolio_id=portfolio_id).first()
+
+    # If a newer change bumped the generation meanwhile, nothing is written;
+    # the content is still returned, it is at least as recent as the request
+    PortfolioSnapshot.objects.filter(portfolio_id=portfolio_id, generation=generation).update(
+        is_stale=False, **fields
+    )
+    return PortfolioSnapshot(portfolio=portfolio, generation=generation, is_stale=False, **fields)
+
+
+def mark_stale(portfolio_id):
+    PortfolioSnapshot.objects.filter(portfolio_id=portfolio_id).update(
+        is_stale=True, generation=F('generation') + 1
+    )
+
+
+def _rebuild_in_background(portfolio_id):
+    with _executor_lock:
+        _pending.discard(portfolio_id)
+    try:
+        rebuild_snapshot(portfolio_id)
+    except Exception as e:
+        print(f"⚠️ Portfolio snapshot rebuild failed for {portfolio_id}: {e}")
+    finally:
+        connection.close()
+
+
+def _submit(portfolio_id):
+    global _executor
+    with _executor_lock:
+        # Already queued: that rebuild reads the data after this change too
+        if portfolio_id in _pending:
+            return
+        _pending.add(portfolio_id)
+        if _executor is None:
+            # Started on first use, so importing the module starts no thread
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='portfolio-snapshot')
+    _executor.submit(_rebuild_in_background, portfolio_id)
+
+
+def schedule_rebuild(portfolio_id):
+    """Rebuild the snapshot of ``portfolio_id`` in the background (inline if PORTFOLIO_SNAPSHOT_ASYNC is off)."""
+    if settings.PORTFOLIO_SNAPSHOT_ASYNC:
+        _submit(portfolio_id)
+    else:
+        rebuild_snapshot(portfolio_id)
+
+
+def portfolio_changed(portfolio_id):
+    """Called on commit of any change to the portfolio or its items."""
+    mark_stale(portfolio_id)
+    schedule_rebuild(portfolio_id)
+
+
+def get_snapshot(portfolio_id) -> Optional[PortfolioSnapshot]:
+    """
+    Current snapshot of a public portfolio. A missing or still stale one is
+    rendered inline with FAST_COMPRESSION and recompressed in the background.
+    """
+    snapshot = PortfolioSnapshot.objects.filter(
+        portfolio_id=portfolio_id, portfolio__is_public=True, is_stale=False
+    ).first()
+    if snapshot is not None:
+        return snapshot
+    snapshot = rebuild_snapshot(portfolio_id, FAST_COMPRESSION)
+    if snapshot is not None and settings.PORTFOLIO_SNAPSHOT_ASYNC:
+        _submit(portfolio_id)
+    return snapshot
@@ -1,3 +1,694 @@
-from django.test import TestCase
+import datetime
+import gzip
+import json
+import random
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from resume_parser.models import Resume
+from . import snapshots
+from .batch import normalize_resumes, rekey_portfolio_items
+from .dates import PARSE_CACHE_SIZE, DatePoint, format_duration, parse_date, parse_date_range
+from .models import (
+    Award, Certification, Contact, Education, Experience, Hobby, Other, Patent, Portfolio, PortfolioSnapshot, Project,
+    Publication, Skill,
+)
+from .normalize import clean_structured, normalize_whitespace, parse_years
+from .pagination import sort_keys
+from .populate import populate_portfolio
+from .serializers import PortfolioSerializer
+from .skills import SkillMatcher, canonicalize_skill, canonicalize_skills
+from .testing import add_noise, legacy_normalize_whitespace
+
+
+def make_resume_data(size):
+    """Structured resume data with ``size`` entries per section."""
+    return {
+        'name': 'Alex Morgan',
+        'email': 'alex@example.com',
+        'phone': '+1 555 010 0199',
+        'linkedin': 'linkedin.com/in/alexmorgan',
+        'github': 'github.com/alexmorgan',
+        'education': [
+            {'degree': f'B.S. in Subject {i:03d}', 'institution': f'University {i:03d}', 'year': '2016 - 2020'}
+            for i in range(size)
+        ],
+        'experience': [
+            {'company': f'Company {i:03d}', 'role': f'Engineer {i:03d}', 'years': 'Jan 2020 - Present',
+             'role_summary': 'Built services.'}
+            for i in range(size)
+        ],
+        'projects': [
+            {'title': f'Project {i:03d}', 'description': 'A project.', 'technologies': ['Python']}
+            for i in range(size)
+        ],
+        'skills': [f'Skill {i:03d}' for i in range(size)],
+        'extracurriculars': [f'Chess club member {i:03d}' for i in range(size)],
+    }
+
+
+class PopulateFromResumeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_resume(self, data):
+        return Resume.objects.create(user=self.user, file_path='resume.pdf', structured_data=data)
+
+    def populate(self, resume, overwrite=True):
+        return self.client.post(
+            f'/api/portfolio/populate-from-resume/{resume.id}/', {'overwrite': overwrite}, format='json'
+        )
+
+    def test_query_count_does_not_grow_with_resume_size(self):
+        self.populate(self.make_resume(make_resume_data(1)))
+        # resume, savepoint, portfolio, portfolio update, 5 x (select + delete + bulk insert),
+        # release; the deletes select first as post_delete has listeners (signals.py).
+        # clean_structured caps education at 12 entries
+        for size in (3, 12):
+            resume = self.make_resume(make_resume_data(size))
+            with self.subTest(size=size), self.assertNumQueries(20):
+                response = self.populate(resume)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['statistics']['created']['experience'], size)
+
+        self.assertEqual(Education.objects.count(), 12)
+        self.assertEqual(Experience.objects.count(), 12)
+        self.assertEqual(Project.objects.count(), 12)
+        self.assertEqual(Skill.objects.count(), 12)
+        self.assertEqual(Hobby.objects.count(), 12)
+
+    def test_without_overwrite_existing_items_are_skipped(self):
+        resume = self.make_resume(make_resume_data(3))
+        self.populate(resume)
+        # resume, savepoint, portfolio, 5 x load existing, release
+        with self.assertNumQueries(9):
+            response = self.populate(resume, overwrite=False)
+
+        self.assertEqual(response.data['statistics']['created'], {
+            'education': 0, 'experience': 0, 'projects': 0, 'skills': 0, 'hobbies': 0,
+        })
+        self.assertEqual(response.data['statistics']['skipped']['projects'], 3)
+        self.assertEqual(Project.objects.count(), 3)
+
+    def test_current_experience_has_no_end_date(self):
+        self.populate(self.make_resume(make_resume_data(1)))
+        experience = Experience.objects.get()
+        self.assertTrue(experience.is_current)
+        self.assertIsNone(experience.end_date)
+
+    def test_dedupe_keys_match_whole_names_only(self):
+        data = make_resume_data(0)
+        data['experience'] = [
+            {'company': 'Meta', 'role': 'Engineer', 'years': '2019 - 2020'},
+            {'company': 'Metabase', 'role': 'Engineer', 'years': '2020 - 2021'},
+        ]
+        resume = self.make_resume(data)
+        self.populate(resume)
+        data['experience'] = [{'company': 'META, Inc.', 'role': 'engineer', 'years': '2019 - 2020'}]
+        response = self.populate(self.make_resume(data), overwrite=False)
+
+        self.assertEqual(response.data['statistics']['skipped']['experience'], 1)
+        self.assertEqual(
+            sorted(Experience.objects.values_list('dedupe_key', flat=True)), ['metabase|engineer', 'meta|engineer']
+        )
+
+
+class MergeFromResumeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def merge(self, data):
+        resume = Resume.objects.create(user=self.user, file_path='resume.pdf', structured_data=data)
+        return self.client.post(f'/api/portfolio/populate-from-resume/{resume.id}/', {'mode': 'merge'}, format='json')
+
+    def test_merge_keeps_ids_and_writes_only_the_diff(self):
+        data = make_resume_data(3)
+        self.merge(data)
+        project_ids = dict(Project.objects.values_list('title', 'id'))
+
+        data['projects'][0]['description'] = 'A better project.'
+        data['projects'].pop(2)
+        data['projects'].append({'title': 'Project new', 'description': 'New.', 'technologies': []})
+        response = self.merge(data)
+
+        stats = response.data['statistics']
+        self.assertEqual(
+            (stats['created']['projects'], stats['updated']['projects'],
+             stats['deleted']['projects'], stats['unchanged']['projects']),
+            (1, 1, 1, 1),
+        )
+        self.assertEqual(stats['diff']['projects']['updated'], {project_ids['Project 000']: ['description']})
+        self.assertEqual(stats['diff']['projects']['deleted'], [project_ids['Project 002']])
+        self.assertEqual(Project.objects.get(id=project_ids['Project 000']).description, 'A better project.')
+        self.assertEqual(Project.objects.get(title='Project 001').id, project_ids['Project 001'])
+        self.assertEqual(stats['unchanged']['experience'], 3)
+
+    def test_unchanged_merge_only_reads(self):
+        data = make_resume_data(3)
+        self.merge(data)
+        resume = Resume.objects.create(user=self.user, file_path='resume.pdf', structured_data=data)
+        # resume, savepoint, portfolio, 5 x load existing, release
+        with self.assertNumQueries(9):
+            self.client.post(f'/api/portfolio/populate-from-resume/{resume.id}/', {'mode': 'merge'}, format='json')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   PORTFOLIO_SNAPSHOT_ASYNC=False)
+class PopulatePreviewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def preview(self, data):
+        resume = Resume.objects.create(user=self.user, file_path='resume.pdf', structured_data=data)
+        return self.client.post(f'/api/portfolio/populate-from-resume/{resume.id}/preview/', format='json')
+
+    def apply(self, token):
+        return self.client.post('/api/portfolio/populate-from-resume/apply/', {'token': token}, format='json')
+
+    def test_preview_reads_a_fixed_number_of_queries_and_writes_nothing(self):
+        self.apply(self.preview(make_resume_data(3)).data['token'])
+        for size in (3, 12):
+            data = make_resume_data(size)
+            resume = Resume.objects.create(user=self.user, file_path='resume.pdf', structured_data=data)
+            # resume, portfolio, 5 x load existing
+            with self.subTest(size=size), self.assertNumQueries(7):
+                response = self.client.post(f'/api/portfolio/populate-from-resume/{resume.id}/preview/')
+            self.assertEqual(len(response.data['diff']['sections']['projects']['create']), size - 3)
+        self.assertEqual(Project.objects.count(), 3)
+
+    def test_apply_writes_the_previewed_diff_once(self):
+        self.apply(self.preview(make_resume_data(2)).data['token'])
+        data = make_resume_data(2)
+        data['projects'][1]['description'] = 'Changed.'
+        response = self.preview(data)
+        project = Project.objects.get(title='Project 001')
+        self.assertEqual(response.data['diff']['sections']['projects']['update'], [
+            {'id': project.id, 'changes': {'description': {'from': 'A project.', 'to': 'Changed.'}}},
+        ])
+
+        applied = self.apply(response.data['token'])
+        self.assertEqual(applied.data['statistics']['diff']['projects']['updated'], {project.id: ['description']})
+        project.refresh_from_db()
+        self.assertEqual(project.description, 'Changed.')
+        self.assertEqual(self.apply(response.data['token']).status_code, 404)
+
+    def test_apply_is_refused_when_the_portfolio_changed(self):
+        self.apply(self.preview(make_resume_data(2)).data['token'])
+        token = self.preview(make_resume_data(3)).data['token']
+        Project.objects.filter(title='Project 000').update(description='Edited by hand.')
+
+        self.assertEqual(self.apply(token).status_code, 409)
+        self.assertEqual(Project.objects.count(), 2)
+
+    def test_apply_is_refused_after_a_section_edit_through_the_api(self):
+        self.apply(self.preview(make_resume_data(2)).data['token'])
+        token = self.preview(make_resume_data(3)).data['token']
+        skill = Skill.objects.get(name='Skill 000')
+        response = self.client.patch(f'/api/portfolio/skills/{skill.id}/', {'name': 'Skill 999'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.apply(token).status_code, 409)
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertFalse(Skill.objects.filter(name='Skill 000').exists())
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   PORTFOLIO_SNAPSHOT_ASYNC=False)
+class PortfolioViewQueryTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def fill(self, size):
+        portfolio, _ = populate_portfolio(self.user, clean_structured(make_resume_data(size)))
+        portfolio.is_public = True
+        portfolio.save()
+        for i in range(size):
+            Certification.objects.create(portfolio=portfolio, name=f'Cert {i}', issuing_organization='Org',
+                                         issue_date='2021-01-01')
+            Award.objects.create(portfolio=portfolio, title=f'Award {i}', issuer='Org', date='2021-01-01')
+            Contact.objects.create(portfolio=portfolio, contact_type='email', label=f'Email {i}',
+                                   value=f'alex{i}@example.com')
+
+    def test_portfolio_get_query_count_is_constant(self):
+        # ETag check (portfolio id), portfolio + user, then one query per nested relation
+        for size in (2, 6):
+            with self.captureOnCommitCallbacks(execute=True):
+                Portfolio.objects.filter(user=self.user).delete()
+                self.fill(size)
+            with self.subTest(size=size):
+                with self.assertNumQueries(10):
+                    response = self.client.get('/api/portfolio/')
+                self.assertEqual(response.data['projects_count'], size)
+                self.assertEqual(len(response.data['contacts']), size)
+                # Cache miss: public portfolio id, then the snapshot rebuilt
+                # when the fill committed
+                with self.assertNumQueries(2):
+                    response = self.client.get(f'/api/portfolio/public/{self.user.id}/')
+                self.assertEqual(json.loads(response.content)['user_email'], 'alex@example.com')
+                with self.assertNumQueries(0):
+                    self.client.get(f'/api/portfolio/public/{self.user.id}/')
+
+    def test_counts_fall_back_to_count_queries(self):
+        self.fill(3)
+        # Neither annotated nor prefetched: one COUNT per relation
+        portfolio = Portfolio.objects.get(user=self.user)
+        serializer = PortfolioSerializer(portfolio, include=[])
+        with self.assertNumQueries(1):
+            self.assertEqual(serializer._count(portfolio, 'projects'), 3)
+        # Prefetched: counted from the prefetch cache
+        portfolio = Portfolio.objects.prefetch_related('projects').get(user=self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(serializer._count(portfolio, 'projects'), 3)
+
+    def test_include_skips_queries_of_other_sections(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fill(3)
+        # ETag check, portfolio + user with count subqueries, projects
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/portfolio/', {'include': 'projects'})
+        self.assertEqual(len(response.data['projects']), 3)
+        self.assertNotIn('skills', response.data)
+        self.assertEqual(response.data['skills_count'], len(make_resume_data(3)['skills']))
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/portfolio/?include=')
+        self.assertNotIn('projects', response.data)
+        self.assertEqual(response.data['projects_count'], 3)
+
+    def test_editor_returns_every_section_in_constant_queries(self):
+        self.assertEqual(self.client.get('/api/portfolio/editor/').status_code, 404)
+        for size in (1, 4):
+            with self.captureOnCommitCallbacks(execute=True):
+                Portfolio.objects.filter(user=self.user).delete()
+                self.fill(size)
+                portfolio = Portfolio.objects.get(user=self.user)
+                for i in range(size):
+                    Publication.objects.create(portfolio=portfolio, title=f'Paper {i}', authors='Alex Morgan',
+                                               publication_date='2022-01-01')
+                    Patent.objects.create(portfolio=portfolio, title=f'Patent {i}', inventors='Alex Morgan',
+                                          filing_date='2022-01-01')
+                    Other.objects.create(portfolio=portfolio, title=f'Talk {i}')
+            with self.subTest(size=size):
+                # ETag check, portfolio + user, then one query per section
+                with self.assertNumQueries(13):
+                    response = self.client.get('/api/portfolio/editor/')
+                for section in ('projects', 'contacts', 'publications', 'patents', 'others'):
+                    self.assertEqual(len(response.data[section]), size)
+
+    def test_sparse_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fill(2)
+        response = self.client.get('/api/portfolio/', {
+            'fields[portfolio]': 'id,title,projects', 'fields[project]': 'id,title',
+        })
+        self.assertEqual(set(response.data), {'id', 'title', 'projects'})
+        self.assertEqual([set(item) for item in response.data['projects']], [{'id', 'title'}] * 2)
+
+        for params in ({'include': 'widgets'}, {'fields[widget]': 'id'}, {'fields[project]': 'id,owner'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/portfolio/', params).status_code, 400)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   PORTFOLIO_SNAPSHOT_ASYNC=False)
+class PublicPortfolioCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.portfolio = Portfolio.objects.create(user=self.user, title='Alex', is_public=True)
+        self.project = Project.objects.create(portfolio=self.portfolio, title='Compiler', description='A compiler.')
+        self.url = f'/api/portfolio/public/{self.user.id}/'
+
+    def get(self, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(self.url, **headers)
+
+    def test_hits_skip_the_database_and_revalidate_with_etag(self):
+        first = self.get()
+        with self.assertNumQueries(0):
+            second = self.get()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertIn('max-age=', second['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            not_modified = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_child_and_portfolio_changes_invalidate(self):
+        etag = self.get()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Interpreter'
+            self.project.save()
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['projects'][0]['title'], 'Interpreter')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(json.loads(self.get().content)['projects_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.portfolio.is_public = False
+            self.portfolio.save()
+        self.assertEqual(self.get().status_code, 404)
+
+    def test_only_owner_field_changes_drop_the_payload(self):
+        with mock.patch('portfolio.public_cache.owner_changed') as owner_changed:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.last_login = timezone.now()
+                self.user.save(update_fields=['last_login'])
+                self.user.save()
+            owner_changed.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.first_name = 'Alex'
+                self.user.save()
+            owner_changed.assert_called_once_with(self.user.pk)
+
+    def test_renaming_the_owner_updates_the_payload(self):
+        self.assertEqual(json.loads(self.get().content)['user_name'], 'alex@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name, self.user.last_name = 'Alex', 'Morgan'
+            self.user.save()
+        snapshot = PortfolioSnapshot.objects.get(portfolio=self.portfolio)
+        self.assertEqual(json.loads(bytes(snapshot.content))['user_name'], 'Alex Morgan')
+        self.assertEqual(json.loads(self.get().content)['user_name'], 'Alex Morgan')
+
+    def test_snapshot_is_served_with_content_encoding(self):
+        plain = self.get()
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        snapshot = PortfolioSnapshot.objects.get(portfolio=self.portfolio)
+        self.assertFalse(snapshot.is_stale)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        # Rebuilt by the writer's commit (inline here, in the background with
+        # PORTFOLIO_SNAPSHOT_ASYNC), before any request asks for it
+        snapshot.refresh_from_db()
+        self.assertEqual((snapshot.generation, snapshot.is_stale), (1, False))
+        self.assertEqual(json.loads(bytes(snapshot.content))['projects'], [])
+        self.assertEqual(json.loads(self.get().content)['projects'], [])
+
+    @override_settings(PORTFOLIO_SNAPSHOT_ASYNC=True)
+    def test_changes_queue_a_rebuild_and_requests_fall_back_to_fast_compression(self):
+        self.get()
+        with mock.patch('portfolio.snapshots._submit') as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.project.delete()
+            submit.assert_called_once_with(self.portfolio.id)
+            self.assertTrue(PortfolioSnapshot.objects.get(portfolio=self.portfolio).is_stale)
+
+            # The queued rebuild has not run: the request renders the snapshot
+            # itself, cheaply, and queues it for full compression
+            with mock.patch('portfolio.snapshots.render', wraps=snapshots.render) as render:
+                self.assertEqual(json.loads(self.get().content)['projects'], [])
+            render.assert_called_once_with(mock.ANY, snapshots.FAST_COMPRESSION)
+            self.assertEqual(submit.call_count, 2)
+        self.assertFalse(PortfolioSnapshot.objects.get(portfolio=self.portfolio).is_stale)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   PORTFOLIO_SNAPSHOT_ASYNC=False)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portfolio = Portfolio.objects.create(user=self.user, title='Alex')
+        Project.objects.create(portfolio=self.portfolio, title='Compiler', description='A compiler.')
+
+    def test_unchanged_lists_get_304_without_serializing(self):
+        for url in ('/api/portfolio/', '/api/portfolio/projects/', '/api/portfolio/hobbies/'):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertTrue(first['ETag'].startswith('W/'))
+                # portfolio id only
+                with self.assertNumQueries(1):
+                    second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_changes_and_sections_change_the_etag(self):
+        etag = self.client.get('/api/portfolio/projects/')['ETag']
+        self.assertNotEqual(self.client.get('/api/portfolio/skills/')['ETag'], etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/portfolio/projects/', {'title': 'Interpreter', 'description': 'An interpreter.'},
+                             format='json')
+        response = self.client.get('/api/portfolio/projects/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.portfolio = Portfolio.objects.create(user=self.user, title='Alex')
+
+    def walk(self, url, page_size):
+        items, cursor = [], None
+        while True:
+            params = {'page_size': page_size, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(response.data['count'], page_size)
+            items.extend(response.data[url.rstrip('/').rsplit('/', 1)[1]])
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                return items
+
+    def test_pages_cover_the_list_once_in_order_including_nulls(self):
+        # Other orders by order, -date (nullable), -created_at
+        for i in range(23):
+            Other.objects.create(portfolio=self.portfolio, title=f'Item {i:02d}', order=i % 3,
+                                 date=None if i % 4 == 0 else f'2020-01-{i % 7 + 1:02d}')
+        # Meta.ordering, as the unpaginated list returns it, with the id tie-breaker
+        expected = list(Other.objects.order_by(*Other._meta.ordering, 'id').values_list('id', flat=True))
+        self.assertEqual(sort_keys(Other)[-1], ('id', False))
+        for page_size in (1, 5, 50):
+            with self.subTest(page_size=page_size):
+                self.assertEqual([item['id'] for item in self.walk('/api/portfolio/others/', page_size)], expected)
+
+    def test_page_boundaries_around_null_dates(self):
+        # Experience orders by -is_current, -start_date (nullable), order
+        for i, start_date in enumerate(['2021-01-01', None, '2019-06-01', None, '2021-01-01', '2020-03-01']):
+            Experience.objects.create(portfolio=self.portfolio, company=f'Company {i}', position='Engineer',
+                                      start_date=start_date, order=i)
+        expected = list(Experience.objects.order_by(*Experience._meta.ordering, 'id').values_list('id', flat=True))
+
+        first = self.client.get('/api/portfolio/experiences/', {'page_size': 4}).data
+        self.assertEqual([item['id'] for item in first['experiences']], expected[:4])
+        second = self.client.get('/api/portfolio/experiences/', {'page_size': 4, 'cursor': first['next_cursor']}).data
+        self.assertEqual([item['id'] for item in second['experiences']], expected[4:])
+        self.assertIsNone(second['next_cursor'])
+        # The NULL-dated rows sit together at one end, wherever the database puts them
+        nulls = set(Experience.objects.filter(start_date__isnull=True).values_list('id', flat=True))
+        self.assertIn(nulls, ({*expected[:2]}, {*expected[-2:]}))
+        for page_size in (1, 2, 3):
+            with self.subTest(page_size=page_size):
+                self.assertEqual([item['id'] for item in self.walk('/api/portfolio/experiences/', page_size)], expected)
+
+    def test_page_is_a_single_bounded_query(self):
+        for i in range(30):
+            Skill.objects.create(portfolio=self.portfolio, name=f'Skill {i:02d}')
+        cursor = self.client.get('/api/portfolio/skills/', {'page_size': 10}).data['next_cursor']
+        # ETag check (portfolio id, cached version), portfolio, page
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/portfolio/skills/', {'page_size': 10, 'cursor': cursor})
+        self.assertEqual([skill['name'] for skill in response.data['skills']][0], 'Skill 10')
+
+    def test_unpaginated_by_default_and_bad_cursors_rejected(self):
+        Project.objects.create(portfolio=self.portfolio, title='Compiler', description='A compiler.')
+        self.assertNotIn('next_cursor', self.client.get('/api/portfolio/projects/').data)
+        self.assertEqual(self.client.get('/api/portfolio/projects/', {'cursor': 'bogus'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/portfolio/projects/', {'page_size': 0}).status_code, 400)
+        Skill.objects.create(portfolio=self.portfolio, name='Rust', category='programming')
+        Skill.objects.create(portfolio=self.portfolio, name='Go', category='programming')
+        first = self.client.get('/api/portfolio/skills/', {'page_size': 1}).data
+        self.assertEqual([skill['name'] for skill in first['skills']], ['Go'])
+        projects_cursor = self.client.get('/api/portfolio/projects/', {'page_size': 1}).data['next_cursor']
+        self.assertIsNone(projects_cursor)
+        # A cursor is only valid for the section it came from
+        response = self.client.get('/api/portfolio/projects/', {'cursor': first['next_cursor']})
+        self.assertEqual(response.status_code, 400)
+        second = self.client.get('/api/portfolio/skills/', {'page_size': 1, 'cursor': first['next_cursor']}).data
+        self.assertEqual(([skill['name'] for skill in second['skills']], second['next_cursor']), (['Rust'], None))
+
+
+class NormalizeWhitespaceTests(SimpleTestCase):
+    # Characters the normalizer treats specially, plus ordinary text
+    ALPHABET = 'aBcZ inIn.–—−•▪‣●■*-\t\n  019'
+
+    def test_matches_the_regex_loop_it_replaced(self):
+        rng = random.Random(1234)
+        samples = [
+            'B.S.inInformatics',
+            '•  Built  a   ReactApp — shipped ▪ weekly',
+            'a•Bc',
+            add_noise('Built services in Go, Python - and Rust'),
+        ]
+        samples += [''.join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, 40))) for _ in range(2000)]
+        for text in samples:
+            self.assertEqual(normalize_whitespace(text), legacy_normalize_whitespace(text), repr(text))
+
+    def test_examples(self):
+        self.assertEqual(normalize_whitespace('B.S.inInformatics'), 'B.S.in Informatics')
+        self.assertEqual(normalize_whitespace(' • Led  a team — of 4 '), 'Led a team - of 4')
+
+
+class DateParsingTests(SimpleTestCase):
+    def test_resume_ranges(self):
+        cases = {
+            'Aug 2019 – May 2023': ('August 2019', 'May 2023', False),
+            'Sept 2020 - Jun 2022': ('September 2020', 'June 2022', False),
+            # Used to store the start as '20'
+            '2019 – 2023': ('2019', '2023', False),
+            '2017-present': ('2017', None, True),
+            '2020–': ('2020', None, False),
+            '2021': ('2021', None, False),
+            "Jan '24 - Present": ('2024', None, True),
+            'no dates': (None, None, False),
+            '': (None, None, False),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_years(text), expected)
+
+    def test_stored_dates(self):
+        cases = {
+            '2024-05-01': DatePoint(2024, 5),
+            'September 2024': DatePoint(2024, 9),
+            'Sep 2024': DatePoint(2024, 9),
+            '2024': DatePoint(2024),
+            'Present': DatePoint(None, None, True),
+            datetime.date(2024, 5, 1): DatePoint(2024, 5),
+            '2024-02-30': None,
+            'Smarch 2024': None,
+            None: None,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(parse_date(value), expected)
+
+    def test_durations(self):
+        today = datetime.date(2025, 12, 15)
+        self.assertEqual(format_duration('Sep 2020', 'June 2022'), '1 yr 9 mo')
+        self.assertEqual(format_duration('September 2024', None, True, today=today), '1 yr 3 mo')
+        self.assertEqual(format_duration('2024-05-01', '2024-05-10'), 'Less than 1 month')
+        self.assertIsNone(format_duration('someday', '2024'))
+        self.assertIsNone(format_duration('2024', None))
+
+    def test_parsers_are_bounded_caches(self):
+        for parser in (parse_date, parse_date_range):
+            parser.cache_clear()
+            parser('Aug 2019 – May 2023')
+            parser('Aug 2019 – May 2023')
+            info = parser.cache_info()
+            self.assertEqual(info.maxsize, PARSE_CACHE_SIZE)
+            self.assertEqual((info.hits, info.misses), (1, 1))
+
+
+class NormalizeResumesTests(TestCase):
+    def setUp(self):
+        raw = make_resume_data(2)
+        raw['name'] = '  Alex   Morgan '
+        self.stale = Resume.objects.create(file_path='a.pdf', structured_data=raw)
+        self.clean = Resume.objects.create(file_path='b.pdf', structured_data=clean_structured(make_resume_data(2)))
+        self.broken = Resume.objects.create(file_path='c.pdf', structured_data={'education': ['not a dict']})
+        Resume.objects.create(file_path='d.pdf', structured_data=None)
+
+    def test_dry_run_writes_nothing(self):
+        before = dict(Resume.objects.values_list('id', 'structured_data'))
+
+        stats = normalize_resumes(chunk_size=2, workers=1, dry_run=True)
+
+        self.assertEqual(dict(Resume.objects.values_list('id', 'structured_data')), before)
+        self.assertEqual((stats['rows'], stats['changed'], stats['unchanged'], stats['failed']), (3, 1, 1, 1))
+        self.assertTrue(stats['dry_run'])
+        self.assertIn('name', stats['field_changes'])
+        self.assertEqual([error['resume_id'] for error in stats['errors']], [self.broken.id])
+
+    def test_writes_changed_rows(self):
+        stats = normalize_resumes(chunk_size=2, workers=1)
+
+        self.assertEqual(stats['changed'], 1)
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.structured_data['name'], 'Alex Morgan')
+        self.broken.refresh_from_db()
+        self.assertEqual(self.broken.structured_data, {'education': ['not a dict']})
+        self.assertEqual(normalize_resumes(workers=1, dry_run=True)['changed'], 0)
+
+
+class SkillMatcherTests(SimpleTestCase):
+    def test_finds_whole_word_matches_only(self):
+        matcher = SkillMatcher({
+            'c': ('C', 'programming'),
+            'c++': ('C++', 'programming'),
+            'he': ('He', 'other'),
+            'she': ('She', 'other'),
+            'hers': ('Hers', 'other'),
+        })
+        self.assertEqual(matcher.find('c++ and c'), [(0, 3, 'c++'), (8, 9, 'c')])
+        # Overlapping aliases are all reported, but never inside a longer word
+        self.assertEqual(matcher.find('he she hers'), [(0, 2, 'he'), (3, 6, 'she'), (7, 11, 'hers')])
+        self.assertEqual(matcher.find('abc ushers'), [])
+
+    def test_canonicalize(self):
+        cases = {
+            'JS': ('JavaScript', 'programming'),
+            'JavaScript (ES6)': ('JavaScript', 'programming'),
+            'Python 3.10': ('Python', 'programming'),
+            'Advanced Excel': ('Microsoft Excel', 'tool'),
+            'reactjs': ('React', 'framework'),
+            'React Native': ('React Native', 'framework'),
+            'c++': ('C++', 'programming'),
+            # Partial matches keep their name and only take the category
+            'Docker containers': ('Docker containers', 'tool'),
+            'Basket weaving': ('Basket weaving', 'other'),
+        }
+        for name, expected in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(canonicalize_skill(name), expected)
+
+    def test_dedupes_by_canonical_name(self):
+        self.assertEqual(
+            canonicalize_skills(['JS', 'javascript', 'Python', 'python 3']),
+            [('JavaScript', 'programming'), ('Python', 'programming')],
+        )
+
+
+class RekeyPortfolioItemsTests(TestCase):
+    def test_recomputes_stale_keys(self):
+        user = get_user_model().objects.create_user(email='alex@example.com')
+        portfolio = Portfolio.objects.create(user=user, title='Alex')
+        js = Skill.objects.create(portfolio=portfolio, name='JS')
+        Skill.objects.create(portfolio=portfolio, name='Python')
+        # Keyed before "JS" was an alias of JavaScript, as the 0009 backfill does
+        Skill.objects.filter(pk=js.pk).update(dedupe_key='js')
+
+        changed = rekey_portfolio_items(chunk_size=1, dry_run=True)
+        self.assertEqual(changed['skill'], 1)
+        self.assertEqual(Skill.objects.get(pk=js.pk).dedupe_key, 'js')
+
+        self.assertEqual(rekey_portfolio_items(chunk_size=1)['skill'], 1)
+        self.assertEqual(Skill.objects.get(pk=js.pk).dedupe_key, 'javascript')
+        self.assertEqual(sum(rekey_portfolio_items().values()), 0)
@@ -6,8 +6,12 @@ app_name = 'portfolio'
 urlpatterns = [
     # Portfolio endpoints
     path('', views.portfolio_view, name='portfolio'),
+    path('editor/', views.portfolio_editor_view, name='portfolio-editor'),
     path('public/<int:user_id>/', views.public_portfolio_view, name='public-portfolio'),
     path('populate-from-resume/<int:resume_id>/', views.populate_from_resume, name='populate-from-resume'),
+    path('populate-from-resume/<int:resume_id>/preview/', views.preview_populate_from_resume,
+         name='populate-from-resume-preview'),
+    path('populate-from-resume/apply/', views.apply_populate_preview, name='populate-from-resume-apply'),
     
     # Project endpoints
     path('projects/', views.project_list_create, name='project-list-create'),
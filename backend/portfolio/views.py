@@ -3,11 +3,16 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
 from .models import Portfolio, Project, Skill, Experience, Education, Certification, Hobby, Award, Contact, Publication, Patent, Other
 from .serializers import (
     PortfolioSerializer,
     PortfolioBasicSerializer,
+    PortfolioEditorSerializer,
     ProjectSerializer,
     SkillSerializer,
     ExperienceSerializer,
@@ -18,28 +23,45 @@ from .serializers import (
     ContactSerializer,
     PublicationSerializer,
     PatentSerializer,
-    OtherSerializer
+    OtherSerializer,
+    parse_sparse_fieldsets,
 )
 from resume_parser.models import Resume
 from .normalize import clean_structured
+from .populate import merge_portfolio, populate_portfolio
+from .preview import PreviewExpired, PreviewStale, apply_preview, preview_merge
+from .conditional import etag_from_portfolio_version
+from .pagination import paginate_section
+from .public_cache import get_public_portfolio
 
 
 # ==================== Portfolio Views ====================
 
 @api_view(['GET', 'POST', 'PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('portfolio')
 def portfolio_view(request):
     """
     Get, create, or update portfolio for authenticated user.
     
     GET /api/portfolio/ - Get user's portfolio
+        ?include=projects,skills - only these nested sections (others are not queried)
+        ?fields[portfolio]=id,title&fields[project]=id,title - only these fields
     POST /api/portfolio/ - Create portfolio (if doesn't exist)
     PUT/PATCH /api/portfolio/ - Update portfolio
     """
     if request.method == 'GET':
         try:
-            portfolio = Portfolio.objects.get(user=request.user)
-            serializer = PortfolioSerializer(portfolio)
+            include, fields = parse_sparse_fieldsets(request.query_params)
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            portfolio = PortfolioSerializer.setup_eager_loading(
+                Portfolio.objects, include=include, fields=fields
+            ).get(user=request.user)
+            serializer = PortfolioSerializer(portfolio, include=include, fields=fields)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Portfolio.DoesNotExist:
             return Response({
@@ -65,7 +87,7 @@ def portfolio_view(request):
     
     elif request.method in ['PUT', 'PATCH']:
         try:
-            portfolio = Portfolio.objects.get(user=request.user)
+            portfolio = PortfolioSerializer.setup_eager_loading(Portfolio.objects).get(user=request.user)
         except Portfolio.DoesNotExist:
             return Response({
                 'error': 'Portfolio not found. Create one first.'
@@ -82,6 +104,28 @@ def portfolio_view(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('editor')
+def portfolio_editor_view(request):
+    """
+    Get the user's portfolio with all of its sections in one response.
+
+    GET /api/portfolio/editor/ - Portfolio plus projects, skills, experiences,
+        education, certifications, hobbies, awards, contacts, publications,
+        patents and others (one query per section, whatever their size)
+    """
+    try:
+        portfolio = PortfolioEditorSerializer.setup_eager_loading(Portfolio.objects).get(user=request.user)
+    except Portfolio.DoesNotExist:
+        return Response({
+            'message': 'Portfolio not created yet',
+            'exists': False
+        }, status=status.HTTP_404_NOT_FOUND)
+    serializer = PortfolioEditorSerializer(portfolio)
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def public_portfolio_view(request, user_id):
@@ -89,21 +133,50 @@ def public_portfolio_view(request, user_id):
     Get public portfolio by user ID.
     
     GET /api/portfolio/public/{user_id}/
+
+    Serves the precompressed snapshot bytes (see snapshots.py) through the
+    public portfolio cache (see public_cache.py), brotli or gzip encoded when
+    the client accepts it, with an ETag; If-None-Match revalidation gets a 304.
     """
-    try:
-        portfolio = Portfolio.objects.get(user_id=user_id, is_public=True)
-        serializer = PortfolioSerializer(portfolio)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    except Portfolio.DoesNotExist:
+    entry = get_public_portfolio(user_id)
+    if entry is None:
         return Response({
             'error': 'Public portfolio not found'
         }, status=status.HTTP_404_NOT_FOUND)
 
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if entry['etag'] in if_none_match or '*' in if_none_match:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        encoding, content = _pick_encoding(request, entry)
+        response = HttpResponse(content, content_type='application/json')
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = entry['etag']
+    patch_cache_control(response, public=True, max_age=settings.PUBLIC_PORTFOLIO_MAX_AGE)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def _pick_encoding(request, entry):
+    """(Content-Encoding or None, body) for the client's Accept-Encoding."""
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.strip().partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(name.strip().lower())
+    if entry['content_br'] and ('br' in accepted or '*' in accepted):
+        return 'br', entry['content_br']
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip', entry['content_gzip']
+    return None, entry['content']
+
 
 # ==================== Project Views ====================
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('projects')
 def project_list_create(request):
     """
     List all projects or create a new project.
@@ -120,6 +193,9 @@ def project_list_create(request):
     
     if request.method == 'GET':
         projects = Project.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, projects, ProjectSerializer, 'projects')
+        if page is not None:
+            return page
         serializer = ProjectSerializer(projects, many=True)
         return Response({
             'projects': serializer.data,
@@ -181,6 +257,7 @@ def project_detail(request, project_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('skills')
 def skill_list_create(request):
     """
     List all skills or create a new skill.
@@ -197,6 +274,9 @@ def skill_list_create(request):
     
     if request.method == 'GET':
         skills = Skill.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, skills, SkillSerializer, 'skills')
+        if page is not None:
+            return page
         serializer = SkillSerializer(skills, many=True)
         return Response({
             'skills': serializer.data,
@@ -206,6 +286,12 @@ def skill_list_create(request):
     elif request.method == 'POST':
         serializer = SkillSerializer(data=request.data)
         if serializer.is_valid():
+            # Exact indexed lookup on the normalized key ("JS" == "javascript")
+            dedupe_key = Skill(name=serializer.validated_data['name']).refresh_dedupe_key()
+            if Skill.objects.filter(portfolio=portfolio, dedupe_key=dedupe_key).exists():
+                return Response({
+                    'error': 'Skill already exists in your portfolio'
+                }, status=status.HTTP_400_BAD_REQUEST)
             try:
                 serializer.save(portfolio=portfolio)
                 return Response({
@@ -263,6 +349,7 @@ def skill_detail(request, skill_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('experiences')
 def experience_list_create(request):
     """
     List all experiences or create a new experience.
@@ -279,6 +366,9 @@ def experience_list_create(request):
     
     if request.method == 'GET':
         experiences = Experience.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, experiences, ExperienceSerializer, 'experiences')
+        if page is not None:
+            return page
         serializer = ExperienceSerializer(experiences, many=True)
         return Response({
             'experiences': serializer.data,
@@ -336,6 +426,7 @@ def experience_detail(request, experience_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('education')
 def education_list_create(request):
     """List all education entries or create a new one."""
     try:
@@ -347,6 +438,9 @@ def education_list_create(request):
     
     if request.method == 'GET':
         education = Education.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, education, EducationSerializer, 'education')
+        if page is not None:
+            return page
         serializer = EducationSerializer(education, many=True)
         return Response({
             'education': serializer.data,
@@ -402,6 +496,7 @@ def education_detail(request, education_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('certifications')
 def certification_list_create(request):
     """List all certifications or create a new one."""
     try:
@@ -413,6 +508,9 @@ def certification_list_create(request):
     
     if request.method == 'GET':
         certifications = Certification.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, certifications, CertificationSerializer, 'certifications')
+        if page is not None:
+            return page
         serializer = CertificationSerializer(certifications, many=True)
         return Response({
             'certifications': serializer.data,
@@ -468,12 +566,16 @@ def certification_detail(request, certification_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('hobbies')
 def hobby_list_create(request):
     """List all hobbies or create a new hobby."""
     portfolio = get_object_or_404(Portfolio, user=request.user)
     
     if request.method == 'GET':
         hobbies = Hobby.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, hobbies, HobbySerializer, 'hobbies')
+        if page is not None:
+            return page
         serializer = HobbySerializer(hobbies, many=True)
         return Response({
             'hobbies': serializer.data,
@@ -528,12 +630,16 @@ def hobby_detail(request, hobby_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('awards')
 def award_list_create(request):
     """List all awards or create a new award."""
     portfolio = get_object_or_404(Portfolio, user=request.user)
     
     if request.method == 'GET':
         awards = Award.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, awards, AwardSerializer, 'awards')
+        if page is not None:
+            return page
         serializer = AwardSerializer(awards, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -585,12 +691,16 @@ def award_detail(request, award_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('contacts')
 def contact_list_create(request):
     """List all contacts or create a new contact."""
     portfolio = get_object_or_404(Portfolio, user=request.user)
     
     if request.method == 'GET':
         contacts = Contact.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, contacts, ContactSerializer, 'contacts')
+        if page is not None:
+            return page
         serializer = ContactSerializer(contacts, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -648,7 +758,8 @@ def populate_from_resume(request, resume_id):
     
     POST /api/portfolio/populate-from-resume/<resume_id>/
     Body: {
-        "overwrite": false  # Optional: whether to overwrite existing data
+        "overwrite": false,  # Optional: whether to overwrite existing data
+        "mode": "merge"      # Optional: update matching items in place instead
     }
     """
     # Get the resume
@@ -667,250 +778,82 @@ def populate_from_resume(request, resume_id):
     
     data = clean_structured(resume.structured_data)
     overwrite = request.data.get('overwrite', True)
-    
-    # Get or create portfolio
-    portfolio, created = Portfolio.objects.get_or_create(
-        user=request.user,
-        defaults={
-            'title': data.get('name', 'My Portfolio'),
-            'github': data.get('github', ''),
-            'linkedin': data.get('linkedin', '')
-        }
-    )
-    
-    # Update portfolio if data exists and overwrite is True
-    if not created and overwrite:
-        portfolio.github = data.get('github', portfolio.github)
-        portfolio.linkedin = data.get('linkedin', portfolio.linkedin)
-        portfolio.save()
-    
-    # If overwrite, wipe children so no old data remains
-    if overwrite and not created:
-        Education.objects.filter(portfolio=portfolio).delete()
-        Experience.objects.filter(portfolio=portfolio).delete()
-        Project.objects.filter(portfolio=portfolio).delete()
-        Skill.objects.filter(portfolio=portfolio).delete()
-        Hobby.objects.filter(portfolio=portfolio).delete()
-
-    # Optionally also refresh top-level fields on overwrite
-    if overwrite:
-        portfolio.github = data.get('github', portfolio.github)
-        portfolio.linkedin = data.get('linkedin', portfolio.linkedin)
-        if data.get('name'):
-            portfolio.title = data.get('name')
-        portfolio.save()
-    stats = {
-        'created': {'education': 0, 'experience': 0, 'projects': 0, 'skills': 0, 'hobbies': 0},
-        'skipped': {'education': 0, 'experience': 0, 'projects': 0, 'skills': 0, 'hobbies': 0}
-    }
-    
-    # Populate Education
-    for edu_data in data.get('education', []):
-        if not edu_data.get('degree'):
-            continue
-            
-        # Check if already exists (by degree and institution)
-        exists = Education.objects.filter(
-            portfolio=portfolio,
-            degree__icontains=edu_data.get('degree', '')[:50],
-            institution__icontains=edu_data.get('institution', '')[:50]
-        ).exists()
-        
-        if exists and not overwrite:
-            stats['skipped']['education'] += 1
-            continue
-        
-        if exists and overwrite:
-            Education.objects.filter(
-                portfolio=portfolio,
-                degree__icontains=edu_data.get('degree', '')[:50],
-                institution__icontains=edu_data.get('institution', '')[:50]
-            ).delete()
-        
-        # Parse year to date
-        year_str = edu_data.get('year', '')
-        end_date = None
-        start_date = None
-        if year_str:
-            try:
-                from datetime import date
-                year = int(''.join(filter(str.isdigit, year_str))[:4])
-                if year > 0:
-                    end_date = date(year, 12, 31)
-                    start_date = date(max(year - 4, 2000), 9, 1)  # Assume 4-year degree
-            except:
-                pass
-        
-        # If no date parsed, use defaults
-        if not start_date:
-            from datetime import date
-            start_date = date(2020, 9, 1)
-        
-        # Map degree text to choices
-        degree_text = edu_data.get('degree', '').lower()
-        degree_choice = 'other'
-        if 'bachelor' in degree_text or 'b.s' in degree_text or 'b.a' in degree_text:
-            degree_choice = 'bachelor'
-        elif 'master' in degree_text or 'm.s' in degree_text or 'm.a' in degree_text:
-            degree_choice = 'master'
-        elif 'phd' in degree_text or 'ph.d' in degree_text or 'doctor' in degree_text:
-            degree_choice = 'phd'
-        elif 'associate' in degree_text:
-            degree_choice = 'associate'
-        elif 'high school' in degree_text:
-            degree_choice = 'high_school'
-        
-        try:
-            Education.objects.create(
-                portfolio=portfolio,
-                degree=degree_choice,
-                institution=edu_data.get('institution', 'Unknown Institution')[:200],
-                field_of_study=edu_data.get('degree', 'Not Specified')[:200],
-                start_date=edu_data.get('start_date', start_date),
-                end_date=edu_data.get('end_date', end_date),
-                grade=edu_data.get('gpa', '')[:50] if edu_data.get('gpa') else ''
-            )
-            stats['created']['education'] += 1
-        except Exception as e:
-            print(f"Failed to create education entry: {e}")
-            stats['skipped']['education'] += 1
-    
-    # Populate Experience
-    for exp_data in data.get('experience', []):
-        if not exp_data.get('company') or not exp_data.get('role'):
-            continue
-            
-        exists = Experience.objects.filter(
-            portfolio=portfolio,
-            company__icontains=exp_data.get('company', '')[:50],
-            position__icontains=exp_data.get('role', '')[:50]
-        ).exists()
-        
-        if exists and not overwrite:
-            stats['skipped']['experience'] += 1
-            continue
-        
-        if exists and overwrite:
-            Experience.objects.filter(
-                portfolio=portfolio,
-                company__icontains=exp_data.get('company', '')[:50],
-                position__icontains=exp_data.get('role', '')[:50]
-            ).delete()
-        
-        # Parse years
-        from datetime import date
-        years_str = exp_data.get('years', '')
-        start_date = date(2020, 1, 1)  # Default
-        end_date = None
-        is_current = 'present' in years_str.lower() if years_str else False
-        
-        # Try to parse year from years string
-        if years_str:
-            import re
-            years = re.findall(r'(19|20)\d{2}', years_str)
-            if len(years) >= 1:
-                try:
-                    start_year = int(years[0])
-                    start_date = date(start_year, 1, 1)
-                    if len(years) >= 2 and not is_current:
-                        end_year = int(years[1])
-                        end_date = date(end_year, 12, 31)
-                except:
-                    pass
-        
-        try:
-            Experience.objects.create(
-                portfolio=portfolio,
-                company=exp_data.get('company', '')[:200],
-                position=exp_data.get('role', '')[:200],
-                description=exp_data.get('role_summary', ''),
-                start_date=exp_data.get('start_date', start_date),
-                end_date=exp_data.get('end_date', end_date),
-                is_current=exp_data.get('is_current', is_current)
-            )
-            stats['created']['experience'] += 1
-        except Exception as e:
-            print(f"Failed to create experience entry: {e}")
-            stats['skipped']['experience'] += 1
-    
-    # Populate Projects
-    for proj_data in data.get('projects', []):
-        if not proj_data.get('title'):
-            continue
-            
-        exists = Project.objects.filter(
-            portfolio=portfolio,
-            title__icontains=proj_data.get('title', '')[:50]
-        ).exists()
-        
-        if exists and not overwrite:
-            stats['skipped']['projects'] += 1
-            continue
-        
-        if exists and overwrite:
-            Project.objects.filter(
-                portfolio=portfolio,
-                title__icontains=proj_data.get('title', '')[:50]
-            ).delete()
-        
-        Project.objects.create(
-            portfolio=portfolio,
-            title=proj_data.get('title', '')[:200],
-            description=proj_data.get('description', ''),
-            tech_stack=proj_data.get('technologies', [])
-        )
-        stats['created']['projects'] += 1
-    
-    # Populate Skills
-    for skill_name in data.get('skills', []):
-        if not skill_name or len(skill_name) < 2:
-            continue
-            
-        exists = Skill.objects.filter(
-            portfolio=portfolio,
-            name__iexact=skill_name[:100]
-        ).exists()
-        
-        if exists:
-            stats['skipped']['skills'] += 1
-            continue
-        
-        Skill.objects.create(
-            portfolio=portfolio,
-            name=skill_name[:100]
-        )
-        stats['created']['skills'] += 1
-    
-    # Populate Hobbies/Extracurriculars
-    for hobby_text in data.get('extracurriculars', []):
-        if not hobby_text or len(hobby_text) < 5:
-            continue
-            
-        # Extract name (first part before any punctuation or newline)
-        name = hobby_text.split('.')[0].split('\n')[0][:200]
-        
-        exists = Hobby.objects.filter(
-            portfolio=portfolio,
-            name__icontains=name[:50]
-        ).exists()
-        
-        if exists and not overwrite:
-            stats['skipped']['hobbies'] += 1
-            continue
-        
-        if exists and overwrite:
-            Hobby.objects.filter(
-                portfolio=portfolio,
-                name__icontains=name[:50]
-            ).delete()
-        
-        Hobby.objects.create(
-            portfolio=portfolio,
-            name=name,
-            description=hobby_text
-        )
-        stats['created']['hobbies'] += 1
-    
+    mode = request.data.get('mode', 'overwrite' if overwrite else 'skip')
+    if mode not in ('overwrite', 'skip', 'merge'):
+        return Response({
+            'error': "mode must be one of 'overwrite', 'skip' or 'merge'"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Set-based: one load and at most one delete, update and bulk insert per
+    # section (see populate.py)
+    if mode == 'merge':
+        portfolio, stats = merge_portfolio(request.user, data)
+    else:
+        portfolio, stats = populate_portfolio(request.user, data, overwrite=mode == 'overwrite')
+
+    return Response({
+        'message': 'Portfolio populated successfully from resume',
+        'portfolio_id': portfolio.id,
+        'statistics': stats
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def preview_populate_from_resume(request, resume_id):
+    """
+    Preview merging resume data into the portfolio without writing anything.
+
+    POST /api/portfolio/populate-from-resume/<resume_id>/preview/
+    Returns the create/update/delete diff per section and a token; apply it
+    with POST /api/portfolio/populate-from-resume/apply/ {"token": "..."}
+    """
+    try:
+        resume = Resume.objects.get(id=resume_id, user=request.user)
+    except Resume.DoesNotExist:
+        return Response({
+            'error': 'Resume not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if not resume.structured_data:
+        return Response({
+            'error': 'Resume has not been parsed yet. Please re-upload the resume.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    token, diff = preview_merge(request.user, clean_structured(resume.structured_data))
+    return Response({
+        'token': token,
+        'expires_in': settings.POPULATE_PREVIEW_TTL_SECONDS,
+        'diff': diff
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def apply_populate_preview(request):
+    """
+    Apply a diff returned by preview_populate_from_resume exactly as previewed.
+
+    POST /api/portfolio/populate-from-resume/apply/
+    Body: {"token": "..."}
+    """
+    token = request.data.get('token')
+    if not token:
+        return Response({
+            'error': 'token is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        portfolio, stats = apply_preview(request.user, token)
+    except PreviewExpired:
+        return Response({
+            'error': 'Preview not found or expired. Request a new preview.'
+        }, status=status.HTTP_404_NOT_FOUND)
+    except PreviewStale:
+        return Response({
+            'error': 'Portfolio changed since the preview. Request a new preview.'
+        }, status=status.HTTP_409_CONFLICT)
+
     return Response({
         'message': 'Portfolio populated successfully from resume',
         'portfolio_id': portfolio.id,
@@ -920,6 +863,7 @@ def populate_from_resume(request, resume_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('publications')
 def publication_list_create(request):
     """List all publications or create a new one."""
     try:
@@ -931,6 +875,9 @@ def publication_list_create(request):
     
     if request.method == 'GET':
         publications = Publication.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, publications, PublicationSerializer, 'publications')
+        if page is not None:
+            return page
         serializer = PublicationSerializer(publications, many=True)
         return Response({
             'publications': serializer.data,
@@ -991,6 +938,7 @@ def publication_detail(request, pk):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('patents')
 def patent_list_create(request):
     """List all patents or create a new one."""
     try:
@@ -1002,6 +950,9 @@ def patent_list_create(request):
     
     if request.method == 'GET':
         patents = Patent.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, patents, PatentSerializer, 'patents')
+        if page is not None:
+            return page
         serializer = PatentSerializer(patents, many=True)
         return Response({
             'patents': serializer.data,
@@ -1062,6 +1013,7 @@ def patent_detail(request, pk):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@etag_from_portfolio_version('others')
 def other_list_create(request):
     """List all other items or create a new one."""
     try:
@@ -1073,6 +1025,9 @@ def other_list_create(request):
     
     if request.method == 'GET':
         others = Other.objects.filter(portfolio=portfolio)
+        page = paginate_section(request, others, OtherSerializer, 'others')
+        if page is not None:
+            return page
         serializer = OtherSerializer(others, many=True)
         return Response({
             'others': serializer.data,
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Resume, CoverLetter
+from .models import Resume, CoverLetter, IdempotencyRecord
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
@@ -18,3 +18,11 @@ class CoverLetterAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at')
 
+
+@admin.register(IdempotencyRecord)
+class IdempotencyRecordAdmin(admin.ModelAdmin):
+    list_display = ('user', 'key', 'status', 'response_status', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('user__email', 'key')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at',)
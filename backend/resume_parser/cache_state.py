@@ -0,0 +1,56 @@
+"""
+Shared state in the Django cache that holds across gunicorn workers when
+the cache is shared.
+
+- locked_cache_state(): one cache entry updated under a cache mutex
+  (cache.add is atomic on every backend we use), for state that must change
+  as a whole, like the LLM scheduler's queue.
+- incr_counter(): a counter in its own key. cache.incr is atomic on redis,
+  memcached and locmem; on the DatabaseCache it is a read then a write, so
+  concurrent increments can occasionally be lost, which is fine for the
+  load and usage counts it is used for.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+MUTEX_TIMEOUT = 5
+MUTEX_WAIT = 2.0
+
+
+class CacheStateUnavailable(Exception):
+    """State could not be locked (cache down or badly contended)."""
+
+
+@contextmanager
+def locked_cache_state(state_key, mutex_key, default):
+    """
+    Yield the state stored at ``state_key`` (or ``default()``) for in-place
+    modification; it is written back when the block exits.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + MUTEX_WAIT
+    while not cache.add(mutex_key, token, MUTEX_TIMEOUT):
+        if time.monotonic() >= deadline:
+            raise CacheStateUnavailable(f'could not lock {state_key}')
+        time.sleep(0.005)
+    state = cache.get(state_key) or default()
+    try:
+        yield state
+    finally:
+        cache.set(state_key, state, None)
+        if cache.get(mutex_key) == token:
+            cache.delete(mutex_key)
+
+
+def incr_counter(key, delta=1, timeout=None) -> int:
+    """Add ``delta`` to the counter at ``key``, creating it with ``timeout`` if missing."""
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Missing or expired
+        if cache.add(key, delta, timeout):
+            return delta
+        return cache.incr(key, delta)
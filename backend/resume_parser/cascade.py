@@ -0,0 +1,192 @@
+"""
+Per-task model fallback cascade.
+
+Every LLM task (parse, cover_letter, chat) has an ordered list of tiers in
+settings.LLM_CASCADE: Gemini model names, plus 'local' for the heuristic
+resume parser. A tier gets up to LLM_TIER_ATTEMPTS tries on transient errors
+(503/5xx, 429, timeouts, all keys cooling down) with exponential backoff
+starting at LLM_RETRY_BACKOFF_SECONDS; other errors (bad request, output that
+fails validation) move on to the next tier at once.
+
+Each call reports which tier served it, and served/failed counts plus recent
+latencies per task are kept in the shared cache for the metrics endpoint, so
+we can see how much of the latency tail comes from retries and fallbacks.
+"""
+import math
+import time
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+from google.genai import errors as genai_errors
+
+from .cache_state import locked_cache_state
+from .key_pool import KeyPoolExhausted
+from .single_flight import SingleFlightError
+
+LOCAL_TIER = 'local'
+
+STATE_KEY = 'cascade:state'
+MUTEX_KEY = 'cascade:mutex'
+
+# Latency samples kept per task for percentiles
+MAX_SAMPLES = 500
+
+TRANSIENT_ERRORS = (
+    genai_errors.ServerError,
+    KeyPoolExhausted,
+    ResourceExhausted,
+    ServiceUnavailable,
+    httpx.TimeoutException,
+    httpx.TransportError,
+)
+
+
+def is_transient(exc: Exception) -> bool:
+    """True for errors worth retrying on the same model (overload, rate limit, network)."""
+    if isinstance(exc, SingleFlightError):
+        # A coalesced call: judge the leader's error, not the wrapper
+        return exc.code == 429 or _is_transient_type(exc.error_type)
+    if isinstance(exc, TRANSIENT_ERRORS):
+        return True
+    return isinstance(exc, genai_errors.ClientError) and exc.code == 429
+
+
+def _is_transient_type(error_type) -> bool:
+    try:
+        error_class = import_string(error_type)
+    except ImportError:
+        return False
+    return isinstance(error_class, type) and issubclass(error_class, TRANSIENT_ERRORS)
+
+
+def run_cascade(task: str, call_model, local=None):
+    """
+    Run a task down its cascade until a tier succeeds.
+
+    Args:
+        task: 'parse', 'cover_letter' or 'chat' (key of settings.LLM_CASCADE)
+        call_model: Callable taking a model name and returning the result
+        local: Zero-argument callable for the 'local' tier, if the task has one
+
+    Returns:
+        (result, served_by) where served_by is a dict with the tier index,
+        model, whether it was a fallback, the number of attempts and latency
+
+    Raises:
+        The last error if every tier failed
+    """
+    tiers = [tier.strip() for tier in settings.LLM_CASCADE[task] if tier.strip()]
+    attempts_per_tier = max(settings.LLM_TIER_ATTEMPTS, 1)
+    started = time.monotonic()
+    attempts = 0
+    last_error = None
+
+    for index, tier in enumerate(tiers):
+        if tier == LOCAL_TIER:
+            if local is None:
+                continue
+            attempts += 1
+            result = local()
+            return result, _served(task, index, tier, attempts, started)
+
+        delay = settings.LLM_RETRY_BACKOFF_SECONDS
+        for attempt in range(1, attempts_per_tier + 1):
+            attempts += 1
+            try:
+                result = call_model(tier)
+            except Exception as e:
+                last_error = e
+                print(f"⚠️ {task} on {tier} failed (attempt {attempt}/{attempts_per_tier}): {e}")
+                if not is_transient(e) or attempt == attempts_per_tier:
+                    break
+                time.sleep(delay)
+                delay *= 2
+            else:
+                return result, _served(task, index, tier, attempts, started)
+
+        if index + 1 < len(tiers):
+            print(f"↪️ {task}: falling back from {tier} to {tiers[index + 1]}")
+
+    _record(task, None, attempts, started)
+    if last_error is None:
+        raise ValueError(f"No usable model configured for {task}")
+    raise last_error
+
+
+def _served(task, index, tier, attempts, started):
+    served = {
+        'tier': index,
+        'model': tier,
+        'fallback': index > 0,
+        'attempts': attempts,
+        'latency_ms': round((time.monotonic() - started) * 1000),
+    }
+    _record(task, served, attempts, started)
+    return served
+
+
+def _empty_state():
+    return {}
+
+
+def _record(task, served, attempts, started):
+    latency_ms = round((time.monotonic() - started) * 1000)
+    try:
+        with locked_cache_state(STATE_KEY, MUTEX_KEY, _empty_state) as state:
+            stats = state.setdefault(task, {'served': {}, 'failed': 0, 'samples': []})
+            if served is None:
+                stats['failed'] += 1
+                return
+            stats['served'][served['model']] = stats['served'].get(served['model'], 0) + 1
+            stats['samples'].append([latency_ms, served['model'], attempts > 1 or served['fallback']])
+            del stats['samples'][:-MAX_SAMPLES]
+    except Exception as e:
+        print(f"⚠️ Cascade metrics not recorded: {e}")
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def cascade_metrics() -> dict:
+    """Per task: configured tiers, responses served per tier, failures and latency percentiles."""
+    try:
+        state = cache.get(STATE_KEY) or _empty_state()
+    except Exception as e:
+        print(f"⚠️ Cascade metrics unavailable: {e}")
+        state = _empty_state()
+
+    metrics = {}
+    for task, tiers in settings.LLM_CASCADE.items():
+        stats = state.get(task, {'served': {}, 'failed': 0, 'samples': []})
+        samples = stats['samples']
+        latencies = [s[0] for s in samples]
+        p95 = _percentile(latencies, 95)
+        tail = [s for s in samples if p95 is not None and s[0] >= p95]
+        metrics[task] = {
+            'tiers': tiers,
+            'served': stats['served'],
+            'failed': stats['failed'],
+            'latency_ms': {
+                'p50': _percentile(latencies, 50),
+                'p95': p95,
+                'p99': _percentile(latencies, 99),
+            },
+            'latency_ms_by_tier': {
+                model: {
+                    'p50': _percentile([s[0] for s in samples if s[1] == model], 50),
+                    'p99': _percentile([s[0] for s in samples if s[1] == model], 99),
+                }
+                for model in stats['served']
+            },
+            # Share of the slowest 5% that needed a retry or a fallback tier
+            'tail_overload_share': round(sum(1 for s in tail if s[2]) / len(tail), 3) if tail else None,
+            'samples': len(samples),
+        }
+    return metrics
@@ -0,0 +1,102 @@
+"""
+Record/replay of Gemini calls for benchmarks and CI.
+
+LLM_CASSETTE_MODE selects the mode:
+
+- 'record': calls go upstream as usual and every successful response is
+  written to LLM_CASSETTE_DIR as <fingerprint>.json, with the model, a
+  preview of the prompt and the upstream latency;
+- 'replay': calls never leave the process; the response recorded for the same
+  fingerprint (model, prompt and config, see gemini_client.py) is served,
+  instantly or, with LLM_CASSETTE_LATENCY='recorded', after sleeping for the
+  recorded latency. A call with no recording raises CassetteMiss, which views
+  turn into a 503 saying what to record (cassette_miss_response());
+- anything else (the default): off.
+
+No recordings ship with the repository: cassettes hold real responses to the
+sample resumes and are tied to the exact prompts, so record a set with a key
+before replaying (bench_llm_endpoints --mode record).
+
+Everything after the Gemini response (validation, normalization, portfolio
+population) runs for real, so replayed benchmarks still exercise our code.
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+PROMPT_PREVIEW_CHARS = 300
+
+
+class CassetteMiss(Exception):
+    """Replay mode and nothing was recorded for this call."""
+
+
+def cassette_miss_response(exc: CassetteMiss) -> Response:
+    return Response({'error': str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+def recorded_count(directory=None) -> int:
+    """Number of recorded responses in ``directory`` (default LLM_CASSETTE_DIR)."""
+    return len(list(Path(directory or settings.LLM_CASSETTE_DIR).glob('*.json')))
+
+
+def mode() -> str:
+    return (settings.LLM_CASSETTE_MODE or '').lower()
+
+
+def _path(key) -> Path:
+    return Path(settings.LLM_CASSETTE_DIR) / f"{key}.json"
+
+
+def replay(key: str) -> str:
+    """Return the recorded response for ``key``, honouring LLM_CASSETTE_LATENCY."""
+    path = _path(key)
+    try:
+        entry = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        print(f"⚠️ Cassette miss: {key}")
+        raise CassetteMiss(
+            f"LLM_CASSETTE_MODE is 'replay' and no Gemini response was recorded for this call "
+            f"({key}) in {settings.LLM_CASSETTE_DIR}. Record one first with "
+            f"'python manage.py bench_llm_endpoints --mode record' and a Gemini key."
+        )
+    if settings.LLM_CASSETTE_LATENCY == 'recorded':
+        time.sleep(entry['latency_ms'] / 1000)
+    return entry['response']
+
+
+def recording(key: str, model: str, contents, fn):
+    """Wrap the upstream call ``fn`` so its response and latency are saved under ``key``."""
+    def call():
+        started = time.monotonic()
+        response = fn()
+        latency_ms = round((time.monotonic() - started) * 1000)
+        entry = {
+            'fingerprint': key,
+            'model': model,
+            'prompt_preview': str(contents)[:PROMPT_PREVIEW_CHARS],
+            'response': response,
+            'latency_ms': latency_ms,
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            path = _path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a concurrent replay never reads half a file
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entry, indent=2, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ Cassette not recorded: {e}")
+        return response
+
+    return call
@@ -1,6 +1,7 @@
-from google import genai
-from typing import Dict, Any
-import os
+from typing import Dict, Any, List, Tuple
+from .cascade import run_cascade
+from .cassette import CassetteMiss
+from .gemini_client import generate_text
 
 
 def generate_cover_letter_gemini(
@@ -8,8 +9,9 @@ def generate_cover_letter_gemini(
     job_description: str,
     role: str,
     company_name: str = "",
-    api_key: str = None
-) -> str:
+    api_key: str = None,
+    jd_keywords: List[str] = None
+) -> Tuple[str, Dict[str, Any]]:
     """
     Generate a professional cover letter using Gemini API.
     
@@ -18,17 +20,13 @@ def generate_cover_letter_gemini(
         job_description: The job posting description
         role: The position being applied for
         company_name: Name of the company (optional)
-        api_key: Gemini API key
+        api_key: Gemini API key (default: the configured key pool)
+        jd_keywords: Keywords from the job description (see jd_preprocessor);
+            matching skills are listed first
     
     Returns:
-        Generated cover letter as a string
+        (generated cover letter, served_by dict naming the model tier used)
     """
-    if not api_key:
-        api_key = os.getenv('GEMINI_API_KEY')
-    
-    # Configure Gemini client (same as resume_parser_gemini.py)
-    client = genai.Client(api_key=api_key)
-    
     # Extract key information from resume
     candidate_name = resume_data.get('name', 'Candidate')
     email = resume_data.get('email', '')
@@ -51,7 +49,12 @@ def generate_cover_letter_gemini(
     # Format skills
     skills_text = ""
     if resume_data.get('skills'):
-        skills_text = f"\n\nKey Skills: {', '.join(resume_data['skills'][:10])}"
+        skills = list(resume_data['skills'])
+        if jd_keywords:
+            wanted = {k.lower() for k in jd_keywords}
+            # Stable sort: skills the posting asks for first, original order otherwise
+            skills.sort(key=lambda s: str(s).lower() not in wanted)
+        skills_text = f"\n\nKey Skills: {', '.join(skills[:10])}"
     
     # Create the prompt
     company_mention = f"at {company_name}" if company_name else ""
@@ -95,13 +98,14 @@ Position: {role} {company_mention}
 Generate ONLY the cover letter text, no additional commentary.
 """
 
-    # Generate cover letter using the same method as resume parsing
+    # Generate down the 'cover_letter' cascade (same as resume parsing)
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=prompt
+        return run_cascade(
+            'cover_letter',
+            lambda model: generate_text(model=model, contents=prompt, api_key=api_key)
         )
-        return response.text
+    except CassetteMiss:
+        raise
     except Exception as e:
         print(f"Error generating cover letter: {str(e)}")
         raise Exception(f"Failed to generate cover letter: {str(e)}")
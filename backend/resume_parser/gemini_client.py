@@ -0,0 +1,48 @@
+"""
+Shared entry point for Gemini generate_content calls.
+
+Every call site (resume parsing, chat, cover letters) goes through
+generate_text() so cross-cutting behaviour lives in one place.
+"""
+from . import cassette
+from .key_pool import call_with_key, configured_keys
+from .single_flight import fingerprint, single_flight
+
+
+def _config_for_fingerprint(config):
+    # GenerateContentConfig is a pydantic model; plain dicts are used as-is
+    if hasattr(config, 'model_dump'):
+        return config.model_dump(exclude_none=True, mode='json')
+    return config
+
+
+def gemini_available() -> bool:
+    """True if calls can be served: a key is configured or a cassette is replayed."""
+    return bool(configured_keys()) or cassette.mode() == cassette.REPLAY
+
+
+def generate_text(model: str, contents, config=None, api_key: str = None) -> str:
+    """
+    Call Gemini and return the response text.
+
+    Identical concurrent calls (same model, prompt and config) are coalesced
+    into a single upstream request, see single_flight.py. The request goes out
+    on the least-loaded key of the pool unless ``api_key`` pins one, see
+    key_pool.py.
+    """
+    key = fingerprint('gemini', model, contents, _config_for_fingerprint(config))
+
+    def request(client):
+        response = client.models.generate_content(model=model, contents=contents, config=config)
+        return response.text
+
+    if cassette.mode() == cassette.REPLAY:
+        return cassette.replay(key)
+
+    def call():
+        return call_with_key(request, api_key=api_key, model=model)
+
+    if cassette.mode() == cassette.RECORD:
+        call = cassette.recording(key, model, contents, call)
+
+    return single_flight(key, call)
@@ -0,0 +1,127 @@
+"""
+Idempotency-Key support for POST endpoints that are expensive or create rows.
+
+A flaky connection re-sends the POST and we would parse the same PDF twice,
+generate two letters or save two drafts. When the client sends an
+``Idempotency-Key`` header, the first request with that key is processed and
+its response stored; retries with the same key and body get the stored
+response back, and a retry that arrives while the first request is still
+running gets 409 instead of doing the work a second time.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+from .single_flight import fingerprint
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# A record stuck in "processing" this long belongs to a request that died
+# (worker killed mid-call); a retry may take it over.
+PROCESSING_TIMEOUT = timedelta(minutes=5)
+
+
+def request_fingerprint(request) -> str:
+    """Hash of method, path, form/JSON fields and uploaded file contents."""
+    fields = {}
+    files = {}
+    for name in request.data:
+        value = request.data.get(name)
+        if hasattr(value, 'chunks'):
+            digest = hashlib.sha256()
+            for chunk in value.chunks():
+                digest.update(chunk)
+            value.seek(0)  # the view still needs to read it
+            files[name] = [value.name, value.size, digest.hexdigest()]
+        else:
+            fields[name] = value
+    return fingerprint(request.method, request.path, fields, files)
+
+
+def _retention():
+    return timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def _claim(user, key, request_fp):
+    """Create the processing record, or return (None, existing) if the key is taken."""
+    try:
+        with transaction.atomic():
+            return IdempotencyRecord.objects.create(user=user, key=key, request_fingerprint=request_fp), None
+    except IntegrityError:
+        return None, IdempotencyRecord.objects.filter(user=user, key=key).first()
+
+
+def idempotent(view):
+    """
+    Decorator for function views (place it under @api_view/@permission_classes).
+
+    Requests without the header are passed through unchanged.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({
+                'error': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        # Lazy cleanup of this user's expired keys keeps the table bounded
+        IdempotencyRecord.objects.filter(user=request.user, created_at__lt=now - _retention()).delete()
+
+        request_fp = request_fingerprint(request)
+        record, existing = _claim(request.user, key, request_fp)
+
+        if existing is not None:
+            if existing.request_fingerprint != request_fp:
+                return Response({
+                    'error': f'{IDEMPOTENCY_HEADER} was already used with a different request'
+                }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+            if existing.status == 'completed':
+                response = Response(existing.response_body, status=existing.response_status)
+                response['Idempotent-Replayed'] = 'true'
+                return response
+
+            if existing.created_at > now - PROCESSING_TIMEOUT:
+                response = Response({
+                    'error': 'A request with this Idempotency-Key is still being processed'
+                }, status=status.HTTP_409_CONFLICT)
+                response['Retry-After'] = '2'
+                return response
+
+            # Abandoned by a dead worker: take it over
+            existing.delete()
+            record, existing = _claim(request.user, key, request_fp)
+            if record is None:
+                return Response({
+                    'error': 'A request with this Idempotency-Key is still being processed'
+                }, status=status.HTTP_409_CONFLICT)
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            # Server-side failures are not final; let the client retry with the same key
+            record.delete()
+        else:
+            record.status = 'completed'
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=['status', 'response_status', 'response_body'])
+        return response
+
+    return wrapper
@@ -0,0 +1,281 @@
+"""
+Job-description preprocessing for the cover letter prompt.
+
+Users paste whole job postings: benefits, EEO statements, application
+instructions, sometimes the same block twice. None of that helps Gemini write
+a better letter, so before the prompt is assembled we strip boilerplate
+sections, drop repeated paragraphs, pull out the requirement lines and
+keywords, and trim whatever is left to a token budget.
+"""
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+DEFAULT_TOKEN_BUDGET = 900
+
+# Gemini does not expose a local tokenizer; ~4 characters per token is the
+# usual estimate for English text and is good enough for budgeting.
+CHARS_PER_TOKEN = 4
+
+MAX_REQUIREMENTS = 25
+MAX_KEYWORDS = 20
+
+BULLET_PREFIX = re.compile(r"^\s*(?:[-*•▪‣●■◦]|\d{1,2}[.)])\s+")
+MARKDOWN_HEADING = re.compile(r"^\s*#{1,6}\s*")
+WHITESPACE = re.compile(r"\s+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Section headings whose whole body is boilerplate for a cover letter.
+BOILERPLATE_HEADING = re.compile(
+    r"(?i)^(?:our\s+|the\s+)?("
+    r"benefits|perks|what we offer|what you('|’)ll get|compensation|salary|pay range|pay transparency|"
+    r"equal (employment )?opportunity|eeo|diversity|inclusion|accommodations?|"
+    r"how to apply|to apply|application process|privacy|disclaimer|legal|"
+    r"why join us|why work with us|life at|working at|location and travel|physical requirements"
+    r")\b"
+)
+
+# Sentences that are boilerplate wherever they appear, even without a heading.
+BOILERPLATE_PHRASE = re.compile(
+    r"(?i)("
+    r"equal opportunity employer|affirmative action|without regard to|"
+    r"reasonable accommodation|protected veteran|national origin|sexual orientation|gender identity|"
+    r"e-verify|pay transparency|background check|drug[- ]free|at-will|"
+    r"401\(?k\)?|health, dental|dental,? and vision|paid time off|unlimited pto|parental leave|"
+    r"applicants must be authorized|click apply|apply now|submit your (resume|application)"
+    r")"
+)
+
+REQUIREMENT_HEADING = re.compile(
+    r"(?i)(requirement|qualification|what you('|’)ll need|what we('|’)re looking for|"
+    r"must[- ]have|nice[- ]to[- ]have|you have|you bring|skills|preferred|bonus|"
+    r"responsibilit|what you('|’)ll do|duties|the role|about the role|the job|in this role)"
+)
+
+ABOUT_HEADING = re.compile(r"(?i)^(about (us|the company|the team|[A-Z][\w&.]*)|who we are|our (mission|story|company|team))")
+
+REQUIREMENT_CUE = re.compile(
+    r"(?i)\b(experience|proficien|familiar|knowledge of|understanding of|degree|years|"
+    r"ability to|skilled|expertise|background in|comfortable with|hands-on)\b"
+)
+
+# Tokens that look like technology names: C++, C#, .NET, Node.js, CI/CD, AWS, PyTorch.
+TECH_TOKEN = re.compile(r"(?<![\w.])(?:\.?[A-Za-z][A-Za-z0-9]*(?:[.+#/-][A-Za-z0-9+#]+)*[+#]*)")
+PLAIN_WORD = re.compile(r"[A-Za-z][a-z]*(?:-[a-z]+)*")
+
+STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be because been being both but by can could did do does
+doing during each either etc every few for from further had has have having he her here how i if in into is it its
+just least less like make may me more most must my no nor not of off on once only or other our out over own per
+plus role same she should so some such team than that the their them then there these they this those through to
+too under until up us very was we well were what when where which while who whom why will with within without would
+you your yours join work working help new including strong good great excellent ability able years year experience
+company job position candidate candidates opportunity responsibilities requirements qualifications preferred
+required requirement skills skill knowledge understanding across using use used based build building
+""".split())
+
+PRIORITY_REQUIREMENTS = 0
+PRIORITY_GENERAL = 1
+PRIORITY_ABOUT = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (see CHARS_PER_TOKEN)."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _normalize_key(text: str) -> str:
+    return WHITESPACE.sub(" ", BULLET_PREFIX.sub("", text)).strip().lower().rstrip(".;:")
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60 or BULLET_PREFIX.match(stripped):
+        return False
+    if MARKDOWN_HEADING.match(stripped) or stripped.endswith(":"):
+        return True
+    if stripped[-1] in ".!?,;" or len(stripped.split()) > 7:
+        return False
+    letters = [c for c in stripped if c.isalpha()]
+    if letters and all(c.isupper() for c in letters):
+        return True
+    words = [w for w in stripped.split() if w[0].isalpha()]
+    return bool(words) and all(w[0].isupper() or w.lower() in STOPWORDS for w in words) and words[0][0].isupper()
+
+
+def _split_sections(text: str) -> List[Dict[str, Any]]:
+    """Group the posting into sections of units (a bullet line or a paragraph)."""
+    sections = [{"heading": "", "units": []}]
+    paragraph: List[str] = []
+
+    def flush():
+        if paragraph:
+            sections[-1]["units"].append(" ".join(paragraph))
+            paragraph.clear()
+
+    for raw in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        line = raw.strip()
+        if not line:
+            flush()
+        elif _is_heading(line):
+            flush()
+            heading = MARKDOWN_HEADING.sub("", line).rstrip(":").strip()
+            sections.append({"heading": heading, "units": []})
+        elif BULLET_PREFIX.match(line):
+            flush()
+            sections[-1]["units"].append(line)
+        else:
+            paragraph.append(line)
+    flush()
+    return [s for s in sections if s["heading"] or s["units"]]
+
+
+def _classify(heading: str) -> str:
+    if not heading:
+        return "general"
+    if BOILERPLATE_HEADING.match(heading):
+        return "boilerplate"
+    if ABOUT_HEADING.match(heading):
+        return "about"
+    if REQUIREMENT_HEADING.search(heading):
+        return "requirements"
+    return "general"
+
+
+def _strip_boilerplate_sentences(unit: str) -> str:
+    if not BOILERPLATE_PHRASE.search(unit):
+        return unit
+    kept = [s for s in SENTENCE_END.split(unit) if not BOILERPLATE_PHRASE.search(s)]
+    return " ".join(kept).strip()
+
+
+def extract_keywords(text: str, limit: int = MAX_KEYWORDS) -> List[str]:
+    """Return the most frequent technology-looking terms, most frequent first."""
+    counts: Counter = Counter()
+    display: Dict[str, str] = {}
+    for line in text.split("\n"):
+        if _is_heading(line):
+            continue
+        line = BULLET_PREFIX.sub("", line)
+        for match in TECH_TOKEN.finditer(line):
+            token = match.group(0).strip(".-/")
+            key = token.lower()
+            if len(token) < 2 or key in STOPWORDS or key.isdigit():
+                continue
+            # Plain lowercase words are rarely the technologies we care about;
+            # keep tokens with capitals, digits or symbols (AWS, PyTorch, C++).
+            plain = PLAIN_WORD.fullmatch(token) is not None
+            if plain and token[0].islower():
+                continue
+            # A capitalised plain word at the start of a sentence is just grammar.
+            before = line[:match.start()].rstrip()
+            if plain and (not before or before[-1] in ".!?"):
+                continue
+            counts[key] += 1
+            display.setdefault(key, token)
+    return [display[k] for k, _ in counts.most_common(limit)]
+
+
+def _render(sections: List[Dict[str, Any]]) -> str:
+    blocks = []
+    for section in sections:
+        if not section["units"]:
+            continue
+        lines = ([section["heading"] + ":"] if section["heading"] else []) + section["units"]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+ELLIPSIS = " …"
+
+
+def _truncate_words(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    # Leave room for the ellipsis so the result stays within max_chars
+    cut = text[:max_chars - len(ELLIPSIS)].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + ELLIPSIS
+
+
+def preprocess_job_description(text: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> Dict[str, Any]:
+    """
+    Clean a pasted job description before it goes into the cover letter prompt.
+
+    Args:
+        text: Raw job description as pasted by the user
+        token_budget: Maximum estimated tokens for the cleaned text
+
+    Returns:
+        Dict with the cleaned ``text``, ``requirements`` and ``keywords`` lists,
+        ``original_tokens``, ``final_tokens``, ``tokens_saved`` and a
+        ``removed`` breakdown (boilerplate sections/lines, duplicates, trimmed).
+    """
+    text = text or ""
+    original_tokens = estimate_tokens(text)
+    removed = {"boilerplate_sections": 0, "boilerplate_lines": 0, "duplicates": 0, "trimmed": 0}
+
+    seen = set()
+    kept_sections = []
+    requirement_units = set()
+
+    for position, section in enumerate(_split_sections(text)):
+        kind = _classify(section["heading"])
+        if kind == "boilerplate":
+            removed["boilerplate_sections"] += 1
+            continue
+
+        units = []
+        for unit in section["units"]:
+            cleaned = _strip_boilerplate_sentences(unit)
+            if not cleaned:
+                removed["boilerplate_lines"] += 1
+                continue
+            key = _normalize_key(cleaned)
+            if not key:
+                continue
+            if key in seen:
+                removed["duplicates"] += 1
+                continue
+            seen.add(key)
+            units.append(cleaned)
+
+            is_bullet = bool(BULLET_PREFIX.match(cleaned))
+            if is_bullet and (kind == "requirements" or REQUIREMENT_CUE.search(cleaned)):
+                requirement_units.add(cleaned)
+
+        priority = {"requirements": PRIORITY_REQUIREMENTS, "about": PRIORITY_ABOUT}.get(kind, PRIORITY_GENERAL)
+        kept_sections.append({"heading": section["heading"], "units": units, "priority": priority, "position": position})
+
+    # Enforce the budget: drop units from the least useful sections first,
+    # working backwards so the opening of each section survives longest.
+    result = _render(kept_sections)
+    if estimate_tokens(result) > token_budget:
+        for section in sorted(kept_sections, key=lambda s: (-s["priority"], -s["position"])):
+            while section["units"] and estimate_tokens(result) > token_budget:
+                section["units"].pop()
+                removed["trimmed"] += 1
+                result = _render(kept_sections)
+            if estimate_tokens(result) <= token_budget:
+                break
+    # A single section can still be larger than the whole budget.
+    result = _truncate_words(result, token_budget * CHARS_PER_TOKEN)
+
+    # Only requirements that are still in the prompt, whole
+    requirements = [
+        BULLET_PREFIX.sub("", unit).strip()
+        for section in kept_sections for unit in section["units"]
+        if unit in requirement_units and unit in result
+    ]
+    final_tokens = estimate_tokens(result)
+    return {
+        "text": result,
+        "requirements": requirements[:MAX_REQUIREMENTS],
+        "keywords": extract_keywords(result),
+        "original_tokens": original_tokens,
+        "final_tokens": final_tokens,
+        "tokens_saved": max(original_tokens - final_tokens, 0),
+        "removed": removed,
+    }
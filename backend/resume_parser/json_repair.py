@@ -0,0 +1,180 @@
+"""
+Tolerant parsing of structured output that is not quite valid JSON.
+
+Gemini's structured output is usually valid, but long responses get cut off
+at the output token limit and now and then a stray quote or trailing comma
+slips in. Instead of failing the whole parse, repair_json() fixes the common
+defects in one pass:
+
+- markdown code fences around the JSON;
+- trailing commas before } or ];
+- unescaped double quotes and raw newlines inside strings;
+- truncation: the unfinished string is closed, a dangling key or partial
+  value is dropped and the open objects/arrays are closed.
+
+validate_sections() then validates each top-level field separately, so one
+broken section does not throw away the others; the caller re-requests only
+what is missing.
+"""
+import json
+import re
+from typing import Any, Dict, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+CODE_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+CLOSERS = {'{': '}', '[': ']'}
+
+# How far back we cut a truncated tail before giving up
+MAX_BACKTRACK = 50
+
+
+class JSONRepairError(ValueError):
+    pass
+
+
+def _next_significant(text, index):
+    while index < len(text) and text[index] in ' \t\r\n':
+        index += 1
+    return text[index] if index < len(text) else ''
+
+
+def _scan(text):
+    """
+    Rewrite ``text`` fixing string escapes and trailing commas.
+
+    Returns (fixed text, open-bracket stack at the end, whether it ended inside
+    a string, cut points) where cut points are (length, stack) after each
+    opener and before each comma outside strings, used to drop a truncated
+    tail.
+    """
+    out = []
+    stack = []
+    cut_points = []
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(ch)
+            elif ch == '\\':
+                escaped = True
+                out.append(ch)
+            elif ch == '"':
+                # A quote only ends the string if JSON structure follows it
+                if _next_significant(text, i + 1) in (',', ':', '}', ']', ''):
+                    in_string = False
+                    out.append(ch)
+                else:
+                    out.append('\\"')
+            elif ch == '\n':
+                out.append('\\n')
+            elif ch == '\r':
+                continue
+            else:
+                out.append(ch)
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in CLOSERS:
+            stack.append(ch)
+            out.append(ch)
+            cut_points.append((len(out), tuple(stack)))
+            continue
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+        elif ch == ',':
+            if _next_significant(text, i + 1) in ('}', ']'):
+                continue
+            cut_points.append((len(out), tuple(stack)))
+        out.append(ch)
+    return ''.join(out), stack, in_string, cut_points
+
+
+def _close(text, stack):
+    return text + ''.join(CLOSERS[opener] for opener in reversed(stack))
+
+
+def repair_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parse ``text`` as JSON, repairing common defects.
+
+    Returns:
+        (parsed value, truncated) where truncated is True when the input was
+        cut off and the last field may be incomplete
+
+    Raises:
+        JSONRepairError: The text could not be repaired
+    """
+    text = CODE_FENCE.sub('', text or '').strip()
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+
+    fixed, stack, in_string, cut_points = _scan(text)
+    truncated = bool(stack) or in_string
+    if in_string:
+        fixed += '"'
+
+    candidates = [(fixed.rstrip().rstrip(','), stack)]
+    # Dropping back to the last complete element handles tails like
+    # `"key": ` or `"partial` that closing alone cannot fix.
+    for length, cut_stack in reversed(cut_points[-MAX_BACKTRACK:]):
+        candidates.append((fixed[:length], list(cut_stack)))
+
+    for candidate, candidate_stack in candidates:
+        try:
+            return json.loads(_close(candidate, candidate_stack)), truncated
+        except json.JSONDecodeError:
+            continue
+    raise JSONRepairError('Structured output could not be repaired')
+
+
+def validate_sections(data: Any, schema_model, truncated: bool = False) -> Tuple[Dict[str, Any], Set[str]]:
+    """
+    Validate each top-level field of ``data`` against ``schema_model`` on its own.
+
+    For list fields, items that fail validation are dropped rather than the
+    whole list. When the output was truncated, the last field present is
+    treated as incomplete.
+
+    Returns:
+        (valid fields, names of fields that are missing or invalid)
+    """
+    if not isinstance(data, dict):
+        return {}, set(schema_model.model_fields)
+
+    present = [name for name in data if name in schema_model.model_fields]
+    incomplete = present[-1] if truncated and present else None
+
+    valid = {}
+    missing = set()
+    for name, info in schema_model.model_fields.items():
+        if name not in data or name == incomplete:
+            missing.add(name)
+            continue
+        adapter = TypeAdapter(info.annotation)
+        try:
+            valid[name] = adapter.validate_python(data[name])
+            continue
+        except ValidationError:
+            pass
+        item_type = getattr(info.annotation, '__args__', (None,))[0]
+        if isinstance(data[name], list) and item_type is not None:
+            item_adapter = TypeAdapter(item_type)
+            items = []
+            for item in data[name]:
+                try:
+                    items.append(item_adapter.validate_python(item))
+                except ValidationError:
+                    continue
+            if items:
+                valid[name] = items
+                continue
+        missing.add(name)
+    return valid, missing
@@ -0,0 +1,295 @@
+"""
+Pool of Gemini API keys.
+
+With a single GEMINI_API_KEY the whole deployment shares one quota bucket.
+GEMINI_API_KEYS takes a comma-separated list; every call is routed to the
+least-loaded key (fewest calls in flight, then fewest calls this minute) that
+is not cooling down:
+
+- a key that gets 429 is benched for that model (quotas are per model) for
+  the retry delay Gemini suggests, or GEMINI_KEY_RATE_LIMIT_COOLDOWN_SECONDS,
+  and the call moves to the next key;
+- a key that gets 403 (revoked, API disabled) is benched for
+  GEMINI_KEY_FORBIDDEN_COOLDOWN_SECONDS;
+- with GEMINI_KEY_RPM set, a key that used its per-minute budget is skipped
+  until the next minute instead of being pushed into a 429.
+
+Usage per key (hashed id and masked suffix, never the key) is kept in the
+shared cache so the limits and metrics cover all gunicorn workers. Each key
+has its own counters (in flight, calls this minute, outcomes) and cooldown
+entries, updated with atomic increments; there is no pool-wide lock, so
+calls on different keys never wait on each other. Picking a key is one
+get_many over all keys. If the cache is unavailable calls still go out, to
+a random usable key.
+"""
+import hashlib
+import random
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from google import genai
+
+from .cache_state import incr_counter
+
+# A checked-out key counts as in flight at most this long (covers slow calls).
+# In-flight counts are kept per LEASE_SECONDS window, so calls of crashed
+# workers stop counting once their window is over.
+LEASE_SECONDS = 180
+
+# Per-key counters; 'errors' counts every failed call, 429s and 403s included
+OUTCOMES = ('successes', 'errors', 'rate_limited', 'forbidden')
+
+RATE_LIMITED = 429
+FORBIDDEN = 403
+
+RETRY_DELAY = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+_clients = {}
+
+
+class NoAPIKeyConfigured(ValueError):
+    pass
+
+
+class KeyPoolExhausted(Exception):
+    """Every key is benched or over its per-minute budget."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def configured_keys():
+    return list(settings.GEMINI_API_KEYS)
+
+
+def key_id(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+def _client(api_key):
+    # Clients hold an HTTP connection pool; reuse one per key per process
+    if api_key not in _clients:
+        _clients[api_key] = genai.Client(api_key=api_key)
+    return _clients[api_key]
+
+
+def _error_code(exc):
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int):
+        return code
+    code = getattr(exc, 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def _suggested_delay(exc):
+    """Seconds from a google.rpc.RetryInfo detail on a 429, if present."""
+    details = getattr(exc, 'details', None)
+    if isinstance(details, dict):
+        details = details.get('error', {}).get('details', [])
+    for detail in details if isinstance(details, list) else []:
+        if isinstance(detail, dict) and detail.get('@type', '').endswith('RetryInfo'):
+            match = RETRY_DELAY.match(str(detail.get('retryDelay', '')))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+def _key(kid, *parts):
+    return ':'.join(('keypool', kid, *map(str, parts)))
+
+
+def _label(api_key):
+    return f"…{api_key[-4:]}"
+
+
+def _window(now):
+    return int(now // LEASE_SECONDS)
+
+
+def _usage_keys(kid, model, now):
+    """Cache keys read to judge one key: cooldowns, in flight, calls this minute."""
+    window = _window(now)
+    return {
+        'benched': _key(kid, 'benched'),
+        'benched_model': _key(kid, 'benched', model) if model else _key(kid, 'benched'),
+        'in_flight': _key(kid, 'in_flight', window),
+        'in_flight_previous': _key(kid, 'in_flight', window - 1),
+        'minute': _key(kid, 'minute', int(now // 60)),
+    }
+
+
+def _checkout(keys, skip, model):
+    """Pick and lease the least-loaded usable key. Returns (api_key, lease)."""
+    rpm = settings.GEMINI_KEY_RPM
+    now = time.time()
+    minute = int(now // 60)
+    usage_keys = {api_key: _usage_keys(key_id(api_key), model, now) for api_key in keys if api_key not in skip}
+    values = cache.get_many([k for names in usage_keys.values() for k in names.values()])
+
+    candidates = []
+    soonest = None
+    for api_key, names in usage_keys.items():
+        benched_until = max(values.get(names['benched'], 0.0), values.get(names['benched_model'], 0.0))
+        minute_requests = values.get(names['minute'], 0)
+        if benched_until > now:
+            ready = benched_until
+        elif rpm and minute_requests >= rpm:
+            ready = (minute + 1) * 60
+        else:
+            in_flight = max(values.get(names['in_flight'], 0) + values.get(names['in_flight_previous'], 0), 0)
+            candidates.append((in_flight, minute_requests, random.random(), api_key))
+            continue
+        soonest = ready if soonest is None else min(soonest, ready)
+
+    for _, _, _, api_key in sorted(candidates):
+        names = usage_keys[api_key]
+        # Count the call against the key's minute first; if others took the
+        # rest of its budget since the read above, give it back and move on
+        if rpm and incr_counter(names['minute'], 1, 120) > rpm:
+            incr_counter(names['minute'], -1, 120)
+            soonest = (minute + 1) * 60 if soonest is None else min(soonest, (minute + 1) * 60)
+            continue
+        if not rpm:
+            incr_counter(names['minute'], 1, 120)
+        incr_counter(names['in_flight'], 1, 2 * LEASE_SECONDS)
+        return api_key, names['in_flight']
+
+    retry_after = max(1, int(soonest - now + 0.999)) if soonest else 1
+    raise KeyPoolExhausted('All Gemini API keys are rate limited', retry_after=retry_after)
+
+
+def _bench(kid, model, cooldown):
+    until = time.time() + cooldown
+    key = _key(kid, 'benched', model) if model else _key(kid, 'benched')
+    # Keep a longer cooldown set by another worker
+    if (cache.get(key) or 0.0) < until:
+        cache.set(key, until, int(cooldown) + 1)
+
+
+def _checkin(api_key, lease, model, exc=None):
+    """Return the lease taken by _checkout() and record the outcome of the call."""
+    kid = key_id(api_key)
+    code = _error_code(exc) if exc is not None else None
+    try:
+        try:
+            cache.decr(lease)
+        except ValueError:
+            pass  # window expired; the call no longer counts anyway
+        if exc is None:
+            incr_counter(_key(kid, 'successes'))
+            return
+        incr_counter(_key(kid, 'errors'))
+        cache.set(_key(kid, 'last_error'), str(exc)[:200], None)
+        if code == RATE_LIMITED:
+            incr_counter(_key(kid, 'rate_limited'))
+            cooldown = _suggested_delay(exc) or settings.GEMINI_KEY_RATE_LIMIT_COOLDOWN_SECONDS
+            # Quotas are per model; without a model the whole key is benched
+            _bench(kid, model, cooldown)
+        elif code == FORBIDDEN:
+            incr_counter(_key(kid, 'forbidden'))
+            cooldown = settings.GEMINI_KEY_FORBIDDEN_COOLDOWN_SECONDS
+            _bench(kid, None, cooldown)
+        else:
+            return
+        print(f"⚠️ Gemini key {_label(api_key)} got {code} on {model or 'all models'}, benched for {cooldown:.0f}s")
+    except Exception as e:
+        # The in-flight count expires with its window
+        print(f"⚠️ Key pool checkin failed: {e}")
+
+
+def call_with_key(fn, api_key: str = None, model: str = None):
+    """
+    Run ``fn(client)`` with a client for a key from the pool.
+
+    On 429/403 the key is benched and the call is retried on the next usable
+    key; other errors are raised as they are.
+
+    Args:
+        fn: Callable taking a genai.Client and making one upstream call
+        api_key: Use only this key instead of the pool (still tracked)
+        model: Model being called; a 429 benches the key for this model only
+
+    Raises:
+        NoAPIKeyConfigured: No keys in settings and none passed
+        KeyPoolExhausted: Every key is cooling down or over its budget
+    """
+    keys = [api_key] if api_key else configured_keys()
+    if not keys:
+        raise NoAPIKeyConfigured("GEMINI_API_KEY not found in environment variables")
+
+    tried = set()
+    while True:
+        try:
+            chosen, lease = _checkout(keys, tried, model)
+        except KeyPoolExhausted:
+            raise
+        except Exception as e:
+            print(f"⚠️ Key pool unavailable, picking a key at random: {e}")
+            return fn(_client(random.choice([k for k in keys if k not in tried] or keys)))
+
+        try:
+            result = fn(_client(chosen))
+        except Exception as e:
+            _checkin(chosen, lease, model, e)
+            if _error_code(e) in (RATE_LIMITED, FORBIDDEN):
+                tried.add(chosen)
+                if len(tried) < len(keys):
+                    continue
+            raise
+        _checkin(chosen, lease, model)
+        return result
+
+
+def _cascade_models():
+    return sorted({tier.strip() for tiers in settings.LLM_CASCADE.values() for tier in tiers
+                   if tier.strip() and tier.strip() != 'local'})
+
+
+def key_pool_metrics() -> dict:
+    """Per-key usage, in-flight calls and cooldowns (keys are never exposed)."""
+    now = time.time()
+    window = _window(now)
+    models = _cascade_models()
+    wanted = []
+    for api_key in configured_keys():
+        kid = key_id(api_key)
+        wanted += [_key(kid, name) for name in (*OUTCOMES, 'benched', 'last_error')]
+        wanted += [_key(kid, 'in_flight', window), _key(kid, 'in_flight', window - 1)]
+        wanted += [_key(kid, 'minute', int(now // 60))]
+        wanted += [_key(kid, 'benched', model) for model in models]
+    try:
+        values = cache.get_many(wanted)
+    except Exception as e:
+        print(f"⚠️ Key pool metrics unavailable: {e}")
+        values = {}
+
+    keys = []
+    for api_key in configured_keys():
+        kid = key_id(api_key)
+        outcomes = {name: values.get(_key(kid, name), 0) for name in OUTCOMES}
+        in_flight = max(
+            values.get(_key(kid, 'in_flight', window), 0) + values.get(_key(kid, 'in_flight', window - 1), 0), 0
+        )
+        keys.append({
+            'id': kid,
+            'label': _label(api_key),
+            'in_flight': in_flight,
+            'requests_this_minute': values.get(_key(kid, 'minute', int(now // 60)), 0),
+            'requests': outcomes['successes'] + outcomes['errors'] + in_flight,
+            **outcomes,
+            'cooling_down_seconds': max(0, round(values.get(_key(kid, 'benched'), 0.0) - now, 1)),
+            'models_cooling_down': {
+                model: round(values[_key(kid, 'benched', model)] - now, 1)
+                for model in models if values.get(_key(kid, 'benched', model), 0.0) > now
+            },
+            'last_error': values.get(_key(kid, 'last_error'), ''),
+        })
+    return {
+        'size': len(keys),
+        'available': sum(1 for k in keys if not k['cooling_down_seconds']),
+        'rpm_limit_per_key': settings.GEMINI_KEY_RPM or None,
+        'keys': keys,
+    }
@@ -0,0 +1,306 @@
+"""
+Fair per-user scheduling and load shedding in front of the Gemini calls.
+
+Without this a single user running many chats and regenerations can hold
+every Gemini slot and every worker, and uploads for everyone else time out.
+
+- At most LLM_MAX_CONCURRENCY calls run at once, and at most
+  LLM_PER_USER_CONCURRENCY per user.
+- Waiting calls are served in weighted-fair-queuing order: each call gets a
+  virtual finish tag of max(clock, user's last tag) + 1/weight, so one busy
+  user's backlog cannot starve others, and heavier tasks (parse > cover
+  letter > chat) advance faster.
+- When the queue is too deep (lower priority tasks get a smaller share of it)
+  or the oldest waiter has waited half of LLM_QUEUE_MAX_WAIT_SECONDS, new calls are
+  shed at once with LLMOverloaded, which views turn into 503 + Retry-After.
+
+The queue (running and waiting calls and the virtual clock) lives in one
+cache entry guarded by a cache mutex, so the limits hold across gunicorn
+workers when the cache is shared. Everything else is kept out of it: each
+user's last finish tag has its own key, and the admitted/shed counts are
+atomic counters. A call that finds a free slot and nobody waiting is admitted
+under a single lock. Waiting calls peek at the queue without the mutex, back
+off between peeks, and only lock it when they are next in line or out of time,
+so a deep queue does not mean a lock attempt per waiter per tick.
+
+If the cache is unavailable calls run unscheduled rather than failing; each
+such call is logged and counted in scheduler_metrics().
+"""
+import math
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache_state import incr_counter, locked_cache_state
+
+TASK_WEIGHTS = {'parse': 4, 'cover_letter': 2, 'chat': 1}
+
+# Fraction of LLM_QUEUE_MAX_DEPTH each task may fill before it is shed, so
+# chat is turned away first and parsing last.
+TASK_QUEUE_SHARE = {'parse': 1.0, 'cover_letter': 0.75, 'chat': 0.5}
+
+STATE_KEY = 'llmsched:state'
+MUTEX_KEY = 'llmsched:mutex'
+
+# A running call holds its slot at most this long (covers Gemini retries);
+# slots of crashed workers are reclaimed after it.
+LEASE_SECONDS = 180
+
+# Waiters peek at the queue after POLL_INTERVAL, doubling up to MAX_POLL_INTERVAL
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+
+# Calls run without a slot because the cache was unavailable. Counted per
+# process: with the cache down there is nowhere shared to count them.
+_unscheduled = {task: 0 for task in TASK_WEIGHTS}
+_unscheduled_lock = threading.Lock()
+
+
+class LLMOverloaded(Exception):
+    """Raised when a call is shed; ``retry_after`` is in seconds."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def overloaded_response(exc: LLMOverloaded) -> Response:
+    response = Response({'error': str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = str(exc.retry_after)
+    return response
+
+
+def _empty_state():
+    return {
+        'running': {},
+        'waiting': {},
+        'vclock': 0.0,
+    }
+
+
+def _locked_state():
+    return locked_cache_state(STATE_KEY, MUTEX_KEY, _empty_state)
+
+
+def _vtime_key(uid):
+    return f"llmsched:vtime:{uid}"
+
+
+def _counter_key(name, task):
+    return f"llmsched:{name}:{task}"
+
+
+def _vtime_ttl():
+    # A tag only matters while the user has calls waiting or running
+    return int(2 * settings.LLM_QUEUE_MAX_WAIT_SECONDS + LEASE_SECONDS)
+
+
+def _purge(state, now):
+    max_wait = settings.LLM_QUEUE_MAX_WAIT_SECONDS
+    state['running'] = {t: r for t, r in state['running'].items() if r['expires'] > now}
+    # Waiters that vanished without dequeuing (worker killed)
+    state['waiting'] = {t: w for t, w in state['waiting'].items() if w['since'] > now - 2 * max_wait}
+
+
+def _next_ticket(state):
+    """The waiting ticket that should get the next free slot, if any."""
+    if len(state['running']) >= settings.LLM_MAX_CONCURRENCY:
+        return None
+    per_user = {}
+    for run in state['running'].values():
+        per_user[run['user']] = per_user.get(run['user'], 0) + 1
+    eligible = [
+        (w['tag'], w['since'], ticket)
+        for ticket, w in state['waiting'].items()
+        if per_user.get(w['user'], 0) < settings.LLM_PER_USER_CONCURRENCY
+    ]
+    return min(eligible)[2] if eligible else None
+
+
+def _retry_after(state):
+    backlog = len(state['waiting']) / max(settings.LLM_MAX_CONCURRENCY, 1)
+    return max(1, math.ceil(settings.LLM_RETRY_AFTER_SECONDS * (1 + backlog)))
+
+
+def _shed(state, task, reason):
+    raise LLMOverloaded(
+        f'AI service is busy ({reason}). Please try again shortly.',
+        retry_after=_retry_after(state),
+    )
+
+
+def _admit(state, ticket, now):
+    entry = state['waiting'].pop(ticket)
+    state['running'][ticket] = {'user': entry['user'], 'task': entry['task'], 'expires': now + LEASE_SECONDS}
+    state['vclock'] = max(state['vclock'], entry['tag'])
+
+
+def _acquire(user_id, task):
+    max_wait = settings.LLM_QUEUE_MAX_WAIT_SECONDS
+    ticket = uuid.uuid4().hex
+    uid = str(user_id)
+    # Read outside the lock; only this user's own concurrent calls race on it
+    last_tag = cache.get(_vtime_key(uid)) or 0.0
+
+    with _locked_state() as state:
+        now = time.time()
+        _purge(state, now)
+        waiting = state['waiting']
+        oldest = min((w['since'] for w in waiting.values()), default=now)
+        if len(waiting) >= settings.LLM_QUEUE_MAX_DEPTH * TASK_QUEUE_SHARE[task]:
+            _shed(state, task, 'queue full')
+        # A queue whose head has already waited half the limit will not clear
+        # in time for a newcomer; turn it away now instead of after max_wait.
+        if now - oldest >= max_wait / 2:
+            _shed(state, task, 'queue wait too long')
+
+        tag = max(state['vclock'], last_tag) + 1.0 / TASK_WEIGHTS[task]
+        waiting[ticket] = {'user': uid, 'task': task, 'tag': tag, 'since': now}
+        admitted = _next_ticket(state) == ticket
+        if admitted:
+            _admit(state, ticket, now)
+    cache.set(_vtime_key(uid), tag, _vtime_ttl())
+    if admitted:
+        return ticket
+
+    try:
+        return _wait_turn(ticket, task, max_wait)
+    except LLMOverloaded:
+        raise
+    except Exception:
+        # The caller runs unscheduled; a leftover entry would count towards
+        # the queue depth and age and get other users' calls shed
+        _forget(ticket)
+        raise
+
+
+def _wait_turn(ticket, task, max_wait):
+    deadline = time.monotonic() + max_wait
+    delay = POLL_INTERVAL
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(delay * random.uniform(0.5, 1.0), remaining))
+            delay = min(delay * 2, MAX_POLL_INTERVAL)
+            # Peek without the mutex; lock only if this call looks next in line
+            peek = cache.get(STATE_KEY) or _empty_state()
+            _purge(peek, time.time())
+            if time.monotonic() < deadline and ticket in peek['waiting'] and _next_ticket(peek) != ticket:
+                continue
+
+        with _locked_state() as state:
+            now = time.time()
+            _purge(state, now)
+            if ticket not in state['waiting']:
+                _shed(state, task, 'queue entry expired')
+            if _next_ticket(state) == ticket:
+                _admit(state, ticket, now)
+                return ticket
+            if time.monotonic() >= deadline:
+                state['waiting'].pop(ticket, None)
+                _shed(state, task, 'queue wait too long')
+
+
+def _forget(ticket):
+    try:
+        with _locked_state() as state:
+            state['waiting'].pop(ticket, None)
+    except Exception as e:
+        # _purge() drops it once it is old enough
+        print(f"⚠️ LLM scheduler could not remove a waiting call: {e}")
+
+
+def _count(name, task):
+    try:
+        incr_counter(_counter_key(name, task))
+    except Exception as e:
+        print(f"⚠️ LLM scheduler could not count {name} {task}: {e}")
+
+
+def _release(ticket):
+    try:
+        with _locked_state() as state:
+            state['running'].pop(ticket, None)
+    except Exception as e:
+        # The lease expires on its own
+        print(f"⚠️ LLM scheduler release failed: {e}")
+
+
+@contextmanager
+def llm_slot(user, task: str):
+    """
+    Hold a scheduler slot for one LLM-backed operation.
+
+    Args:
+        user: The requesting user (fairness and per-user caps are per user)
+        task: 'parse', 'cover_letter' or 'chat'
+
+    Raises:
+        LLMOverloaded: The call was shed; respond with overloaded_response()
+    """
+    try:
+        ticket = _acquire(user.pk, task)
+    except LLMOverloaded:
+        _count('shed', task)
+        raise
+    except Exception as e:
+        with _unscheduled_lock:
+            _unscheduled[task] = _unscheduled.get(task, 0) + 1
+        print(f"⚠️ LLM scheduler unavailable, running {task} unscheduled: {e}")
+        yield
+        return
+    _count('admitted', task)
+
+    try:
+        yield
+    finally:
+        _release(ticket)
+
+
+def scheduler_metrics() -> dict:
+    """
+    Queue depth, running calls and admitted/shed counters. ``unscheduled``
+    counts the calls this worker process ran without a slot because the cache
+    was unavailable.
+    """
+    counter_keys = [_counter_key(name, task) for name in ('admitted', 'shed') for task in TASK_WEIGHTS]
+    try:
+        state = cache.get(STATE_KEY) or _empty_state()
+        counters = cache.get_many(counter_keys)
+    except Exception as e:
+        print(f"⚠️ LLM scheduler metrics unavailable: {e}")
+        state, counters = _empty_state(), {}
+    now = time.time()
+    _purge(state, now)
+    running_by_task = {task: 0 for task in TASK_WEIGHTS}
+    for run in state['running'].values():
+        running_by_task[run['task']] = running_by_task.get(run['task'], 0) + 1
+    waiting_by_task = {task: 0 for task in TASK_WEIGHTS}
+    for wait in state['waiting'].values():
+        waiting_by_task[wait['task']] = waiting_by_task.get(wait['task'], 0) + 1
+    oldest = min((w['since'] for w in state['waiting'].values()), default=now)
+    with _unscheduled_lock:
+        unscheduled = dict(_unscheduled)
+    return {
+        'queue_depth': len(state['waiting']),
+        'queue_depth_by_task': waiting_by_task,
+        'oldest_wait_seconds': round(now - oldest, 2),
+        'running': len(state['running']),
+        'running_by_task': running_by_task,
+        'admitted': {task: counters.get(_counter_key('admitted', task), 0) for task in TASK_WEIGHTS},
+        'shed': {task: counters.get(_counter_key('shed', task), 0) for task in TASK_WEIGHTS},
+        'unscheduled': unscheduled,
+        'limits': {
+            'max_concurrency': settings.LLM_MAX_CONCURRENCY,
+            'per_user_concurrency': settings.LLM_PER_USER_CONCURRENCY,
+            'max_queue_depth': settings.LLM_QUEUE_MAX_DEPTH,
+            'max_queue_wait_seconds': settings.LLM_QUEUE_MAX_WAIT_SECONDS,
+        },
+    }
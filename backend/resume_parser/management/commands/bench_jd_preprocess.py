@@ -0,0 +1,96 @@
+"""
+Management command to benchmark job-description preprocessing.
+
+Reports input-token reduction and preprocessing latency for every sample job
+description. With --live it also generates a cover letter from the raw and the
+preprocessed text and reports end-to-end latency for both (needs GEMINI_API_KEY).
+"""
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_parser.jd_preprocessor import estimate_tokens, preprocess_job_description
+from resume_parser.gemini_client import gemini_available
+
+SAMPLE_DIR = Path(__file__).resolve().parents[2] / 'bench_data' / 'job_descriptions'
+
+SAMPLE_RESUME = {
+    'name': 'Alex Morgan',
+    'email': 'alex.morgan@example.com',
+    'phone': '+1 555 010 0199',
+    'experience': [
+        {'company': 'Acme Corp', 'role': 'Software Engineer',
+         'role_summary': 'Built Python and PostgreSQL services for billing; led migration to Kubernetes.'},
+    ],
+    'projects': [
+        {'title': 'Ranker', 'description': 'Learning-to-rank search prototype in PyTorch served with Docker.'},
+    ],
+    'skills': ['Python', 'Django', 'PostgreSQL', 'Docker', 'Kubernetes', 'PyTorch', 'React', 'AWS', 'SQL', 'Go'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark job-description preprocessing (token reduction and latency)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=str(SAMPLE_DIR), help='Directory of .txt job descriptions')
+        parser.add_argument('--budget', type=int, default=settings.JD_TOKEN_BUDGET, help='Token budget')
+        parser.add_argument('--repeat', type=int, default=200, help='Preprocessing runs per sample')
+        parser.add_argument('--live', action='store_true',
+                            help='Also time cover letter generation with raw vs preprocessed text')
+
+    def handle(self, *args, **options):
+        files = sorted(Path(options['dir']).glob('*.txt'))
+        if not files:
+            raise CommandError(f"No .txt job descriptions found in {options['dir']}")
+
+        if options['live'] and not gemini_available():
+            raise CommandError('GEMINI_API_KEY not found in environment variables')
+
+        total_before = total_after = 0
+        raw_latencies, clean_latencies = [], []
+
+        self.stdout.write(f"{'sample':<28}{'tokens in':>10}{'tokens out':>11}{'saved':>8}{'prep ms':>9}")
+        for path in files:
+            text = path.read_text()
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                jd = preprocess_job_description(text, token_budget=options['budget'])
+            prep_ms = (time.perf_counter() - start) * 1000 / options['repeat']
+
+            before = estimate_tokens(text)
+            total_before += before
+            total_after += jd['final_tokens']
+            saved_pct = 100 * jd['tokens_saved'] / before if before else 0
+            self.stdout.write(
+                f"{path.name:<28}{before:>10}{jd['final_tokens']:>11}{saved_pct:>7.0f}%{prep_ms:>9.2f}"
+            )
+
+            if options['live']:
+                raw_latencies.append(self._time_generation(text))
+                clean_latencies.append(self._time_generation(jd['text'], jd['keywords']))
+
+        reduction = 100 * (total_before - total_after) / total_before if total_before else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"\nTotal: {total_before} -> {total_after} tokens ({reduction:.1f}% fewer input tokens)"
+        ))
+        if options['live']:
+            self.stdout.write(
+                f"End-to-end generation, median: raw {statistics.median(raw_latencies):.2f}s, "
+                f"preprocessed {statistics.median(clean_latencies):.2f}s"
+            )
+
+    def _time_generation(self, job_description, keywords=None):
+        from resume_parser.cover_letter_generator import generate_cover_letter_gemini
+
+        start = time.perf_counter()
+        generate_cover_letter_gemini(
+            resume_data=SAMPLE_RESUME,
+            job_description=job_description,
+            role='Software Engineer',
+            jd_keywords=keywords,
+        )
+        return time.perf_counter() - start
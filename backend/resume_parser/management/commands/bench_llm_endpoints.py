@@ -0,0 +1,190 @@
+"""
+Management command to benchmark the LLM-backed endpoints end to end.
+
+Drives upload_resume, generate_cover_letter and chat_with_ai_assistant for
+every sample resume (rendered to PDF) and reports latency per endpoint and
+which cascade tier served each call.
+
+Use --mode record once with a Gemini key to capture a cassette, then
+--mode replay to rerun offline and deterministically (see cassette.py). No
+cassettes are shipped, so replay refuses to run until a set is recorded;
+--latency recorded replays with the original upstream latencies. All rows
+are created inside a transaction that is rolled back, and uploads go to a
+temporary MEDIA_ROOT.
+"""
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from resume_parser import cassette, views
+
+BENCH_DATA = Path(__file__).resolve().parents[2] / 'bench_data'
+
+CHAT_MESSAGE = 'Summarize my strongest skills for a software role in three bullet points.'
+
+PDF_LINES_PER_PAGE = 60
+PDF_LINE_WIDTH = 95
+
+
+class Rollback(Exception):
+    pass
+
+
+def text_to_pdf(text: str) -> bytes:
+    """Render plain text as a minimal Helvetica PDF that pdfplumber can read back."""
+    lines = []
+    for line in text.splitlines():
+        while len(line) > PDF_LINE_WIDTH:
+            cut = line[:PDF_LINE_WIDTH].rfind(' ')
+            cut = cut if cut > 0 else PDF_LINE_WIDTH
+            lines.append(line[:cut])
+            line = line[cut:].lstrip()
+        lines.append(line)
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    def escape(line):
+        raw = line.encode('cp1252', errors='replace')
+        return raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+    # 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>']
+    page_refs = []
+    for page in pages:
+        stream = b'BT /F1 10 Tf 12 TL 50 800 Td ' + b''.join(b'(' + escape(l) + b') Tj T* ' for l in page) + b'ET'
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        page_refs.append(len(objects) + 1)
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects)))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % ref for ref in page_refs), len(page_refs))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[max(0, round(0.95 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark upload, cover letter and chat endpoints (live, record or replay Gemini calls)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['live', 'record', 'replay'], default='replay')
+        parser.add_argument('--cassette-dir', default=settings.LLM_CASSETTE_DIR,
+                            help='Where recorded responses are stored')
+        parser.add_argument('--latency', choices=['instant', 'recorded'], default='instant',
+                            help='Replay instantly or with the recorded upstream latency')
+        parser.add_argument('--resumes', default=str(BENCH_DATA / 'resumes'), help='Directory of .txt resumes')
+        parser.add_argument('--jobs', default=str(BENCH_DATA / 'job_descriptions'),
+                            help='Directory of .txt job descriptions')
+        parser.add_argument('--repeat', type=int, default=1, help='Passes over the samples')
+        parser.add_argument('--chunked', choices=['auto', 'always', 'never'], default=settings.RESUME_CHUNKED_PARSE,
+                            help='Section-chunked concurrent parsing (RESUME_CHUNKED_PARSE)')
+
+    def handle(self, *args, **options):
+        resumes = sorted(Path(options['resumes']).glob('*.txt'))
+        jobs = sorted(Path(options['jobs']).glob('*.txt'))
+        if not resumes or not jobs:
+            raise CommandError('Need at least one sample resume and one job description')
+
+        if options['mode'] == 'replay' and not cassette.recorded_count(options['cassette_dir']):
+            raise CommandError(
+                f"No recorded responses in {options['cassette_dir']}. Run with --mode record "
+                f"(GEMINI_API_KEY set) once to record them, then replay."
+            )
+
+        cassette_mode = '' if options['mode'] == 'live' else options['mode']
+        overrides = {
+            'LLM_CASSETTE_MODE': cassette_mode,
+            'LLM_CASSETTE_DIR': options['cassette_dir'],
+            'LLM_CASSETTE_LATENCY': options['latency'],
+            'RESUME_CHUNKED_PARSE': options['chunked'],
+        }
+
+        latencies = {'upload': [], 'cover_letter': [], 'chat': []}
+        served = {name: Counter() for name in latencies}
+        failures = Counter()
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root, **overrides):
+            try:
+                with transaction.atomic():
+                    user = get_user_model().objects.create_user(email='bench@coverfolio.invalid')
+                    for _ in range(options['repeat']):
+                        for index, path in enumerate(resumes):
+                            job = jobs[index % len(jobs)]
+                            self._run_sample(user, path, job, latencies, served, failures)
+                    raise Rollback()
+            except Rollback:
+                pass
+
+        self.stdout.write(f"\n{'endpoint':<14}{'calls':>6}{'median s':>10}{'p95 s':>8}  served by")
+        for name, values in latencies.items():
+            if not values:
+                continue
+            tiers = ', '.join(f"{model} x{count}" for model, count in served[name].most_common())
+            self.stdout.write(
+                f"{name:<14}{len(values):>6}{statistics.median(values):>10.3f}{_p95(values):>8.3f}  {tiers}"
+            )
+        if failures:
+            self.stdout.write(self.style.WARNING(f"Failures: {dict(failures)}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Mode: {options['mode']} ({options['latency']}), chunked parsing: {options['chunked']}"
+        ))
+
+    def _call(self, name, view, request, user, latencies, served, failures):
+        force_authenticate(request, user=user)
+        start = time.perf_counter()
+        response = view(request)
+        elapsed = time.perf_counter() - start
+        if response.status_code >= 400:
+            failures[name] += 1
+            self.stdout.write(self.style.ERROR(f"  {name}: {response.status_code} {response.data.get('error')}"))
+            return None
+        latencies[name].append(elapsed)
+        served[name][(response.data.get('served_by') or {}).get('model', 'unknown')] += 1
+        return response
+
+    def _run_sample(self, user, resume_path, job_path, latencies, served, failures):
+        factory = APIRequestFactory()
+        self.stdout.write(f"{resume_path.name} + {job_path.name}")
+
+        upload = factory.post('/api/resume/upload/', {
+            'file': SimpleUploadedFile(resume_path.stem + '.pdf', text_to_pdf(resume_path.read_text()),
+                                       content_type='application/pdf'),
+        }, format='multipart')
+        response = self._call('upload', views.upload_resume, upload, user, latencies, served, failures)
+        if response is None:
+            return
+        resume_id = response.data['resume']['id']
+
+        generate = factory.post('/api/resume/generate-cover-letter/', {
+            'resume_id': resume_id,
+            'role': job_path.stem.replace('_', ' ').title(),
+            'company_name': 'Example Co',
+            'job_description': job_path.read_text(),
+        }, format='json')
+        self._call('cover_letter', views.generate_cover_letter, generate, user, latencies, served, failures)
+
+        chat = factory.post('/api/resume/chat/', {'message': CHAT_MESSAGE, 'resume_id': resume_id}, format='json')
+        self._call('chat', views.chat_with_ai_assistant, chat, user, latencies, served, failures)
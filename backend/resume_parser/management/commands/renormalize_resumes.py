@@ -0,0 +1,61 @@
+"""
+Management command to re-run clean_structured over stored resumes.
+
+Use after changing the normalization rules in portfolio/normalize.py. Rows are
+cleaned across a process pool and written back in bulk (see portfolio/batch.py);
+--dry-run only reports how many rows and fields would change. --rekey also
+recomputes the dedupe keys of portfolio items, e.g. after editing the skill
+taxonomy.
+"""
+from django.core.management.base import BaseCommand
+
+from portfolio.batch import DEFAULT_CHUNK_SIZE, normalize_resumes, rekey_portfolio_items
+from portfolio.models import Portfolio
+from resume_parser.models import Resume
+
+
+class Command(BaseCommand):
+    help = 'Re-normalize Resume.structured_data in bulk (parallel clean_structured + bulk_update)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report diff counts without writing')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per batch')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker processes (default: CPU count, 1 = no pool)')
+        parser.add_argument('--user', type=int, default=None, help='Only resumes of this user id')
+        parser.add_argument('--rekey', action='store_true',
+                            help='Also recompute portfolio item dedupe keys (after key rule or taxonomy changes)')
+
+    def handle(self, *args, **options):
+        queryset = Resume.objects.all()
+        if options['user']:
+            queryset = queryset.filter(user_id=options['user'])
+
+        def progress(stats):
+            self.stdout.write(f"  {stats['rows']} rows, {stats['changed']} changed, {stats['failed']} failed")
+
+        stats = normalize_resumes(
+            queryset,
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            dry_run=options['dry_run'],
+            progress=progress,
+        )
+
+        verb = 'Would change' if stats['dry_run'] else 'Changed'
+        self.stdout.write(f"\n{verb} {stats['changed']} of {stats['rows']} rows "
+                          f"({stats['unchanged']} unchanged, {stats['failed']} failed)")
+        for field, count in sorted(stats['field_changes'].items(), key=lambda item: -item[1]):
+            self.stdout.write(f"  {field:<18}{count:>8}")
+        for error in stats['errors']:
+            self.stdout.write(self.style.ERROR(f"  ✗ resume {error['resume_id']}: {error['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['rows']} rows in {stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/sec)"
+        ))
+
+        if options['rekey']:
+            portfolios = Portfolio.objects.filter(user_id=options['user']) if options['user'] else None
+            changed = rekey_portfolio_items(portfolios, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+            self.stdout.write(f"\n{verb} {sum(changed.values())} dedupe keys")
+            for model_name, count in changed.items():
+                self.stdout.write(f"  {model_name:<18}{count:>8}")
@@ -0,0 +1,274 @@
+"""
+Local heuristic resume parser (no LLM).
+
+Produces the same shape as the Gemini Resume schema from plain extracted text
+using section headings, dates and bullets. It is much rougher than Gemini; it
+is the last tier of the parse cascade (see cascade.py) so an upload still
+gets a usable portfolio when every model is overloaded, and it backs the
+reparse_resumes command.
+"""
+import re
+from typing import Any, Dict, List
+
+from portfolio.normalize import clean_email, clean_phone, clean_url
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?<!\w)(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}(?!\w)")
+LINKEDIN = re.compile(r"(?i)(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[\w\-/%]+")
+GITHUB = re.compile(r"(?i)(?:https?://)?(?:www\.)?github\.com/[\w\-]+")
+
+BULLET = re.compile(r"^\s*[-*•▪‣●■◦]\s*")
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE_RANGE = re.compile(
+    rf"(?i)(?:{MONTH}\s+)?(?:19|20)\d{{2}}\s*(?:-|–|—|to)\s*(?:(?:{MONTH}\s+)?(?:19|20)\d{{2}}|present|current|now)"
+    rf"|(?:{MONTH}\s+)?(?:19|20)\d{{2}}"
+)
+
+SECTION_ALIASES = {
+    'education': ('education', 'academic background', 'academics'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'internships', 'internship experience'),
+    'projects': ('projects', 'personal projects', 'academic projects', 'selected projects', 'project experience'),
+    'skills': ('skills', 'technical skills', 'technologies', 'core competencies', 'skills & interests',
+               'skills and interests', 'tools'),
+    'extracurriculars': ('extracurriculars', 'extracurricular activities', 'activities', 'leadership',
+                         'volunteering', 'volunteer experience', 'involvement', 'achievements', 'awards',
+                         'honors', 'honors & awards', 'certifications'),
+}
+HEADING_TO_SECTION = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+DEGREE = re.compile(
+    r"(?i)\b(bachelor|master|b\.?\s?s\.?c?|m\.?\s?s\.?c?|b\.?\s?a\.?|m\.?\s?a\.?|b\.?\s?tech|m\.?\s?tech|b\.?\s?e\.?|"
+    r"m\.?\s?b\.?\s?a|ph\.?\s?d|doctor|associate|diploma|high school)\b"
+)
+INSTITUTION = re.compile(r"(?i)\b(university|college|institute|school|academy|polytechnic)\b")
+TECH_LABEL = re.compile(r"(?i)^(technologies|tech stack|stack|tools|built with)\s*[:\-]\s*")
+SKILL_LABEL = re.compile(r"^[A-Za-z &/]{2,30}:\s*")
+SKILL_SPLIT = re.compile(r"\s*[,;|•·]\s*")
+HEADER_SPLIT = re.compile(r"\s+(?:\||–|—|-|@|,)\s+|\s+at\s+")
+
+MAX_SUMMARY_CHARS = 300
+
+# Bullets shorter than this are assumed to fit on one line
+WRAP_MIN_CHARS = 70
+
+
+def _heading(line: str):
+    text = line.strip().rstrip(':').strip().lower()
+    if len(text) > 40:
+        return None
+    return HEADING_TO_SECTION.get(text)
+
+
+def extract_contacts(text: str) -> Dict[str, str]:
+    """Email, phone, LinkedIn and GitHub found anywhere in the text ('' if absent)."""
+    def first(pattern):
+        match = pattern.search(text)
+        return match.group(0).strip() if match else ''
+
+    return {
+        'email': first(EMAIL),
+        'phone': first(PHONE),
+        'linkedin': first(LINKEDIN),
+        'github': first(GITHUB),
+    }
+
+
+def prefill_contact_fields(text: str) -> Dict[str, str]:
+    """
+    Name, email, phone, LinkedIn and GitHub found locally, for the fields the
+    LLM then does not have to produce. Fields not found (or not plausible, e.g.
+    a phone with fewer than 10 digits) are left out.
+    """
+    lines = [line.strip() for line in (text or '').splitlines() if line.strip()]
+    contacts = extract_contacts(text or '')
+    found = {
+        'name': guess_name(split_sections(lines)['header']),
+        'email': clean_email(contacts['email']) if contacts['email'] else '',
+        'phone': contacts['phone'] if clean_phone(contacts['phone']) else '',
+        'linkedin': clean_url(contacts['linkedin']) if contacts['linkedin'] else '',
+        'github': clean_url(contacts['github']) if contacts['github'] else '',
+    }
+    return {field: value for field, value in found.items() if value}
+
+
+def guess_name(header_lines: List[str]) -> str:
+    for line in header_lines[:5]:
+        candidate = line.split('|')[0].strip()
+        if EMAIL.search(candidate) or PHONE.search(candidate) or any(c.isdigit() for c in candidate):
+            continue
+        words = candidate.split()
+        if 1 < len(words) <= 4 and all(w[0].isalpha() for w in words):
+            return candidate.title() if candidate.isupper() else candidate
+    return ''
+
+
+def split_sections(lines: List[str]) -> Dict[str, List[str]]:
+    """Group lines under the section headings they follow ("header" before the first)."""
+    sections = {'header': []}
+    current = 'header'
+    for line in lines:
+        section = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def _continues(bullet: str, line: str) -> bool:
+    """True if ``line`` is the wrapped tail of ``bullet`` rather than a new entry header."""
+    if line[0].islower():
+        return True
+    # Only a bullet that filled the line wraps; headers carry dates or separators
+    return len(bullet) >= WRAP_MIN_CHARS and not DATE_RANGE.search(line) and not HEADER_SPLIT.search(line)
+
+
+def _entries(lines: List[str]) -> List[Dict[str, List[str]]]:
+    """Group lines into entries of header lines followed by bullet lines."""
+    entries = []
+    for line in lines:
+        if BULLET.match(line):
+            if not entries:
+                entries.append({'header': [], 'bullets': []})
+            entries[-1]['bullets'].append(BULLET.sub('', line).strip())
+        elif entries and entries[-1]['bullets'] and _continues(entries[-1]['bullets'][-1], line):
+            entries[-1]['bullets'][-1] += ' ' + line
+        elif entries and not entries[-1]['bullets'] and len(entries[-1]['header']) < 3:
+            entries[-1]['header'].append(line)
+        else:
+            entries.append({'header': [line], 'bullets': []})
+    return entries
+
+
+def _take_dates(lines: List[str]):
+    """Return (date text, header lines with the dates removed)."""
+    dates = ''
+    cleaned = []
+    for line in lines:
+        match = DATE_RANGE.search(line)
+        if match and not dates:
+            dates = match.group(0).strip()
+            line = (line[:match.start()] + line[match.end():]).strip(' ,|–—-')
+        if line:
+            cleaned.append(line)
+    return dates, cleaned
+
+
+def _header_parts(lines: List[str]) -> List[str]:
+    parts = []
+    for line in lines:
+        parts.extend(p.strip() for p in HEADER_SPLIT.split(line) if p.strip())
+    return parts
+
+
+def _summary(bullets: List[str]) -> str:
+    summary = '. '.join(b.rstrip('.') for b in bullets[:2])
+    summary = summary + '.' if summary else ''
+    if len(summary) > MAX_SUMMARY_CHARS:
+        summary = summary[:MAX_SUMMARY_CHARS].rsplit(' ', 1)[0] + '…'
+    return summary
+
+
+def _parse_education(lines: List[str]) -> List[Dict[str, str]]:
+    education = []
+    current = None
+    for line in lines:
+        line = BULLET.sub('', line).strip()
+        dates, rest = _take_dates([line])
+        text = rest[0] if rest else ''
+        is_institution = bool(INSTITUTION.search(text))
+        is_degree = bool(DEGREE.search(text))
+        if current is None or (is_institution and current['institution']) or (
+                is_degree and not is_institution and current['degree']):
+            current = {'degree': '', 'institution': '', 'year': ''}
+            education.append(current)
+        if is_institution and not current['institution']:
+            current['institution'] = text
+        elif is_degree and not current['degree']:
+            current['degree'] = text
+        if dates and not current['year']:
+            current['year'] = dates
+    return [e for e in education if e['degree'] or e['institution']]
+
+
+def _parse_experience(lines: List[str]) -> List[Dict[str, str]]:
+    experience = []
+    for entry in _entries(lines):
+        years, header = _take_dates(entry['header'])
+        parts = _header_parts(header)
+        if not parts:
+            continue
+        experience.append({
+            'company': parts[0],
+            'role': parts[1] if len(parts) > 1 else '',
+            'years': years,
+            'role_summary': _summary(entry['bullets']),
+        })
+    return experience
+
+
+def _parse_projects(lines: List[str]) -> List[Dict[str, Any]]:
+    projects = []
+    for entry in _entries(lines):
+        _, header = _take_dates(entry['header'])
+        technologies = []
+        bullets = []
+        for bullet in entry['bullets']:
+            if TECH_LABEL.match(bullet):
+                technologies.extend(SKILL_SPLIT.split(TECH_LABEL.sub('', bullet)))
+            else:
+                bullets.append(bullet)
+        parts = [p.strip() for p in ' | '.join(header).split('|') if p.strip()]
+        if not parts:
+            continue
+        title = parts[0]
+        for part in parts[1:]:
+            technologies.extend(SKILL_SPLIT.split(TECH_LABEL.sub('', part)))
+        projects.append({
+            'title': title,
+            'description': _summary(bullets),
+            'technologies': [t.strip() for t in technologies if t.strip()],
+        })
+    return projects
+
+
+def _parse_skills(lines: List[str]) -> List[str]:
+    skills = []
+    seen = set()
+    for line in lines:
+        line = SKILL_LABEL.sub('', BULLET.sub('', line))
+        for skill in SKILL_SPLIT.split(line):
+            skill = skill.strip(' .')
+            if skill and len(skill) <= 40 and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills
+
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """
+    Parse resume text into the Resume schema shape without calling an LLM.
+
+    Args:
+        text: Text extracted from the resume PDF
+
+    Returns:
+        Dict with name, email, phone, linkedin, github, education, experience,
+        projects, skills and extracurriculars (empty values when not found)
+    """
+    lines = [line.strip() for line in (text or '').splitlines() if line.strip()]
+    sections = split_sections(lines)
+
+    parsed = {'name': guess_name(sections['header'] or lines)}
+    parsed.update(extract_contacts(text or ''))
+    parsed.update({
+        'education': _parse_education(sections.get('education', [])),
+        'experience': _parse_experience(sections.get('experience', [])),
+        'projects': _parse_projects(sections.get('projects', [])),
+        'skills': _parse_skills(sections.get('skills', [])),
+        'extracurriculars': [BULLET.sub('', line).strip() for line in sections.get('extracurriculars', [])],
+    })
+    return parsed
@@ -1,5 +1,4 @@
-from google import genai
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, create_model
 from typing import List, Optional
 import pdfplumber
 import json
@@ -38,6 +37,43 @@ class Resume(BaseModel):
     extracurriculars: List[str]
 
 
+# Sub-schemas for section-chunked parsing (see parse_sections_concurrently);
+# their fields together make up Resume.
+
+class HeaderSection(BaseModel):
+    name: str = Field(description="Full name of the candidate")
+    email: str = Field(description="Email address")
+    phone: str = Field(description="Phone number")
+    linkedin: str = Field(description="LinkedIn profile URL")
+    github: str = Field(description="GitHub profile URL")
+    extracurriculars: List[str]
+
+class EducationSection(BaseModel):
+    education: List[Education]
+
+class ExperienceSection(BaseModel):
+    experience: List[Experience]
+
+class ProjectsSection(BaseModel):
+    projects: List[Project]
+
+class SkillsSection(BaseModel):
+    skills: List[str]
+
+# Local section name -> (chunk, sub-schema). Sections without their own
+# chunk (header, activities, anything unrecognised) go to the header chunk.
+SECTION_CHUNKS = {
+    'education': ('education', EducationSection),
+    'experience': ('experience', ExperienceSection),
+    'projects': ('projects', ProjectsSection),
+    'skills': ('skills', SkillsSection),
+}
+HEADER_CHUNK = ('header and other sections', HeaderSection)
+
+# Filled locally when the regexes find them (see parser.prefill_contact_fields)
+CONTACT_FIELDS = frozenset({'name', 'email', 'phone', 'linkedin', 'github'})
+
+
 # ================================================================
 # 2) Extract text from PDF
 # ================================================================
@@ -56,45 +92,189 @@ def extract_text_from_pdf(pdf_path: str) -> str:
 # 3) Gemini structured-output resume parsing
 # ================================================================
 
-import time
-from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+
+from .cascade import run_cascade
+from .gemini_client import generate_text
+from .json_repair import JSONRepairError, repair_json, validate_sections
+from .parser import parse_resume_text, prefill_contact_fields, split_sections
+
 
-def call_gemini_with_retry(client, model, prompt, schema, max_retries=5):
+def call_gemini_structured(model, prompt, schema, api_key=None):
     """
-    Handles 503 UNAVAILABLE + 429 rate limits with exponential backoff.
+    One structured-output Gemini call; returns the response text (JSON
+    matching ``schema``). Retries and fallbacks are handled by run_cascade.
     """
-    delay = 2  # seconds
+    return generate_text(
+        model=model,
+        contents=prompt,
+        config={
+            "response_mime_type": "application/json",
+            "response_json_schema": schema,
+        },
+        api_key=api_key,
+    )
+
 
-    for attempt in range(1, max_retries + 1):
+@lru_cache(maxsize=None)
+def reduced_schema(schema_model, prefilled_fields: frozenset):
+    """
+    ``schema_model`` without the fields we already have locally (None if no
+    field is left), so the LLM does not spend output tokens on them.
+    """
+    fields = {
+        name: (info.annotation, info)
+        for name, info in schema_model.model_fields.items()
+        if name not in prefilled_fields
+    }
+    if not fields:
+        return None
+    if len(fields) == len(schema_model.model_fields):
+        return schema_model
+    return create_model(f"{schema_model.__name__}Remaining", **fields)
+
+
+def parse_structured(model, prompt, schema_model, api_key=None) -> dict:
+    """
+    Call Gemini for ``schema_model`` and validate the response, tolerating
+    malformed output.
+
+    Invalid JSON (truncated at the token limit, trailing commas, stray quotes)
+    goes through repair_json(); the sections that survive are kept and one
+    follow-up call asks only for the missing ones. Sections the follow-up does
+    not deliver either are left empty, so a partial parse is still returned;
+    only output with no usable section at all raises, so run_cascade moves on
+    to the next tier.
+    """
+    response_text = call_gemini_structured(model, prompt, schema_model.model_json_schema(), api_key=api_key)
+    try:
+        return schema_model.model_validate_json(response_text).model_dump()
+    except ValidationError:
+        pass
+
+    try:
+        data, truncated = repair_json(response_text)
+    except JSONRepairError:
+        data, truncated = None, False
+    valid, missing = validate_sections(data, schema_model, truncated)
+    if missing:
+        print(f"⚠️ Structured output {'truncated' if truncated else 'malformed'}; "
+              f"re-requesting {sorted(missing)} only")
+        remaining = reduced_schema(schema_model, frozenset(valid))
+        retry_prompt = f"{prompt}\nOnly extract these fields: {', '.join(sorted(missing))}.\n"
+        retry_text = call_gemini_structured(model, retry_prompt, remaining.model_json_schema(), api_key=api_key)
         try:
-            return client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_json_schema": schema,
-                },
-            )
-
-        except (ResourceExhausted, ServiceUnavailable) as e:
-            print(f"⚠️ Gemini overload attempt {attempt}/{max_retries}: {e}")
-            
-            if attempt == max_retries:
-                raise e  # rethrow final attempt
-
-            time.sleep(delay)
-            delay *= 2  # exponential backoff 2s → 4s → 8s → 16s
-
-        except Exception as e:
-            print("❌ Unexpected Gemini error:", e)
-            raise e
-
-
-def parse_resume_gemini(pdf_path: str, api_key: str) -> dict:
+            data, truncated = repair_json(retry_text)
+        except JSONRepairError:
+            data, truncated = None, False
+        recovered, still_missing = validate_sections(data, remaining, truncated)
+        valid.update(recovered)
+        if not valid:
+            raise ValueError("Structured output has no usable section")
+        if still_missing:
+            print(f"⚠️ Follow-up did not return {sorted(still_missing)}; keeping the partial result")
+            valid = {**empty_fields(schema_model, still_missing), **valid}
+    else:
+        print("↪️ Repaired malformed structured output")
+    return schema_model.model_validate(valid).model_dump()
+
+
+def empty_fields(schema_model, names=None) -> dict:
+    """Empty values ('' or []) for the fields of ``schema_model`` (or only ``names``)."""
+    return {
+        field: '' if info.annotation is str else []
+        for field, info in schema_model.model_fields.items()
+        if names is None or field in names
+    }
+
+
+def split_into_chunks(resume_text: str, prefilled=None):
+    """
+    Group the resume text by detected section headings into
+    {chunk name: (text, sub-schema)}; sections that share a chunk are joined.
+    Sub-schemas leave out ``prefilled`` fields, and the top of the resume is
+    only sent when a contact field is still missing.
+    """
+    prefilled_fields = frozenset(prefilled or ())
+    lines = [line for line in resume_text.splitlines() if line.strip()]
+    chunks = {}
+    for section, section_lines in split_sections(lines).items():
+        if not section_lines:
+            continue
+        name, model = SECTION_CHUNKS.get(section, HEADER_CHUNK)
+        model = reduced_schema(model, prefilled_fields)
+        if model is None or (section == 'header' and CONTACT_FIELDS <= prefilled_fields):
+            continue
+        text, _ = chunks.get(name, ('', model))
+        # Keep a heading so the model knows what the lines are
+        heading = [] if section == 'header' else [section.upper()]
+        chunks[name] = ('\n'.join([text] + heading + section_lines).strip(), model)
+    return chunks
+
+
+def should_chunk(resume_text: str, chunks) -> bool:
+    mode = settings.RESUME_CHUNKED_PARSE
+    if mode == 'never' or len(chunks) < 2:
+        return False
+    return mode == 'always' or len(resume_text) >= settings.RESUME_CHUNK_MIN_CHARS
+
+
+def _parse_chunk(model, name, text, schema_model, api_key):
+    try:
+        prompt = f"""
+Please extract the {name} of a resume from the text below.
+
+Follow the schema strictly. Use empty strings or empty lists for anything not present.
+
+Resume Text ({name}):
+{text}
+"""
+        return parse_structured(model, prompt, schema_model, api_key=api_key)
+    finally:
+        # Worker threads get their own DB connection (cache, key pool); don't leak it
+        connection.close()
+
+
+def parse_sections_concurrently(model, chunks, prefilled=None, api_key=None) -> dict:
+    """
+    Parse each chunk against its sub-schema in parallel and merge the parts
+    (and the ``prefilled`` fields) into one Resume dict. Output latency grows
+    with the JSON each call has to produce, so several small calls finish well
+    before one large one.
+    """
+    merged = empty_fields(Resume)
+    merged.update(prefilled or {})
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [
+            pool.submit(_parse_chunk, model, name, text, schema_model, api_key)
+            for name, (text, schema_model) in chunks.items()
+        ]
+        for future in futures:
+            merged.update(future.result())
+    return Resume.model_validate(merged).model_dump()
+
+
+def parse_resume_gemini(pdf_path: str, api_key: str = None):
+    """
+    Parse a resume PDF down the 'parse' cascade (see cascade.py).
+
+    Contact fields the regexes find are filled locally and left out of the
+    schema; the LLM only produces them when they are missing. Long resumes
+    (RESUME_CHUNKED_PARSE / RESUME_CHUNK_MIN_CHARS) are split by section and
+    the sections are parsed concurrently.
+
+    Returns:
+        (structured data dict, served_by dict naming the tier that produced it)
+    """
     resume_text = extract_text_from_pdf(pdf_path)
 
-    client = genai.Client(api_key=api_key)
-    schema = Resume.model_json_schema()
+    prefilled = prefill_contact_fields(resume_text)
+    print(f"Contact fields prefilled locally: {sorted(prefilled)}")
+    schema_model = reduced_schema(Resume, frozenset(prefilled))
 
     prompt = f"""
 Please extract structured resume information from the text below.
@@ -105,17 +285,16 @@ Resume Text:
 {resume_text}
 """
 
-    # ---- NEW LINE: using retry-safe wrapper ----
-    response = call_gemini_with_retry(
-        client,
-        model="gemini-2.5-flash-lite",
-        prompt=prompt,
-        schema=schema,
-        max_retries=5
-    )
+    chunks = split_into_chunks(resume_text, prefilled)
+    chunked = should_chunk(resume_text, chunks)
+
+    def call_model(model):
+        if chunked:
+            return parse_sections_concurrently(model, chunks, prefilled, api_key=api_key)
+        parsed = parse_structured(model, prompt, schema_model, api_key=api_key)
+        return Resume.model_validate({**parsed, **prefilled}).model_dump()
 
-    resume_obj = Resume.model_validate_json(response.text)
-    return resume_obj.model_dump()
+    return run_cascade('parse', call_model, local=lambda: parse_resume_text(resume_text))
 
 
 # ================================================================
@@ -127,5 +306,6 @@ if __name__ == "__main__":
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables")
-    result = parse_resume_gemini("RahasyaBarkurResume.pdf", api_key)
+    result, served_by = parse_resume_gemini("RahasyaBarkurResume.pdf", api_key)
     print(json.dumps(result, indent=2))
+    print("Served by:", served_by)
@@ -0,0 +1,153 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+
+A double-clicked "Generate" or a frontend retry can put two or three identical
+Gemini calls in flight at once. The first caller for a fingerprint becomes the
+leader and makes the upstream call; everyone else who arrives while it is still
+running waits and gets the leader's result. Coordination goes through the
+Django cache (see CACHES in settings), so it works across gunicorn workers
+when the cache is shared (database/redis), not only within one process.
+
+Results are kept only long enough for waiting followers to pick them up; this
+is not a response cache, a call made after the leader finished goes upstream.
+"""
+import hashlib
+import json
+import pickle
+import time
+import uuid
+
+from django.core.cache import cache
+
+# How long a leader may hold a fingerprint. Followers stop waiting after this
+# and make the call themselves, so a crashed worker cannot wedge a key.
+LOCK_TIMEOUT = 120
+
+# How long a finished result stays readable by followers that are polling.
+RESULT_TTL = 30
+
+POLL_INTERVAL = 0.2
+
+
+class SingleFlightError(Exception):
+    """
+    Raised in followers when the leader's call failed with an error that
+    could not be passed through the cache as it was. Carries the leader's
+    error type (``module.QualifiedName``) and its ``code`` attribute, if any.
+    """
+
+    def __init__(self, message, error_type=None, code=None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.code = code
+
+
+def fingerprint(*parts) -> str:
+    """Stable SHA-256 over JSON-serializable parts (model, prompt, config...)."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _lock_key(key):
+    return f"singleflight:lock:{key}"
+
+
+def _result_key(key, token):
+    return f"singleflight:result:{key}:{token}"
+
+
+def single_flight(key: str, fn, timeout: int = LOCK_TIMEOUT):
+    """
+    Run ``fn()`` once for all concurrent callers sharing ``key``.
+
+    Args:
+        key: Fingerprint identifying identical calls
+        fn: Zero-argument callable making the upstream call; its return value
+            must be picklable (it is passed to followers through the cache)
+        timeout: Max seconds to wait on another caller before calling fn() directly
+
+    Returns:
+        The return value of fn(), from this caller or from the leader
+    """
+    deadline = time.monotonic() + timeout
+
+    while True:
+        token = uuid.uuid4().hex
+        try:
+            acquired = cache.add(_lock_key(key), token, timeout)
+        except Exception:
+            # Cache unavailable (e.g. cache table not created): don't block the call
+            return fn()
+
+        if acquired:
+            return _lead(key, token, fn, timeout)
+
+        leader = cache.get(_lock_key(key))
+        if leader is None:
+            continue  # leader finished between add() and get(); try again
+
+        outcome = _wait_for(key, leader, deadline)
+        if outcome is not None:
+            state, value = outcome
+            if state == 'ok':
+                return value
+            raise _follower_error(value)
+
+        if time.monotonic() >= deadline:
+            return fn()
+        # Leader went away without publishing a result (crashed); try to lead.
+
+
+def _lead(key, token, fn, timeout):
+    try:
+        value = fn()
+    except Exception as e:
+        cache.set(_result_key(key, token), ('error', _shareable_error(e)), RESULT_TTL)
+        raise
+    else:
+        cache.set(_result_key(key, token), ('ok', value), RESULT_TTL)
+        return value
+    finally:
+        # Only release the lock if it is still ours (it may have expired and
+        # been taken by another caller in the meantime).
+        if cache.get(_lock_key(key)) == token:
+            cache.delete(_lock_key(key))
+
+
+def _shareable_error(exc):
+    """
+    What followers need to fail the way the leader did: the exception
+    itself when it survives pickling (the cache pickles values), else its
+    type, message and code.
+    """
+    try:
+        if type(pickle.loads(pickle.dumps(exc))) is type(exc):
+            return {'exception': exc}
+    except Exception:
+        pass
+    error_type = type(exc)
+    return {
+        'error_type': f"{error_type.__module__}.{error_type.__qualname__}",
+        'message': str(exc),
+        'code': getattr(exc, 'code', None),
+    }
+
+
+def _follower_error(error) -> Exception:
+    if 'exception' in error:
+        return error['exception']
+    return SingleFlightError(error['message'], error_type=error['error_type'], code=error['code'])
+
+
+def _wait_for(key, leader, deadline):
+    """Poll for the leader's result; None if the leader disappeared or we timed out."""
+    result_key = _result_key(key, leader)
+    while time.monotonic() < deadline:
+        outcome = cache.get(result_key)
+        if outcome is not None:
+            return outcome
+        if cache.get(_lock_key(key)) != leader:
+            # Lock released: the result is either there now or never will be.
+            return cache.get(result_key)
+        time.sleep(POLL_INTERVAL)
+    return None
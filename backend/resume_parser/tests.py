@@ -0,0 +1,515 @@
+import json
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from google.genai import errors as genai_errors
+from pydantic import BaseModel
+from rest_framework.test import APIClient
+
+from .cascade import cascade_metrics, is_transient, run_cascade
+from .cassette import CassetteMiss
+from .gemini_client import generate_text
+from .idempotency import PROCESSING_TIMEOUT
+from .jd_preprocessor import ELLIPSIS, _truncate_words, preprocess_job_description
+from .json_repair import JSONRepairError, repair_json, validate_sections
+from .key_pool import KeyPoolExhausted, call_with_key, key_pool_metrics
+from .llm_scheduler import LLMOverloaded, llm_slot, scheduler_metrics
+from .models import CoverLetter, IdempotencyRecord
+from .parser import prefill_contact_fields
+from .resume_parser_gemini import (
+    Project, Resume, parse_resume_gemini, parse_sections_concurrently, parse_structured, reduced_schema,
+    should_chunk, split_into_chunks,
+)
+from .single_flight import SingleFlightError, _lock_key, _result_key, _shareable_error, single_flight
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+BENCH_DATA = Path(__file__).resolve().parent / 'bench_data'
+
+
+class JobDescriptionPreprocessTests(SimpleTestCase):
+    def make_posting(self, count):
+        return "\n".join([
+            "Requirements:",
+            *(f"- {i} years of experience with Python service number {i}" for i in range(count)),
+            "",
+            "Benefits:",
+            "- Unlimited PTO and parental leave",
+        ])
+
+    def test_trimmed_text_stays_within_budget(self):
+        for budget in (20, 60, 200):
+            with self.subTest(budget=budget):
+                result = preprocess_job_description(self.make_posting(40), token_budget=budget)
+                self.assertLessEqual(len(result['text']), budget * 4)
+                self.assertLessEqual(result['final_tokens'], budget)
+                self.assertNotIn('PTO', result['text'])
+
+    def test_truncation_leaves_room_for_the_ellipsis(self):
+        for max_chars in (10, 41, 42, 43):
+            with self.subTest(max_chars=max_chars):
+                text = _truncate_words("word " * 100, max_chars)
+                self.assertTrue(text.endswith(ELLIPSIS))
+                self.assertLessEqual(len(text), max_chars)
+
+    def test_requirements_only_come_from_kept_lines(self):
+        result = preprocess_job_description(self.make_posting(40), token_budget=60)
+        self.assertTrue(result['requirements'])
+        for requirement in result['requirements']:
+            self.assertIn(requirement, result['text'])
+        self.assertEqual(result['removed']['boilerplate_sections'], 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def follow(self, outcome):
+        """single_flight() while another caller leads and has published ``outcome``."""
+        cache.add(_lock_key('call'), 'leader')
+        cache.set(_result_key('call', 'leader'), outcome)
+        return single_flight('call', lambda: self.fail('followers must not call upstream'))
+
+    def test_follower_gets_the_leaders_result(self):
+        self.assertEqual(self.follow(('ok', 'letter')), 'letter')
+
+    def test_follower_raises_the_leaders_error_type(self):
+        with self.assertRaises(ValueError):
+            self.follow(('error', _shareable_error(ValueError('bad output'))))
+
+    def test_errors_that_do_not_pickle_keep_type_and_code(self):
+        cases = [
+            (genai_errors.ClientError(400, {'error': {'message': 'bad', 'status': 'INVALID_ARGUMENT'}}), False),
+            (genai_errors.ClientError(429, {'error': {'message': 'slow down', 'status': 'RESOURCE_EXHAUSTED'}}), True),
+            (genai_errors.ServerError(503, {'error': {'message': 'overloaded', 'status': 'UNAVAILABLE'}}), True),
+        ]
+        for leader_error, transient in cases:
+            with self.subTest(code=leader_error.code):
+                cache.clear()
+                with self.assertRaises(SingleFlightError) as raised:
+                    self.follow(('error', _shareable_error(leader_error)))
+                self.assertEqual(raised.exception.code, leader_error.code)
+                self.assertEqual(is_transient(raised.exception), is_transient(leader_error))
+                self.assertEqual(is_transient(raised.exception), transient)
+
+    def test_leader_runs_once_and_releases(self):
+        calls = []
+        self.assertEqual(single_flight('call', lambda: calls.append(1) or 'done'), 'done')
+        self.assertIsNone(cache.get(_lock_key('call')))
+        self.assertEqual(calls, [1])
+
+
+class IdempotencyKeyTests(TestCase):
+    url = '/api/resume/cover-letters/save/'
+    body = {'title': 'Engineer at Acme', 'content': 'Dear Hiring Manager,'}
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='alex@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def save(self, body=None, key='draft-1'):
+        return self.client.post(self.url, body or self.body, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.save()
+        retry = self.save()
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(CoverLetter.objects.count(), 1)
+        # Another key is another request
+        self.save(key='draft-2')
+        self.assertEqual(CoverLetter.objects.count(), 2)
+
+    def test_same_key_with_another_body_is_rejected(self):
+        self.save()
+        response = self.save({**self.body, 'title': 'Something else'})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(CoverLetter.objects.count(), 1)
+
+    def still_processing(self, age):
+        """Leave draft-1 as if its first request were still running, started ``age`` ago."""
+        self.save()
+        IdempotencyRecord.objects.filter(key='draft-1').update(
+            status='processing', response_status=None, response_body=None, created_at=timezone.now() - age
+        )
+
+    def test_retry_while_processing_gets_409(self):
+        self.still_processing(age=PROCESSING_TIMEOUT / 2)
+        response = self.save()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '2')
+
+    def test_abandoned_request_is_taken_over(self):
+        self.still_processing(age=PROCESSING_TIMEOUT * 2)
+        self.assertEqual(self.save().status_code, 201)
+        self.assertEqual(IdempotencyRecord.objects.get(key='draft-1').status, 'completed')
+
+
+@override_settings(CACHES=LOCMEM_CACHE, LLM_MAX_CONCURRENCY=1, LLM_PER_USER_CONCURRENCY=2,
+                   LLM_QUEUE_MAX_DEPTH=16, LLM_QUEUE_MAX_WAIT_SECONDS=10)
+class LLMSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.admitted = []
+        self.threads = []
+
+    def tearDown(self):
+        for thread in self.threads:
+            thread.join(10)
+
+    def wait_for_depth(self, depth):
+        deadline = time.monotonic() + 5
+        while scheduler_metrics()['queue_depth'] < depth:
+            self.assertLess(time.monotonic(), deadline, f'queue never reached {depth}')
+            time.sleep(0.01)
+
+    def enqueue(self, name, user_id, task='chat'):
+        def run():
+            with llm_slot(SimpleNamespace(pk=user_id), task):
+                self.admitted.append(name)
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        self.wait_for_depth(len(self.threads))
+
+    def test_busy_user_cannot_starve_another(self):
+        with ExitStack() as holding:
+            holding.enter_context(llm_slot(SimpleNamespace(pk=99), 'parse'))
+            for name in ('a1', 'a2', 'a3'):
+                self.enqueue(name, user_id=1)
+            self.enqueue('b1', user_id=2)
+        for thread in self.threads:
+            thread.join(10)
+        self.assertEqual(self.admitted, ['a1', 'b1', 'a2', 'a3'])
+        self.assertEqual(scheduler_metrics()['admitted']['chat'], 4)
+
+    @override_settings(LLM_QUEUE_MAX_DEPTH=2)
+    def test_low_priority_calls_are_shed_first(self):
+        with ExitStack() as holding:
+            holding.enter_context(llm_slot(SimpleNamespace(pk=99), 'parse'))
+            self.enqueue('parse', user_id=1, task='parse')
+            # chat may only fill half of the queue
+            with self.assertRaises(LLMOverloaded) as raised:
+                with llm_slot(SimpleNamespace(pk=2), 'chat'):
+                    pass
+            self.assertGreaterEqual(raised.exception.retry_after, 1)
+        for thread in self.threads:
+            thread.join(10)
+        metrics = scheduler_metrics()
+        self.assertEqual(metrics['shed']['chat'], 1)
+        self.assertEqual(self.admitted, ['parse'])
+
+    def test_error_while_waiting_leaves_no_queue_entry(self):
+        with ExitStack() as holding:
+            holding.enter_context(llm_slot(SimpleNamespace(pk=99), 'parse'))
+            with mock.patch('resume_parser.llm_scheduler.time.sleep', side_effect=ConnectionError('cache down')):
+                with llm_slot(SimpleNamespace(pk=1), 'chat'):
+                    self.admitted.append('chat')
+            self.assertEqual(self.admitted, ['chat'])
+            self.assertEqual(scheduler_metrics()['queue_depth'], 0)
+
+    def test_cache_outage_runs_unscheduled_and_is_counted(self):
+        before = scheduler_metrics()['unscheduled']['chat']
+        with mock.patch('resume_parser.llm_scheduler._locked_state', side_effect=ConnectionError('cache down')):
+            with llm_slot(SimpleNamespace(pk=1), 'chat'):
+                self.admitted.append('chat')
+        self.assertEqual(self.admitted, ['chat'])
+        self.assertEqual(scheduler_metrics()['unscheduled']['chat'], before + 1)
+
+
+def rate_limited():
+    return genai_errors.ClientError(429, {'error': {'message': 'quota', 'status': 'RESOURCE_EXHAUSTED'}})
+
+
+@override_settings(CACHES=LOCMEM_CACHE, GEMINI_API_KEYS=['key-aaaa', 'key-bbbb'], GEMINI_KEY_RPM=0,
+                   GEMINI_KEY_RATE_LIMIT_COOLDOWN_SECONDS=60, LLM_CASCADE={'chat': ['flash', 'pro']})
+class KeyPoolTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        # Clients are stand-ins: the "client" passed to the call is the key itself
+        patcher = mock.patch('resume_parser.key_pool._client', side_effect=lambda api_key: api_key)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def metrics(self):
+        return {key['label']: key for key in key_pool_metrics()['keys']}
+
+    def test_rate_limited_key_is_benched_for_that_model(self):
+        def call(api_key):
+            if api_key == 'key-aaaa':
+                raise rate_limited()
+            return api_key
+
+        used = {call_with_key(call, model='flash') for _ in range(4)}
+        self.assertEqual(used, {'key-bbbb'})
+        metrics = self.metrics()
+        self.assertEqual(metrics['…aaaa']['rate_limited'], 1)
+        self.assertIn('flash', metrics['…aaaa']['models_cooling_down'])
+        self.assertEqual(metrics['…bbbb']['successes'], 4)
+        self.assertEqual(metrics['…bbbb']['in_flight'], 0)
+        # Other models still use the key, now the one with fewer calls this minute
+        self.assertEqual(call_with_key(lambda api_key: api_key, model='pro'), 'key-aaaa')
+
+    def test_pool_exhausted_when_every_key_is_benched(self):
+        def call(api_key):
+            raise rate_limited()
+
+        with self.assertRaises(genai_errors.ClientError):
+            call_with_key(call, model='flash')
+        with self.assertRaises(KeyPoolExhausted) as raised:
+            call_with_key(call, model='flash')
+        self.assertGreater(raised.exception.retry_after, 1)
+
+    @override_settings(GEMINI_KEY_RPM=2)
+    def test_per_minute_budget(self):
+        used = [call_with_key(lambda api_key: api_key) for _ in range(4)]
+        self.assertEqual(sorted(used), ['key-aaaa', 'key-aaaa', 'key-bbbb', 'key-bbbb'])
+        with self.assertRaises(KeyPoolExhausted):
+            call_with_key(lambda api_key: api_key)
+
+    def test_least_loaded_key_is_picked(self):
+        seen = []
+
+        def outer(api_key):
+            seen.append(api_key)
+            # While this call is in flight the other key is the less loaded one
+            seen.append(call_with_key(lambda inner_key: inner_key))
+            return api_key
+
+        call_with_key(outer)
+        self.assertEqual(len(set(seen)), 2)
+
+
+def overloaded():
+    return genai_errors.ServerError(503, {'error': {'message': 'overloaded', 'status': 'UNAVAILABLE'}})
+
+
+@override_settings(CACHES=LOCMEM_CACHE, LLM_CASCADE={'parse': ['lite', 'flash', 'local'], 'chat': ['lite', 'flash']},
+                   LLM_TIER_ATTEMPTS=2, LLM_RETRY_BACKOFF_SECONDS=0)
+class CascadeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+
+    def model(self, failures):
+        """call_model raising failures[model] (an exception or a factory) for the models listed."""
+        def call(model):
+            self.calls.append(model)
+            if model in failures:
+                raise failures[model]()
+            return f'from {model}'
+        return call
+
+    def test_transient_errors_are_retried_then_fall_back(self):
+        result, served = run_cascade('chat', self.model({'lite': overloaded}))
+        self.assertEqual(result, 'from flash')
+        self.assertEqual(self.calls, ['lite', 'lite', 'flash'])
+        self.assertEqual((served['model'], served['fallback'], served['attempts']), ('flash', True, 3))
+
+    def test_other_errors_fall_back_at_once(self):
+        result, _ = run_cascade('chat', self.model({'lite': lambda: ValueError('invalid output')}))
+        self.assertEqual(result, 'from flash')
+        self.assertEqual(self.calls, ['lite', 'flash'])
+
+    def test_local_tier_and_last_error(self):
+        failing = self.model({'lite': overloaded, 'flash': overloaded})
+        result, served = run_cascade('parse', failing, local=lambda: 'parsed locally')
+        self.assertEqual((result, served['model']), ('parsed locally', 'local'))
+        with self.assertRaises(genai_errors.ServerError):
+            run_cascade('chat', failing)
+
+        metrics = cascade_metrics()
+        self.assertEqual(metrics['parse']['served'], {'local': 1})
+        self.assertEqual(metrics['chat']['failed'], 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, LLM_CASSETTE_LATENCY='instant', LLM_CASCADE={'chat': ['flash']})
+class CassetteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def cassette(self, mode):
+        return override_settings(LLM_CASSETTE_MODE=mode, LLM_CASSETTE_DIR=self.directory)
+
+    def test_record_then_replay_without_upstream(self):
+        with self.cassette('record'), \
+                mock.patch('resume_parser.gemini_client.call_with_key', return_value='Hello there') as upstream:
+            self.assertEqual(generate_text(model='flash', contents='Say hello'), 'Hello there')
+        self.assertEqual(upstream.call_count, 1)
+
+        with self.cassette('replay'), mock.patch('resume_parser.gemini_client.call_with_key') as upstream:
+            self.assertEqual(generate_text(model='flash', contents='Say hello'), 'Hello there')
+            with self.assertRaises(CassetteMiss):
+                generate_text(model='flash', contents='Say goodbye')
+        upstream.assert_not_called()
+
+    def test_replay_miss_is_a_clear_503(self):
+        user = get_user_model().objects.create_user(email='alex@example.com')
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.cassette('replay'):
+            response = client.post('/api/resume/chat/', {'message': 'Hi'}, format='json')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('--mode record', response.data['error'])
+
+
+# What a well-behaved model returns for each field, whatever schema asks for it
+MODEL_OUTPUT = {
+    'name': 'Jordan Lee', 'email': 'jordan.lee@example.com', 'phone': '(555) 123-4567',
+    'linkedin': 'linkedin.com/in/jordanlee', 'github': 'github.com/jlee-dev',
+    'education': [{'degree': 'B.S. in Computer Science', 'institution': 'UMass Amherst', 'year': '2016 - 2020'}],
+    'experience': [{'company': 'Acme Payments', 'role': 'Software Engineer', 'years': '2020 - Present',
+                    'role_summary': 'Built billing APIs.'}],
+    'projects': [{'title': 'RateLimiter', 'description': 'Token bucket sidecar.', 'technologies': ['Go']}],
+    'skills': ['Python', 'Go'],
+    'extracurriculars': ['Boston Python meetup'],
+}
+
+
+def structured_reply(model, prompt, schema, api_key=None):
+    return json.dumps({name: MODEL_OUTPUT[name] for name in schema['properties']})
+
+
+class SkillsAndProjects(BaseModel):
+    skills: List[str]
+    projects: List[Project]
+
+
+class StructuredParseTests(SimpleTestCase):
+    def setUp(self):
+        self.resume_text = (BENCH_DATA / 'resumes' / 'backend_engineer.txt').read_text()
+
+    @override_settings(RESUME_CHUNKED_PARSE='auto', RESUME_CHUNK_MIN_CHARS=100_000)
+    def test_auto_chunks_only_long_resumes(self):
+        chunks = split_into_chunks(self.resume_text)
+        self.assertFalse(should_chunk(self.resume_text, chunks))
+        with self.settings(RESUME_CHUNK_MIN_CHARS=100):
+            self.assertTrue(should_chunk(self.resume_text, chunks))
+        with self.settings(RESUME_CHUNKED_PARSE='never', RESUME_CHUNK_MIN_CHARS=100):
+            self.assertFalse(should_chunk(self.resume_text, chunks))
+
+    def test_chunks_merge_into_one_resume(self):
+        prefilled = prefill_contact_fields(self.resume_text)
+        chunks = split_into_chunks(self.resume_text, prefilled)
+        self.assertGreater(len(chunks), 2)
+        with mock.patch('resume_parser.resume_parser_gemini.call_gemini_structured',
+                        side_effect=structured_reply) as call:
+            merged = parse_sections_concurrently('flash', chunks, prefilled)
+        self.assertEqual(call.call_count, len(chunks))
+        for name in ('education', 'experience', 'projects', 'skills'):
+            self.assertEqual(merged[name], MODEL_OUTPUT[name])
+        self.assertEqual(merged['email'], prefilled['email'])
+
+    def test_truncated_output_asks_again_for_missing_sections_only(self):
+        replies = [
+            '{"skills": ["Python", "Go"], "projects": [{"title": "RateLimiter", "descr',
+            json.dumps({'projects': MODEL_OUTPUT['projects']}),
+        ]
+        with mock.patch('resume_parser.resume_parser_gemini.call_gemini_structured', side_effect=replies) as call:
+            parsed = parse_structured('flash', 'prompt', SkillsAndProjects)
+        self.assertEqual(parsed, {'skills': ['Python', 'Go'], 'projects': MODEL_OUTPUT['projects']})
+        retry_schema = call.call_args_list[1].args[2]
+        self.assertEqual(set(retry_schema['properties']), {'projects'})
+
+    def test_unusable_follow_up_keeps_the_partial_result(self):
+        replies = [
+            '{"skills": ["Python", "Go"], "projects": [{"title": "RateLimiter", "descr',
+            '<html>upstream error</html>',
+        ]
+        with mock.patch('resume_parser.resume_parser_gemini.call_gemini_structured', side_effect=replies):
+            parsed = parse_structured('flash', 'prompt', SkillsAndProjects)
+        self.assertEqual(parsed, {'skills': ['Python', 'Go'], 'projects': []})
+
+    def test_output_with_nothing_usable_raises(self):
+        with mock.patch('resume_parser.resume_parser_gemini.call_gemini_structured', return_value='garbage'):
+            with self.assertRaises(ValueError):
+                parse_structured('flash', 'prompt', SkillsAndProjects)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, RESUME_CHUNKED_PARSE='never', LLM_CASCADE={'parse': ['flash', 'local']})
+class ContactPrefillTests(SimpleTestCase):
+    def test_contact_fields_found_locally(self):
+        text = (BENCH_DATA / 'resumes' / 'backend_engineer.txt').read_text()
+        self.assertEqual(prefill_contact_fields(text), {
+            'name': 'Jordan Lee',
+            'email': 'jordan.lee@example.com',
+            'phone': '(555) 123-4567',
+            'linkedin': 'https://linkedin.com/in/jordanlee',
+            'github': 'https://github.com/jlee-dev',
+        })
+        # Nothing plausible found, nothing prefilled
+        self.assertEqual(prefill_contact_fields('Summary\nI like code. Call 123'), {})
+
+    def test_schema_leaves_out_prefilled_fields(self):
+        schema = reduced_schema(Resume, frozenset({'name', 'email'}))
+        self.assertNotIn('name', schema.model_fields)
+        self.assertIn('phone', schema.model_fields)
+        self.assertIs(reduced_schema(Resume, frozenset()), Resume)
+
+    def test_prefilled_fields_are_merged_into_the_result(self):
+        text = (BENCH_DATA / 'resumes' / 'backend_engineer.txt').read_text()
+        with mock.patch('resume_parser.resume_parser_gemini.extract_text_from_pdf', return_value=text), \
+                mock.patch('resume_parser.resume_parser_gemini.call_gemini_structured',
+                           side_effect=structured_reply) as call:
+            parsed, served_by = parse_resume_gemini('resume.pdf')
+        schema = call.call_args.args[2]
+        self.assertFalse(set(schema['properties']) & {'name', 'email', 'phone', 'linkedin', 'github'})
+        self.assertEqual(parsed['github'], 'https://github.com/jlee-dev')
+        self.assertEqual(parsed['skills'], MODEL_OUTPUT['skills'])
+        self.assertEqual(served_by['model'], 'flash')
+
+
+class JSONRepairTests(SimpleTestCase):
+    def test_common_defects(self):
+        cases = [
+            ('```json\n{"a": [1, 2,],}\n```', {'a': [1, 2]}),
+            ('{"title": "The "best" app", "note": "line\nbreak"}', {'title': 'The "best" app', 'note': 'line\nbreak'}),
+            ('{"a": 1}', {'a': 1}),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(repair_json(text), (expected, False))
+
+    def test_truncated_output_is_closed(self):
+        data, truncated = repair_json('{"skills": ["Python", "Go"], "projects": [{"title": "RateLimiter", "descr')
+        self.assertTrue(truncated)
+        self.assertEqual(data, {'skills': ['Python', 'Go'], 'projects': [{'title': 'RateLimiter'}]})
+        self.assertEqual(repair_json('{"a": 1, "b": '), ({'a': 1}, True))
+
+    def test_unrepairable(self):
+        with self.assertRaises(JSONRepairError):
+            repair_json('not json at all')
+
+    def test_sections_are_validated_one_by_one(self):
+        data = {
+            'skills': ['Python', 'Go'],
+            'projects': [
+                {'title': 'RateLimiter', 'description': 'Sidecar.', 'technologies': ['Go']},
+                {'title': 'Broken'},
+            ],
+        }
+        valid, missing = validate_sections(data, SkillsAndProjects)
+        # The invalid project is dropped, the valid one kept
+        self.assertEqual([project.title for project in valid['projects']], ['RateLimiter'])
+        self.assertEqual(missing, set())
+
+        valid, missing = validate_sections(data, SkillsAndProjects, truncated=True)
+        self.assertEqual((set(valid), missing), ({'skills'}, {'projects'}))
+        self.assertEqual(validate_sections(None, SkillsAndProjects), ({}, {'skills', 'projects'}))
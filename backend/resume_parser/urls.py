@@ -8,6 +8,7 @@ urlpatterns = [
     path('<int:resume_id>/delete/', views.delete_resume, name='delete_resume'),
     path('generate-cover-letter/', views.generate_cover_letter, name='generate_cover_letter'),
     path('chat/', views.chat_with_ai_assistant, name='chat_with_ai'),
+    path('metrics/', views.llm_metrics, name='llm_metrics'),
     
     # Cover Letter Draft endpoints
     path('cover-letters/save/', views.save_cover_letter_draft, name='save_cover_letter_draft'),
@@ -12,7 +12,7 @@ import CertificationsSection from './portfolio/CertificationsSection';
 import PublicationsPatentsSection from './portfolio/PublicationsPatentsSection';
 import OthersSection from './portfolio/OthersSection';
 import portfolioService from '../services/portfolio.service';
-import { Portfolio } from '../types/portfolio.types';
+import { PortfolioEditorData } from '../types/portfolio.types';
 
 
 interface Section {
@@ -25,7 +25,7 @@ interface Section {
 const ProfileFormsEditor: React.FC = () => {
  const navigate = useNavigate();
  const [activeSection, setActiveSection] = useState('overview');
- const [portfolio, setPortfolio] = useState<Portfolio | null>(null);
+ const [portfolio, setPortfolio] = useState<PortfolioEditorData | null>(null);
  const [loading, setLoading] = useState(true);
   
  const sections: Section[] = [
@@ -50,7 +50,8 @@ const ProfileFormsEditor: React.FC = () => {
  const loadPortfolio = async () => {
    try {
      setLoading(true);
-     const data = await portfolioService.getPortfolio();
+     // Every section in one request; the section components start from it
+     const data = await portfolioService.getEditorData();
      setPortfolio(data);
    } catch (err: any) {
      // If portfolio doesn't exist (404), that's okay - user can create one
@@ -64,6 +65,12 @@ const ProfileFormsEditor: React.FC = () => {
    }
  };
 
+ // Keep the loaded lists current as sections reload theirs after a change,
+ // so switching back to a section shows its latest items without a request
+ const updateSection = <K extends keyof PortfolioEditorData>(key: K) => (items: PortfolioEditorData[K]) => {
+   setPortfolio((current) => (current ? { ...current, [key]: items } : current));
+ };
+
  // Render the appropriate section component based on activeSection
  const renderSectionContent = () => {
    if (loading) {
@@ -79,25 +86,32 @@ const ProfileFormsEditor: React.FC = () => {
      case 'overview':
        return <div style={{ marginTop: '-32px' }}><PortfolioOverview portfolio={portfolio} onUpdate={loadPortfolio} /></div>;
      case 'projects':
-       return <ProjectsSection portfolioId={portfolio?.id} />;
+       return <ProjectsSection portfolioId={portfolio?.id} initialItems={portfolio?.projects} onItemsChange={updateSection('projects')} />;
      case 'skills':
-       return <SkillsSection />;
+       return <SkillsSection initialItems={portfolio?.skills} onItemsChange={updateSection('skills')} />;
      case 'experience':
-       return <ExperienceSection />;
+       return <ExperienceSection initialItems={portfolio?.experiences} onItemsChange={updateSection('experiences')} />;
      case 'education':
-       return <EducationSection />;
+       return <EducationSection initialItems={portfolio?.education} onItemsChange={updateSection('education')} />;
      case 'certifications':
-       return <CertificationsSection />;
+       return <CertificationsSection initialItems={portfolio?.certifications} onItemsChange={updateSection('certifications')} />;
      case 'publications':
-       return <PublicationsPatentsSection />;
+       return (
+         <PublicationsPatentsSection
+           initialPublications={portfolio?.publications}
+           initialPatents={portfolio?.patents}
+           onPublicationsChange={updateSection('publications')}
+           onPatentsChange={updateSection('patents')}
+         />
+       );
      case 'awards':
-       return <AwardsSection />;
+       return <AwardsSection initialItems={portfolio?.awards} onItemsChange={updateSection('awards')} />;
      case 'hobbies':
-       return <HobbiesSection />;
+       return <HobbiesSection initialItems={portfolio?.hobbies} onItemsChange={updateSection('hobbies')} />;
      case 'contacts':
-       return <ContactsSection />;
+       return <ContactsSection initialItems={portfolio?.contacts} onItemsChange={updateSection('contacts')} />;
      case 'others':
-       return <OthersSection />;
+       return <OthersSection initialItems={portfolio?.others} onItemsChange={updateSection('others')} />;
      default:
        return null;
    }
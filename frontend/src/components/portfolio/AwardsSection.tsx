@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Award, AwardFormData } from '../../types/portfolio.types';
+import { Award, AwardFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const AwardsSection: React.FC = () => {
-  const [awards, setAwards] = useState<Award[]>([]);
-  const [loading, setLoading] = useState(true);
+const AwardsSection: React.FC<EditorSectionProps<Award>> = ({ initialItems, onItemsChange }) => {
+  const [awards, setAwards] = useState<Award[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingAward, setEditingAward] = useState<Award | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -33,7 +33,9 @@ const AwardsSection: React.FC = () => {
   };
 
   useEffect(() => {
-    loadAwards();
+    if (!initialItems) {
+      loadAwards();
+    }
   }, []);
 
   const loadAwards = async () => {
@@ -42,6 +44,7 @@ const AwardsSection: React.FC = () => {
       const data = await portfolioService.listAwards();
       console.log('Loaded awards:', data);
       setAwards(data);
+      onItemsChange?.(data);
     } catch (err: any) {
       console.error('Failed to load awards:', err);
       setError(err.response?.data?.error || 'Failed to load awards');
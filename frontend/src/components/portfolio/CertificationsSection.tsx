@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Certification, CertificationFormData } from '../../types/portfolio.types';
+import { Certification, CertificationFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const CertificationsSection: React.FC = () => {
-  const [certifications, setCertifications] = useState<Certification[]>([]);
-  const [loading, setLoading] = useState(true);
+const CertificationsSection: React.FC<EditorSectionProps<Certification>> = ({ initialItems, onItemsChange }) => {
+  const [certifications, setCertifications] = useState<Certification[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingCert, setEditingCert] = useState<Certification | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -21,7 +21,9 @@ const CertificationsSection: React.FC = () => {
   });
 
   useEffect(() => {
-    loadCertifications();
+    if (!initialItems) {
+      loadCertifications();
+    }
   }, []);
 
   const loadCertifications = async () => {
@@ -30,6 +32,7 @@ const CertificationsSection: React.FC = () => {
       const data = await portfolioService.listCertifications();
       console.log('Loaded certifications:', data);
       setCertifications(data);
+      onItemsChange?.(data);
     } catch (err: any) {
       console.error('Failed to load certifications:', err);
       setError(err.response?.data?.error || 'Failed to load certifications');
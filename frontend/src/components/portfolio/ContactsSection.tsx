@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Contact, ContactFormData } from '../../types/portfolio.types';
+import { Contact, ContactFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const ContactsSection: React.FC = () => {
-  const [contacts, setContacts] = useState<Contact[]>([]);
-  const [loading, setLoading] = useState(true);
+const ContactsSection: React.FC<EditorSectionProps<Contact>> = ({ initialItems, onItemsChange }) => {
+  const [contacts, setContacts] = useState<Contact[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingContact, setEditingContact] = useState<Contact | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -35,7 +35,9 @@ const ContactsSection: React.FC = () => {
   };
 
   useEffect(() => {
-    loadContacts();
+    if (!initialItems) {
+      loadContacts();
+    }
   }, []);
 
   const loadContacts = async () => {
@@ -44,6 +46,7 @@ const ContactsSection: React.FC = () => {
       const data = await portfolioService.listContacts();
       console.log('Loaded contacts:', data);
       setContacts(data);
+      onItemsChange?.(data);
     } catch (err: any) {
       console.error('Failed to load contacts:', err);
       setError(err.response?.data?.error || 'Failed to load contacts');
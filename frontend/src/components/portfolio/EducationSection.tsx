@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Education, EducationFormData } from '../../types/portfolio.types';
+import { Education, EducationFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const EducationSection: React.FC = () => {
-  const [education, setEducation] = useState<Education[]>([]);
-  const [loading, setLoading] = useState(true);
+const EducationSection: React.FC<EditorSectionProps<Education>> = ({ initialItems, onItemsChange }) => {
+  const [education, setEducation] = useState<Education[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingEdu, setEditingEdu] = useState<Education | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -22,13 +22,16 @@ const EducationSection: React.FC = () => {
   });
 
   useEffect(() => {
-    fetchEducation();
+    if (!initialItems) {
+      fetchEducation();
+    }
   }, []);
 
   const fetchEducation = async () => {
     try {
       const data = await portfolioService.getEducation();
       setEducation(data || []);
+      onItemsChange?.(data || []);
     } catch (err) {
       console.error('Failed to fetch education:', err);
       setError('Failed to load education');
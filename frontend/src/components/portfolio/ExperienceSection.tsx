@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Experience, ExperienceFormData } from '../../types/portfolio.types';
+import { Experience, ExperienceFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const ExperienceSection: React.FC = () => {
-  const [experiences, setExperiences] = useState<Experience[]>([]);
-  const [loading, setLoading] = useState(true);
+const ExperienceSection: React.FC<EditorSectionProps<Experience>> = ({ initialItems, onItemsChange }) => {
+  const [experiences, setExperiences] = useState<Experience[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingExp, setEditingExp] = useState<Experience | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -23,13 +23,16 @@ const ExperienceSection: React.FC = () => {
   });
 
   useEffect(() => {
-    fetchExperiences();
+    if (!initialItems) {
+      fetchExperiences();
+    }
   }, []);
 
   const fetchExperiences = async () => {
     try {
       const data = await portfolioService.getExperiences();
       setExperiences(data || []);
+      onItemsChange?.(data || []);
     } catch (error) {
       console.error('Failed to fetch experiences:', error);
     } finally {
@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Hobby, HobbyFormData } from '../../types/portfolio.types';
+import { Hobby, HobbyFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const HobbiesSection: React.FC = () => {
-  const [hobbies, setHobbies] = useState<Hobby[]>([]);
-  const [loading, setLoading] = useState(true);
+const HobbiesSection: React.FC<EditorSectionProps<Hobby>> = ({ initialItems, onItemsChange }) => {
+  const [hobbies, setHobbies] = useState<Hobby[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingHobby, setEditingHobby] = useState<Hobby | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -31,7 +31,9 @@ const HobbiesSection: React.FC = () => {
   };
 
   useEffect(() => {
-    loadHobbies();
+    if (!initialItems) {
+      loadHobbies();
+    }
   }, []);
 
   const loadHobbies = async () => {
@@ -40,6 +42,7 @@ const HobbiesSection: React.FC = () => {
       const data = await portfolioService.listHobbies();
       console.log('Loaded hobbies:', data);
       setHobbies(data);
+      onItemsChange?.(data);
     } catch (err: any) {
       console.error('Failed to load hobbies:', err);
       setError(err.response?.data?.error || 'Failed to load hobbies');
@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Other, OtherFormData } from '../../types/portfolio.types';
+import { Other, OtherFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const OthersSection: React.FC = () => {
-  const [others, setOthers] = useState<Other[]>([]);
-  const [loading, setLoading] = useState(true);
+const OthersSection: React.FC<EditorSectionProps<Other>> = ({ initialItems, onItemsChange }) => {
+  const [others, setOthers] = useState<Other[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingOther, setEditingOther] = useState<Other | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -20,7 +20,9 @@ const OthersSection: React.FC = () => {
   });
 
   useEffect(() => {
-    loadOthers();
+    if (!initialItems) {
+      loadOthers();
+    }
   }, []);
 
   const loadOthers = async () => {
@@ -28,6 +30,7 @@ const OthersSection: React.FC = () => {
       setLoading(true);
       const data = await portfolioService.listOthers();
       setOthers(data);
+      onItemsChange?.(data);
       setError(null);
     } catch (err: any) {
       console.error('Failed to load others:', err);
@@ -1,20 +1,20 @@
 import React, { useState, useEffect } from 'react';
-import { Project, ProjectFormData } from '../../types/portfolio.types';
+import { Project, ProjectFormData, EditorSectionProps } from '../../types/portfolio.types';
 import portfolioService from '../../services/portfolio.service';
 
-interface ProjectsSectionProps {
+interface ProjectsSectionProps extends EditorSectionProps<Project> {
   portfolioId?: number;
 }
 
-const ProjectsSection: React.FC<ProjectsSectionProps> = ({ portfolioId }) => {
-  const [projects, setProjects] = useState<Project[]>([]);
-  const [loading, setLoading] = useState(true);
+const ProjectsSection: React.FC<ProjectsSectionProps> = ({ portfolioId, initialItems, onItemsChange }) => {
+  const [projects, setProjects] = useState<Project[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [isAdding, setIsAdding] = useState(false);
   const [editingId, setEditingId] = useState<number | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    if (portfolioId) {
+    if (portfolioId && !initialItems) {
       loadProjects();
     } else {
       setLoading(false);
@@ -26,7 +26,9 @@ const ProjectsSection: React.FC<ProjectsSectionProps> = ({ portfolioId }) => {
       setLoading(true);
       const data = await portfolioService.getProjects();
       // Ensure data is an array
-      setProjects(Array.isArray(data) ? data : []);
+      const items = Array.isArray(data) ? data : [];
+      setProjects(items);
+      onItemsChange?.(items);
     } catch (err: any) {
       console.error('Failed to load projects:', err);
       // If error is 404, it means no projects yet
@@ -2,13 +2,27 @@ import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
 import { Publication, PublicationFormData, Patent, PatentFormData } from '../../types/portfolio.types';
 
-const PublicationsPatentsSection: React.FC = () => {
+// Lists loaded with getEditorData() and callbacks with the reloaded lists, as
+// EditorSectionProps for the two tabs
+interface PublicationsPatentsSectionProps {
+  initialPublications?: Publication[];
+  initialPatents?: Patent[];
+  onPublicationsChange?: (items: Publication[]) => void;
+  onPatentsChange?: (items: Patent[]) => void;
+}
+
+const PublicationsPatentsSection: React.FC<PublicationsPatentsSectionProps> = ({
+  initialPublications,
+  initialPatents,
+  onPublicationsChange,
+  onPatentsChange,
+}) => {
   // State for active tab
   const [activeTab, setActiveTab] = useState<'publications' | 'patents'>('publications');
   
   // Publications state
-  const [publications, setPublications] = useState<Publication[]>([]);
-  const [loadingPubs, setLoadingPubs] = useState(true);
+  const [publications, setPublications] = useState<Publication[]>(initialPublications ?? []);
+  const [loadingPubs, setLoadingPubs] = useState(!initialPublications);
   const [showPubForm, setShowPubForm] = useState(false);
   const [editingPub, setEditingPub] = useState<Publication | null>(null);
   const [savingPub, setSavingPub] = useState(false);
@@ -26,8 +40,8 @@ const PublicationsPatentsSection: React.FC = () => {
   });
 
   // Patents state
-  const [patents, setPatents] = useState<Patent[]>([]);
-  const [loadingPatents, setLoadingPatents] = useState(true);
+  const [patents, setPatents] = useState<Patent[]>(initialPatents ?? []);
+  const [loadingPatents, setLoadingPatents] = useState(!initialPatents);
   const [showPatentForm, setShowPatentForm] = useState(false);
   const [editingPatent, setEditingPatent] = useState<Patent | null>(null);
   const [savingPatent, setSavingPatent] = useState(false);
@@ -48,8 +62,12 @@ const PublicationsPatentsSection: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    loadPublications();
-    loadPatents();
+    if (!initialPublications) {
+      loadPublications();
+    }
+    if (!initialPatents) {
+      loadPatents();
+    }
   }, []);
 
   // Publications functions
@@ -58,6 +76,7 @@ const PublicationsPatentsSection: React.FC = () => {
       setLoadingPubs(true);
       const data = await portfolioService.listPublications();
       setPublications(data);
+      onPublicationsChange?.(data);
       setError(null); // Clear any previous errors
     } catch (err: any) {
       console.error('Failed to load publications:', err);
@@ -184,6 +203,7 @@ const PublicationsPatentsSection: React.FC = () => {
       setLoadingPatents(true);
       const data = await portfolioService.listPatents();
       setPatents(data);
+      onPatentsChange?.(data);
       setError(null); // Clear any previous errors
     } catch (err: any) {
       console.error('Failed to load patents:', err);
@@ -1,10 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import portfolioService from '../../services/portfolio.service';
-import { Skill, SkillFormData } from '../../types/portfolio.types';
+import { Skill, SkillFormData, EditorSectionProps } from '../../types/portfolio.types';
 
-const SkillsSection: React.FC = () => {
-  const [skills, setSkills] = useState<Skill[]>([]);
-  const [loading, setLoading] = useState(true);
+const SkillsSection: React.FC<EditorSectionProps<Skill>> = ({ initialItems, onItemsChange }) => {
+  const [skills, setSkills] = useState<Skill[]>(initialItems ?? []);
+  const [loading, setLoading] = useState(!initialItems);
   const [showForm, setShowForm] = useState(false);
   const [editingSkill, setEditingSkill] = useState<Skill | null>(null);
   const [filterCategory, setFilterCategory] = useState<string>('all');
@@ -18,13 +18,16 @@ const SkillsSection: React.FC = () => {
   });
 
   useEffect(() => {
-    fetchSkills();
+    if (!initialItems) {
+      fetchSkills();
+    }
   }, []);
 
   const fetchSkills = async () => {
     try {
       const skillsData = await portfolioService.getSkills();
       setSkills(skillsData || []);
+      onItemsChange?.(skillsData || []);
     } catch (error) {
       console.error('Failed to fetch skills:', error);
       setError('Failed to load skills');
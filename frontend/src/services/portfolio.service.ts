@@ -1,6 +1,7 @@
 import api from './api';
 import {
   Portfolio,
+  PortfolioEditorData,
   Project,
   Skill,
   Experience,
@@ -33,6 +34,12 @@ class PortfolioService {
     return response.data;
   }
 
+  // Portfolio and all of its sections in one request, for the editor
+  async getEditorData(): Promise<PortfolioEditorData> {
+    const response = await api.get<PortfolioEditorData>('/api/portfolio/editor/');
+    return response.data;
+  }
+
   async createPortfolio(data: PortfolioFormData): Promise<Portfolio> {
     const response = await api.post<Portfolio>('/api/portfolio/', data);
     return response.data;
@@ -32,6 +32,29 @@ export interface Portfolio {
   awards_count?: number;
 }
 
+// Props of the editor's section components: the list loaded with
+// getEditorData() (without it the section fetches its own), and a callback
+// with the reloaded list after each change
+export interface EditorSectionProps<T> {
+  initialItems?: T[];
+  onItemsChange?: (items: T[]) => void;
+}
+
+// Portfolio with every section, from GET /api/portfolio/editor/
+export interface PortfolioEditorData extends Portfolio {
+  projects: Project[];
+  skills: Skill[];
+  experiences: Experience[];
+  education: Education[];
+  certifications: Certification[];
+  hobbies: Hobby[];
+  awards: Award[];
+  contacts: Contact[];
+  publications: Publication[];
+  patents: Patent[];
+  others: Other[];
+}
+
 export interface Project {
   id: number;
   portfolio: number;